@@ -1,69 +1,53 @@
 #!/usr/bin/env python3
-import requests
-import json
+import os
+import sys
 
-def check_chroma_connection():
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "lib"))
+from chroma_client import ChromaClient, ChromaError  # noqa: E402
+
+def check_chroma_connection(client):
     """Test connection to Chroma database."""
-    url = "http://localhost:8100/api/v2"
-    
     try:
-        response = requests.get(url, timeout=5)
+        response = client.heartbeat()
         print(f"✅ Connected to Chroma API v2")
-        print(f"Status: {response.status_code}")
-        print(f"Response: {response.text[:200]}...")
+        print(f"Response: {str(response)[:200]}...")
         return True
-    except requests.RequestException as e:
+    except ChromaError as e:
         print(f"❌ Failed to connect to Chroma API")
         print(f"Error: {e}")
         return False
 
-def test_list_collections():
+def test_list_collections(client):
     """Test listing collections in Chroma."""
-    url = "http://localhost:8100/api/v2/collections"
-    
     try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            collections = data.get("results", [])
-            print(f"✅ Successfully listed collections")
-            print(f"Found {len(collections)} collections")
-            for coll in collections:
-                print(f"  - {coll.get('name')}")
-        else:
-            print(f"❌ Failed to list collections, status code: {response.status_code}")
-            print(f"Response: {response.text}")
-        return response.status_code == 200
-    except requests.RequestException as e:
+        collections = client.list_collections()
+        print(f"✅ Successfully listed collections")
+        print(f"Found {len(collections)} collections")
+        for coll in collections:
+            print(f"  - {coll.get('name')}")
+        return True
+    except ChromaError as e:
         print(f"❌ Failed to list collections")
         print(f"Error: {e}")
         return False
 
-def create_test_collection():
+def create_test_collection(client):
     """Create a test collection in Chroma."""
-    url = "http://localhost:8100/api/v2/collections"
-    test_collection = {
-        "name": "test_docker_collection"
-    }
-    
     try:
-        response = requests.post(url, json=test_collection, timeout=5)
-        if response.status_code in [200, 201]:
-            print(f"✅ Successfully created test collection")
-            print(f"Response: {response.text[:200]}...")
-        else:
-            print(f"❌ Failed to create test collection, status code: {response.status_code}")
-            print(f"Response: {response.text}")
-        return response.status_code in [200, 201]
-    except requests.RequestException as e:
+        collection_id = client.get_or_create_collection("test_docker_collection")
+        print(f"✅ Successfully created test collection")
+        print(f"Collection ID: {collection_id}")
+        return True
+    except ChromaError as e:
         print(f"❌ Failed to create test collection")
         print(f"Error: {e}")
         return False
 
 if __name__ == "__main__":
     print("Testing Chroma Database Connection...")
-    if check_chroma_connection():
-        test_list_collections()
-        create_test_collection()
-    else:
-        print("Skipping collection tests due to connection failure")
\ No newline at end of file
+    with ChromaClient("http://localhost:8100", timeout=5) as client:
+        if check_chroma_connection(client):
+            test_list_collections(client)
+            create_test_collection(client)
+        else:
+            print("Skipping collection tests due to connection failure")
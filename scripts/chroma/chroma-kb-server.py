@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+Chroma Knowledge-Base MCP Server
+
+Serves the `chroma_*` tools (list/create collections, add and query documents)
+over MCP against the Chroma HTTP API. Unlike the upstream chroma-mcp container,
+documents and queries are embedded here through a persistent content-hash
+cache, so re-adding unchanged documents costs no embedding compute, and query
+results are cached in memory until they expire or the collection is written.
+It also offers `chroma_hybrid_query`, which fuses BM25 keyword and vector
+rankings for queries on exact identifiers.
+
+Usage:
+    python3 chroma-kb-server.py [--transport stdio|streamable-http] [--port N]
+                                [--chroma-url URL] [--cache PATH] [--cache-size N]
+                                [--query-cache-size N] [--query-ttl SECONDS]
+"""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+try:
+    from mcp.server.fastmcp import FastMCP
+except ImportError:
+    print("Error: MCP package not found. Please install it with 'pip install mcp'",
+          file=sys.stderr)
+    sys.exit(1)
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from chroma_client import DEFAULT_URL, ChromaClient  # noqa: E402
+from chroma_tools import ChromaTools  # noqa: E402
+from embedding_cache import DEFAULT_PATH, CachedEmbedder, EmbeddingCache  # noqa: E402
+from embeddings import DEFAULT_MODEL, get_embedder  # noqa: E402
+from query_cache import QueryCache  # noqa: E402
+
+
+def build_server(tools: ChromaTools, host: str, port: int) -> FastMCP:
+    server = FastMCP("chroma-kb", host=host, port=port)
+
+    @server.tool(name="chroma_list_collections")
+    def list_collections() -> List[str]:
+        """List all collection names"""
+        return tools.list_collections()
+
+    @server.tool(name="chroma_create_collection")
+    def create_collection(collection_name: str,
+                          metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Create a collection if it does not exist"""
+        return tools.create_collection(collection_name, metadata)
+
+    @server.tool(name="chroma_add_documents")
+    def add_documents(collection_name: str, documents: List[str], ids: List[str],
+                      metadatas: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Embed and add documents to a collection"""
+        return tools.add_documents(collection_name, documents, ids, metadatas)
+
+    @server.tool(name="chroma_query_documents")
+    def query_documents(collection_name: str, query_texts: List[str], n_results: int = 5,
+                        where: Optional[Dict[str, Any]] = None,
+                        include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Semantic search over a collection"""
+        return tools.query_documents(collection_name, query_texts, n_results, where, include)
+
+    @server.tool(name="chroma_hybrid_query")
+    def hybrid_query(collection_name: str, query_text: str, n_results: int = 5,
+                     where: Optional[Dict[str, Any]] = None,
+                     mode: str = "hybrid") -> List[Dict[str, Any]]:
+        """Keyword (BM25) + vector search fused by reciprocal rank; mode may be
+        "hybrid", "keyword" or "vector". Best for exact identifiers such as
+        issue numbers or function names"""
+        return tools.hybrid_query(collection_name, query_text, n_results, where, mode)
+
+    @server.tool(name="chroma_cache_stats")
+    def cache_stats() -> Dict[str, Any]:
+        """Embedding and query cache hit/miss counters"""
+        return tools.cache_stats()
+
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma knowledge-base MCP server")
+    parser.add_argument("--transport", choices=["stdio", "streamable-http"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1", help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=8081, help="HTTP port")
+    parser.add_argument("--chroma-url", default=DEFAULT_URL, help="Chroma server URL")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Embedding model")
+    parser.add_argument("--cache", default=DEFAULT_PATH, help="Embedding cache file")
+    parser.add_argument("--cache-size", type=int, default=200_000,
+                        help="Maximum cached embeddings")
+    parser.add_argument("--query-cache-size", type=int, default=4096,
+                        help="Maximum cached per-text query results")
+    parser.add_argument("--query-ttl", type=float, default=300.0,
+                        help="Seconds a cached query result stays valid")
+    args = parser.parse_args()
+
+    try:
+        embed = get_embedder(args.model)
+    except ImportError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    cache = EmbeddingCache(args.cache, args.cache_size)
+    tools = ChromaTools(ChromaClient(args.chroma_url), CachedEmbedder(embed, args.model, cache),
+                        QueryCache(args.query_cache_size, args.query_ttl))
+    try:
+        build_server(tools, args.host, args.port).run(transport=args.transport)
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
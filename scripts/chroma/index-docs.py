@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""
+Incremental Markdown Indexer
+
+Indexes a markdown tree (by default `docs/architecture`) into a Chroma
+collection as heading-aware chunks. Each run only reads files whose mtime or
+size changed, only embeds chunks whose content changed, and deletes chunks of
+edited or removed sections, so documentation updates re-index in seconds.
+
+Usage:
+    python3 index-docs.py [--root DIR] [--collection NAME] [--state PATH]
+                          [--max-chars N] [--force] [--chroma-url URL]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from chroma_client import DEFAULT_URL, ChromaClient, ChromaError  # noqa: E402
+from doc_indexer import DocIndexer, default_state_path  # noqa: E402
+from embedding_cache import DEFAULT_PATH, CachedEmbedder, EmbeddingCache  # noqa: E402
+from embeddings import DEFAULT_MODEL, get_embedder  # noqa: E402
+
+# Configuration
+DOCS_COLLECTION = "architecture_docs"
+DOCS_ROOT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "docs", "architecture"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental markdown indexer for Chroma")
+    parser.add_argument("--root", default=DOCS_ROOT, help="Markdown root directory")
+    parser.add_argument("--collection", default=DOCS_COLLECTION, help="Chroma collection")
+    parser.add_argument("--state", help="Index state file (default: under ~/.cache)")
+    parser.add_argument("--max-chars", type=int, default=2000, help="Maximum chunk size")
+    parser.add_argument("--force", action="store_true", help="Re-index every file")
+    parser.add_argument("--workers", type=int, default=4, help="Embedding workers")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Embedding model")
+    parser.add_argument("--cache", default=DEFAULT_PATH, help="Embedding cache file")
+    parser.add_argument("--chroma-url", default=DEFAULT_URL, help="Chroma server URL")
+    args = parser.parse_args()
+
+    try:
+        embed = CachedEmbedder(get_embedder(args.model), args.model, EmbeddingCache(args.cache))
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    started = time.monotonic()
+    client = ChromaClient(args.chroma_url)
+    try:
+        indexer = DocIndexer(client, args.collection, embed, args.root,
+                             args.state or default_state_path(args.collection, args.root),
+                             max_chars=args.max_chars, workers=args.workers)
+        stats = indexer.run(force=args.force)
+    except (ChromaError, OSError) as e:
+        print(f"❌ Indexing failed: {e}")
+        sys.exit(1)
+    finally:
+        client.close()
+        embed.cache.close()
+
+    stats["seconds"] = round(time.monotonic() - started, 2)
+    print("📊 Index Summary:")
+    print(json.dumps(stats, indent=2))
+    if stats["failed"]:
+        print(f"⚠️ {stats['failed']} files will be retried on the next run")
+        sys.exit(1)
+    print("✅ Index is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""
+Chroma Bulk Ingestion Script
+
+Streams repository issues and architecture documentation into Chroma
+collections. Writes are batched to the server's maximum batch size, documents
+are embedded by parallel workers through a persistent content-hash cache (so
+unchanged documents are not re-embedded), and the number of pending batches is
+bounded so the source is throttled when Chroma or the embedder falls behind.
+
+Usage:
+    python3 ingest-knowledge.py [--no-issues] [--no-docs] [--docs-root DIR]
+                                [--workers N] [--batch-size N] [--chroma-url URL]
+                                [--cache PATH | --no-cache]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from chroma_client import DEFAULT_URL, ChromaClient, ChromaError  # noqa: E402
+from chroma_ingest import IngestPipeline, issue_documents, markdown_documents  # noqa: E402
+from embedding_cache import DEFAULT_PATH, CachedEmbedder, EmbeddingCache  # noqa: E402
+from embeddings import DEFAULT_MODEL, get_embedder  # noqa: E402
+from github_api import GraphQLError, GraphQLSession  # noqa: E402
+
+# Configuration
+OWNER = "o2alexanderfedin"
+REPO = "ai-assistant-project"
+ISSUES_COLLECTION = "github_issues"
+DOCS_COLLECTION = "architecture_docs"
+DOCS_ROOT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "docs", "architecture"
+)
+
+
+def ingest(client, collection, documents, embed, args):
+    """Run one collection's pipeline and print its statistics"""
+    print(f"\nIngesting into '{collection}'...")
+    pipeline = IngestPipeline(client, collection, embed, batch_size=args.batch_size,
+                              workers=args.workers, max_in_flight=args.max_in_flight)
+    print(f"ℹ️ Batch size: {pipeline.batch_size}, workers: {pipeline.workers}")
+    stats = pipeline.run(documents)
+    print(json.dumps(stats, indent=2))
+    return stats["failed"] == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk ingestion into Chroma")
+    parser.add_argument("--no-issues", action="store_true", help="Skip GitHub issues")
+    parser.add_argument("--no-docs", action="store_true", help="Skip markdown docs")
+    parser.add_argument("--docs-root", default=DOCS_ROOT, help="Markdown root directory")
+    parser.add_argument("--workers", type=int, default=4, help="Embedding workers")
+    parser.add_argument("--batch-size", type=int,
+                        help="Cap on records per write (default: server maximum)")
+    parser.add_argument("--max-in-flight", type=int,
+                        help="Pending batches before the source is paused (default: 2 x workers)")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Embedding model")
+    parser.add_argument("--cache", default=DEFAULT_PATH, help="Embedding cache file")
+    parser.add_argument("--no-cache", action="store_true", help="Always recompute embeddings")
+    parser.add_argument("--chroma-url", default=DEFAULT_URL, help="Chroma server URL")
+    args = parser.parse_args()
+
+    client = ChromaClient(args.chroma_url)
+    try:
+        client.heartbeat()
+    except Exception as e:
+        print(f"❌ Chroma is not reachable at {args.chroma_url}: {e}")
+        sys.exit(1)
+    print(f"✓ Connected to Chroma at {args.chroma_url}")
+
+    try:
+        embed = get_embedder(args.model)
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if not args.no_cache:
+        embed = CachedEmbedder(embed, args.model, EmbeddingCache(args.cache))
+
+    ok = True
+    try:
+        if not args.no_docs:
+            ok &= ingest(client, DOCS_COLLECTION, markdown_documents(args.docs_root), embed, args)
+        if not args.no_issues:
+            session = GraphQLSession()
+            try:
+                ok &= ingest(client, ISSUES_COLLECTION,
+                             issue_documents(session, OWNER, REPO), embed, args)
+            finally:
+                session.close()
+    except (ChromaError, GraphQLError) as e:
+        print(f"❌ Ingestion failed: {e}")
+        sys.exit(1)
+    finally:
+        client.close()
+        if isinstance(embed, CachedEmbedder):
+            print(f"\n📊 Embedding cache: {embed.stats['hits']} hits, {embed.stats['misses']} misses")
+            embed.cache.close()
+
+    if ok:
+        print("\n✅ Ingestion complete")
+    else:
+        print("\n⚠️ Ingestion finished with failed batches")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
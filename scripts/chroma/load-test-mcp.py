@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+
+"""
+Chroma MCP Load-Testing Script
+
+Opens many concurrent MCP sessions (streamable HTTP) against a Chroma MCP
+server and drives a weighted mix of list/add/query tool calls for a fixed
+duration. Reports per-tool throughput and latency percentiles.
+
+Targets either a running server (the docker-compose `chroma-mcp` service on
+http://localhost:8080/mcp by default) or, with --ephemeral, a throwaway stack
+started for the run: a `chroma run` server on a temporary directory plus
+`chroma-kb-server.py`, both torn down afterwards.
+
+Usage:
+    python3 load-test-mcp.py [--url URL | --ephemeral] [--sessions N]
+                             [--duration SECONDS] [--mix list=1,add=2,query=7]
+                             [--report FILE]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List, Tuple
+
+try:
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+except ImportError:
+    print("Error: MCP package not found. Please install it with 'pip install mcp'")
+    sys.exit(1)
+
+# Configuration
+DEFAULT_URL = "http://localhost:8080/mcp"
+COLLECTION = "load_test_collection"
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chroma-kb-server.py")
+WORDS = (
+    "agent task queue priority heartbeat registry capability knowledge vector "
+    "embedding collection migration project issue field label parent story "
+    "points component workflow state snapshot message hub latency"
+).split()
+
+TOOLS = {
+    "list": "chroma_list_collections",
+    "add": "chroma_add_documents",
+    "query": "chroma_query_documents",
+}
+
+
+def sentence(rng: random.Random, words: int = 12) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in TOOLS:
+            raise ValueError(f"Unknown operation '{name}' (expected {', '.join(TOOLS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class Recorder:
+    """Latencies and error counts per operation"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, op: str, seconds: float, ok: bool) -> None:
+        if ok:
+            self.latencies.setdefault(op, []).append(seconds)
+        else:
+            self.errors[op] = self.errors.get(op, 0) + 1
+
+    def report(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for op in sorted(set(self.latencies) | set(self.errors)):
+            values = sorted(self.latencies.get(op, []))
+            report[op] = {
+                "ok": len(values),
+                "errors": self.errors.get(op, 0),
+                "per_second": round(len(values) / elapsed, 1) if elapsed else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p90_ms": round(percentile(values, 90) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+            }
+        return report
+
+
+async def call(session: ClientSession, recorder: Recorder, op: str,
+               arguments: Dict) -> bool:
+    started = time.perf_counter()
+    try:
+        result = await session.call_tool(TOOLS[op], arguments)
+        ok = not getattr(result, "isError", False)
+    except Exception:
+        ok = False
+    recorder.record(op, time.perf_counter() - started, ok)
+    return ok
+
+
+async def run_session(number: int, url: str, deadline: float, weights: Dict[str, float],
+                      recorder: Recorder, args) -> None:
+    rng = random.Random(number)
+    ops, op_weights = zip(*weights.items())
+    added = 0
+    started = time.perf_counter()
+    try:
+        async with streamablehttp_client(url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                recorder.record("initialize", time.perf_counter() - started, True)
+                while time.monotonic() < deadline:
+                    op = rng.choices(ops, op_weights)[0]
+                    if op == "list":
+                        arguments = {}
+                    elif op == "add":
+                        ids = [f"load-{number}-{added + i}" for i in range(args.docs_per_add)]
+                        added += args.docs_per_add
+                        arguments = {
+                            "collection_name": args.collection,
+                            "documents": [sentence(rng, 40) for _ in ids],
+                            "metadatas": [{"source": "load-test", "session": number} for _ in ids],
+                            "ids": ids,
+                        }
+                    else:
+                        arguments = {
+                            "collection_name": args.collection,
+                            "query_texts": [sentence(rng, 6)],
+                            "n_results": args.n_results,
+                        }
+                    await call(session, recorder, op, arguments)
+    except Exception as e:
+        # Counted under "session": the session died rather than one call failing
+        recorder.record("session", time.perf_counter() - started, False)
+        print(f"  ✗ Session {number}: {e}")
+
+
+async def seed(url: str, args) -> None:
+    """Create the collection and add a few documents so queries have results"""
+    rng = random.Random(0)
+    async with streamablehttp_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            await session.call_tool("chroma_create_collection",
+                                    {"collection_name": args.collection})
+            ids = [f"seed-{i}" for i in range(args.seed_docs)]
+            await session.call_tool("chroma_add_documents", {
+                "collection_name": args.collection,
+                "documents": [sentence(rng, 40) for _ in ids],
+                "metadatas": [{"source": "load-test-seed"} for _ in ids],
+                "ids": ids,
+            })
+
+
+async def load_test(url: str, weights: Dict[str, float], args) -> Tuple[Dict, float]:
+    await seed(url, args)
+    print(f"ℹ️ {args.sessions} sessions for {args.duration}s, mix {weights}")
+    recorder = Recorder()
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(*(
+        run_session(n, url, deadline, weights, recorder, args) for n in range(args.sessions)
+    ))
+    elapsed = time.monotonic() - started
+    return recorder.report(elapsed), elapsed
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until(check, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if check():
+                return
+        except OSError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("Service did not become ready")
+
+
+def start_ephemeral_stack(workdir: str, processes: List[subprocess.Popen], log) -> str:
+    """Start a temporary Chroma server and chroma-kb-server logging to `log`; return the MCP URL"""
+    chroma_port, mcp_port = free_port(), free_port()
+    chroma_url = f"http://127.0.0.1:{chroma_port}"
+    processes.append(subprocess.Popen(
+        ["chroma", "run", "--path", os.path.join(workdir, "chroma"), "--port", str(chroma_port)],
+        stdout=log, stderr=subprocess.STDOUT,
+    ))
+    wait_until(lambda: urllib.request.urlopen(f"{chroma_url}/api/v2/heartbeat").status == 200)
+    processes.append(subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, "--transport", "streamable-http",
+         "--port", str(mcp_port), "--chroma-url", chroma_url,
+         "--cache", os.path.join(workdir, "embeddings.sqlite")],
+        stdout=log, stderr=subprocess.STDOUT,
+    ))
+    wait_until(lambda: socket.create_connection(("127.0.0.1", mcp_port), timeout=1).close() is None)
+    return f"http://127.0.0.1:{mcp_port}/mcp"
+
+
+def print_report(report: Dict, elapsed: float) -> None:
+    print(f"\n📊 Load Test Summary ({elapsed:.1f}s):")
+    print(f"{'operation':<12}{'ok':>8}{'errors':>8}{'req/s':>9}"
+          f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for op, row in report.items():
+        print(f"{op:<12}{row['ok']:>8}{row['errors']:>8}{row['per_second']:>9}"
+              f"{row['p50_ms']:>9}{row['p90_ms']:>9}{row['p99_ms']:>9}{row['max_ms']:>9}")
+
+
+def print_log_tail(path: str, lines: int = 30) -> None:
+    """Print the last lines of a log file that is about to be deleted"""
+    try:
+        with open(path, errors="replace") as f:
+            tail = f.readlines()[-lines:]
+    except OSError:
+        return
+    print(f"\n--- last {len(tail)} lines of {os.path.basename(path)} ---")
+    print("".join(tail).rstrip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chroma MCP load generator")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", default=DEFAULT_URL, help="MCP endpoint")
+    target.add_argument("--ephemeral", action="store_true",
+                        help="Start a temporary Chroma + chroma-kb-server stack")
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent MCP sessions")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--mix", default="list=1,add=2,query=7",
+                        help="Operation weights, e.g. list=1,add=2,query=7")
+    parser.add_argument("--collection", default=COLLECTION, help="Collection to use")
+    parser.add_argument("--docs-per-add", type=int, default=5, help="Documents per add call")
+    parser.add_argument("--seed-docs", type=int, default=100, help="Documents added up front")
+    parser.add_argument("--n-results", type=int, default=5, help="Results per query")
+    parser.add_argument("--report", help="Write the summary as JSON to this file")
+    args = parser.parse_args()
+    try:
+        weights = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    processes: List[subprocess.Popen] = []
+    workdir = tempfile.TemporaryDirectory(prefix="mcp-load-") if args.ephemeral else None
+    log = None
+    failed = False
+    try:
+        url = args.url
+        if workdir:
+            print("Starting ephemeral Chroma stack...")
+            log = open(os.path.join(workdir.name, "stack.log"), "w")
+            url = start_ephemeral_stack(workdir.name, processes, log)
+        print(f"Load testing {url}")
+        report, elapsed = asyncio.run(load_test(url, weights, args))
+    except Exception as e:
+        # Any start-up or seeding failure (including MCP errors) still tears the stack down
+        print(f"❌ Load test failed: {e}")
+        failed = True
+        sys.exit(1)
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if log is not None:
+            log.close()
+            # The stack's output explains most start-up failures; keep it visible
+            if failed:
+                print_log_tail(log.name)
+        if workdir:
+            workdir.cleanup()
+
+    print_report(report, elapsed)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"url": url, "sessions": args.sessions, "seconds": round(elapsed, 2),
+                       "operations": report}, f, indent=2)
+        print(f"\nReport written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
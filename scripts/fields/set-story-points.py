@@ -6,58 +6,22 @@ It uses a direct REST API call instead of GraphQL.
 """
 
 import json
+import os
 import subprocess
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+from field_rules import default_rules
+
 # Configuration
 OWNER = "o2alexanderfedin"
 REPO = "ai-assistant-project"
 PROJECT_ID = "PVT_kwHOBJ7Qkc4A5SDb"
 STORY_POINTS_FIELD_ID = "PVTF_lAHOBJ7Qkc4A5SDbzguGz4w"  # Story Points
 
-# Story points mapping for issues
-STORY_POINTS_MAPPING = {
-    # MCP Communication Protocol
-    "17": 8,  # MCP Message Structure Implementation
-    "18": 5,  # MCP Message Validation
-    "19": 5,  # STDIO-Based MCP Communication
-    "20": 5,  # MCP Message Routing
-    "21": 8,  # MCP Error Handling and Recovery
-    "22": 5,  # MCP Logging and Debugging
-    "23": 8,  # MCP Message Security
-    "24": 5,  # MCP Testing Utilities
-    
-    # Task Workflow Process
-    "25": 8,  # Task Analysis Implementation
-    "26": 8,  # Task Decomposition Implementation
-    "27": 5,  # Task Documentation Implementation
-    "28": 8,  # Question Handling Implementation
-    "29": 13, # Yield Process Implementation
-    "30": 8,  # Workflow Integration Library
-    "31": 5,  # Workflow Status Tracking Implementation
-    "32": 8,  # Workflow Testing Suite
-    
-    # Shared Components
-    "33": 8,  # Implement Agent Registry component
-    "34": 8,  # Implement Agent State Store component
-    "35": 8,  # Implement Task Queue component
-    "36": 8,  # Implement Task History component
-    "37": 8,  # Implement Knowledge Base component
-    "38": 8,  # Implement Performance Metrics component
-    
-    # Issue #8
-    "8": 3,   # Epic Prioritization and Implementation Order
-    
-    # Lower-numbered IDs - Copy from higher-numbered counterparts
-    "9": 5,   # GitHub Task Monitoring
-    "10": 8,  # Agent Lifecycle Management
-    "11": 8,  # Orchestrator MCP Communication
-    "12": 13, # Task Analysis and Agent Matching
-    "13": 8,  # Task Classification and Prioritization
-    "14": 8,  # Agent Instance Creation
-    "15": 5,  # Agent Template Management
-    "16": 5   # Secure Agent Creation
-}
+# Story points mapping for issues (maintained in field-rules.json)
+STORY_POINTS_MAPPING = default_rules().issue_values("Story Points", f"{OWNER}/{REPO}")
 
 def run_command(cmd):
     """Run a shell command and return the output"""
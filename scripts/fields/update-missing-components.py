@@ -5,54 +5,22 @@ This script updates the Component field for user stories in the GitHub Project t
 """
 
 import json
+import os
 import subprocess
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+from field_rules import default_rules
+
 # Configuration
 OWNER = "o2alexanderfedin"
 REPO = "ai-assistant-project"
 PROJECT_ID = "PVT_kwHOBJ7Qkc4A5SDb"
 
 # Component mapping - maps issue numbers to components
-# Format: "issue_number": "component"
-COMPONENT_MAPPING = {
-    # MCP Communication Protocol stories - MCP component
-    "17": "MCP",  # MCP Message Structure Implementation
-    "18": "MCP",  # MCP Message Validation
-    "19": "MCP",  # STDIO-Based MCP Communication
-    "20": "MCP",  # MCP Message Routing
-    "21": "MCP",  # MCP Error Handling and Recovery
-    "22": "MCP",  # MCP Logging and Debugging
-    "23": "MCP",  # MCP Message Security
-    "24": "MCP",  # MCP Testing Utilities
-    
-    # Task Workflow Process stories - Workflow component
-    "25": "Workflow",  # Task Analysis Implementation
-    "26": "Workflow",  # Task Decomposition Implementation
-    "27": "Workflow",  # Task Documentation Implementation
-    "28": "Workflow",  # Question Handling Implementation
-    "29": "Workflow",  # Yield Process Implementation
-    "30": "Workflow",  # Workflow Integration Library
-    "31": "Workflow",  # Workflow Status Tracking Implementation
-    "32": "Workflow",  # Workflow Testing Suite
-    
-    # Shared Component Implementation stories - Shared Components component
-    "33": "Shared Components",  # Implement Agent Registry component
-    "34": "Shared Components",  # Implement Agent State Store component
-    "35": "Shared Components",  # Implement Task Queue component
-    "36": "Shared Components",  # Implement Task History component
-    
-    # Lower-numbered IDs - Match their corresponding epics
-    "8": "Core Agents",  # Epic Prioritization and Implementation Order
-    "9": "Core Agents",  # GitHub Task Monitoring
-    "10": "Core Agents",  # Agent Lifecycle Management
-    "11": "Core Agents",  # Orchestrator MCP Communication
-    "12": "Core Agents",  # Task Analysis and Agent Matching
-    "13": "Core Agents",  # Task Classification and Prioritization
-    "14": "Core Agents",  # Agent Instance Creation
-    "15": "Core Agents",  # Agent Template Management
-    "16": "Core Agents"   # Secure Agent Creation
-}
+# Format: "issue_number": "component" (maintained in field-rules.json)
+COMPONENT_MAPPING = default_rules().issue_values("Component", f"{OWNER}/{REPO}")
 
 def run_command(cmd):
     """Run a shell command and return the output"""
@@ -6,121 +6,29 @@ in the GitHub Project that are missing them, using the project_items.json mappin
 """
 
 import json
+import os
 import subprocess
+import sys
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+from field_rules import default_rules
+
 # Configuration
 OWNER = "o2alexanderfedin"
 REPO = "ai-assistant-project"
 PROJECT_ID = "PVT_kwHOBJ7Qkc4A5SDb"
 
 # Epic mapping - maps user stories to their parent epics
-# Format: "user story ID": "epic ID"
+# Format: "user story ID": "epic ID" (maintained in field-rules.json)
 EPIC_MAPPING = {
-    # Architecture Epics
-    "17": "2",  # MCP Message Structure Implementation -> MCP Communication Protocol 
-    "18": "2",  # MCP Message Validation -> MCP Communication Protocol
-    "19": "2",  # STDIO-Based MCP Communication -> MCP Communication Protocol
-    "20": "2",  # MCP Message Routing -> MCP Communication Protocol
-    "21": "2",  # MCP Error Handling and Recovery -> MCP Communication Protocol
-    "22": "2",  # MCP Logging and Debugging -> MCP Communication Protocol
-    "23": "2",  # MCP Message Security -> MCP Communication Protocol
-    "24": "2",  # MCP Testing Utilities -> MCP Communication Protocol
-    
-    "25": "4",  # Task Analysis Implementation -> Task Workflow Process
-    "26": "4",  # Task Decomposition Implementation -> Task Workflow Process
-    "27": "4",  # Task Documentation Implementation -> Task Workflow Process
-    "28": "4",  # Question Handling Implementation -> Task Workflow Process
-    "29": "4",  # Yield Process Implementation -> Task Workflow Process
-    "30": "4",  # Workflow Integration Library -> Task Workflow Process
-    "31": "4",  # Workflow Status Tracking Implementation -> Task Workflow Process
-    "32": "4",  # Workflow Testing Suite -> Task Workflow Process
-    
-    "33": "5",  # Implement Agent Registry component -> Shared Component Implementation
-    "34": "5",  # Implement Agent State Store component -> Shared Component Implementation
-    "35": "5",  # Implement Task Queue component -> Shared Component Implementation
-    "36": "5",  # Implement Task History component -> Shared Component Implementation
-    "37": "5",  # Implement Knowledge Base component -> Shared Component Implementation
-    "38": "5",  # Implement Performance Metrics component -> Shared Component Implementation
-    "39": "5",  # Integrate all Shared Components -> Shared Component Implementation
-    "40": "5",  # Document all Shared Components -> Shared Component Implementation
-    
-    "41": "6",  # Implement GitHub Connector -> External Integration
-    "42": "6",  # Implement CI/CD Connector -> External Integration
-    "43": "6",  # Implement Development Environment -> External Integration
-    "44": "6",  # Implement Secure Credential Management -> External Integration
-    "45": "6",  # Implement Error Handling and Monitoring -> External Integration
-    "46": "6",  # Create Integration Tests -> External Integration
-    "47": "6",  # Create Documentation for External Integrations -> External Integration
-    
-    "48": "7",  # Implement BATS Testing Framework -> Testing Framework
-    "49": "7",  # Create MCP Protocol Test Suite -> Testing Framework
-    "50": "7",  # Set Up GitHub Actions Testing Pipeline -> Testing Framework
-    "51": "7",  # Implement Test Coverage Tracking and Reporting -> Testing Framework
-    "52": "7",  # Develop Core Agent Unit Tests -> Testing Framework
-    "53": "7",  # Implement Shared Component Unit Tests -> Testing Framework
-    
-    "54": "3",  # Implement Developer Agent -> Agent Implementation
-    "55": "3",  # Implement Reviewer Agent -> Agent Implementation
-    "56": "3",  # Implement Tester Agent -> Agent Implementation
-    "57": "3",  # Implement Documentation Agent -> Agent Implementation
-    "58": "3",  # Implement DevOps Agent -> Agent Implementation
-    
-    "8": "1",    # Epic Prioritization and Implementation Order -> Core Agent System Implementation
-    
-    # Lower-numbered IDs (if they're not already mapped)
-    "9": "1",   # GitHub Task Monitoring -> Core Agent System Implementation
-    "10": "1",  # Agent Lifecycle Management -> Core Agent System Implementation
-    "11": "1",  # Orchestrator MCP Communication -> Core Agent System Implementation
-    "12": "1",  # Task Analysis and Agent Matching -> Core Agent System Implementation
-    "13": "1",  # Task Classification and Prioritization -> Core Agent System Implementation
-    "14": "1",  # Agent Instance Creation -> Core Agent System Implementation
-    "15": "1",  # Agent Template Management -> Core Agent System Implementation
-    "16": "1"   # Secure Agent Creation -> Core Agent System Implementation
+    str(story): str(epic)
+    for story, epic in default_rules().parents.get(f"{OWNER}/{REPO}", {}).items()
 }
 
 # Story points mapping for issues without story points
-# Format: "user story ID": points
-STORY_POINTS_MAPPING = {
-    # MCP Communication Protocol
-    "17": 8,  # MCP Message Structure Implementation
-    "18": 5,  # MCP Message Validation
-    "19": 5,  # STDIO-Based MCP Communication
-    "20": 5,  # MCP Message Routing
-    "21": 8,  # MCP Error Handling and Recovery
-    "22": 5,  # MCP Logging and Debugging
-    "23": 8,  # MCP Message Security
-    "24": 5,  # MCP Testing Utilities
-    
-    # Task Workflow Process
-    "25": 8,  # Task Analysis Implementation
-    "26": 8,  # Task Decomposition Implementation
-    "27": 5,  # Task Documentation Implementation
-    "28": 8,  # Question Handling Implementation
-    "29": 13, # Yield Process Implementation
-    "30": 8,  # Workflow Integration Library
-    "31": 5,  # Workflow Status Tracking Implementation
-    "32": 8,  # Workflow Testing Suite
-    
-    # Shared Components
-    "33": 8,  # Implement Agent Registry component
-    "34": 8,  # Implement Agent State Store component
-    "35": 8,  # Implement Task Queue component
-    "36": 8,  # Implement Task History component
-    
-    # Issue #8
-    "8": 3,   # Epic Prioritization and Implementation Order
-    
-    # Lower-numbered IDs - Copy from higher-numbered counterparts
-    "9": 5,   # GitHub Task Monitoring
-    "10": 8,  # Agent Lifecycle Management
-    "11": 8,  # Orchestrator MCP Communication
-    "12": 13, # Task Analysis and Agent Matching
-    "13": 8,  # Task Classification and Prioritization
-    "14": 8,  # Agent Instance Creation
-    "15": 5,  # Agent Template Management
-    "16": 5   # Secure Agent Creation
-}
+# Format: "user story ID": points (maintained in field-rules.json)
+STORY_POINTS_MAPPING = default_rules().issue_values("Story Points", f"{OWNER}/{REPO}")
 
 def run_command(cmd):
     """Run a shell command and return the output"""
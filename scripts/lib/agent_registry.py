@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+
+"""
+In-memory agent registry
+
+Python implementation of the Agent Registry
+(docs/architecture/components/agent-registry.md). Instead of a `jq` filter
+over `agents.json` per lookup and a temp-file rewrite per update, agents are
+held in memory with:
+
+    - an inverted index from capability term to agent names
+    - the available agents ordered by load, for `max_load` filtering
+    - an append-only JSONL log of register/update/deregister records,
+      replayed on startup and compacted when it grows
+
+Capabilities may be a plain list (`["python", "test"]`) or the structured
+capability model (domains with levels, functions, tools). Both are reduced to
+terms; a domain at level `expert` also satisfies `intermediate` and `basic`.
+"""
+
+import bisect
+import calendar
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+LEVELS = ["basic", "intermediate", "expert"]
+STATUSES = {"initializing", "available", "busy", "unavailable", "shutting_down"}
+Capabilities = Union[List[Any], Dict[str, Any]]
+
+
+def timestamp(seconds: Optional[float] = None) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(seconds))
+
+
+def parse_timestamp(value: str) -> float:
+    return float(calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ")))
+
+
+def capability_terms(capabilities: Optional[Capabilities], requirement: bool = False) -> Set[str]:
+    """Index terms of an agent's capabilities, or of a task's requirements"""
+    if not capabilities:
+        return set()
+    if not isinstance(capabilities, dict):
+        capabilities = {"functions": capabilities}
+    terms = set()
+    for domain in capabilities.get("domains", []):
+        if isinstance(domain, str):
+            domain = {"name": domain}
+        name = domain["name"].lower()
+        level = domain.get("level")
+        if level not in LEVELS:
+            terms.add(name)
+        elif requirement:
+            terms.add(f"{name}:{level}")
+        else:
+            # An expert also meets intermediate and basic requirements
+            terms.add(name)
+            terms.update(f"{name}:{lower}" for lower in LEVELS[:LEVELS.index(level) + 1])
+    terms.update(str(function).lower() for function in capabilities.get("functions", []))
+    terms.update(f"tool:{str(tool).lower()}" for tool in capabilities.get("tools", []))
+    return terms
+
+
+class AgentRegistry:
+    """Agents indexed by capability and load, persisted as an append-only log"""
+
+    def __init__(self, root: str, compact_after: int = 10_000, fsync: bool = False):
+        self.root = root
+        self.compact_after = compact_after
+        self.fsync = fsync
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self._terms: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        # (load, name) of available agents, kept sorted
+        self._by_load: List[Tuple[float, str]] = []
+        self._lock = threading.RLock()
+        # Optional source of heartbeat times newer than the log (name -> epoch
+        # seconds); compact() writes them into last_seen
+        self.heartbeats: Optional[Callable[[], Dict[str, float]]] = None
+        os.makedirs(root, exist_ok=True)
+        self._log_file = os.path.join(root, "agents.log")
+        self._records = 0
+        self._load()
+        self._log = open(self._log_file, "a")
+
+    # Persistence
+
+    def _load(self) -> None:
+        if not os.path.exists(self._log_file):
+            return
+        with open(self._log_file) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn final write
+                self._apply(record)
+                self._records += 1
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._log.write(json.dumps(record) + "\n")
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self._records += 1
+        if self._records > max(self.compact_after, 2 * len(self.agents)):
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the log as one register record per live agent"""
+        with self._lock:
+            if self.heartbeats is not None:
+                for name, seen in self.heartbeats().items():
+                    agent = self.agents.get(name)
+                    if agent is not None and seen > parse_timestamp(agent["last_seen"]):
+                        agent["last_seen"] = timestamp(seen)
+            temp = f"{self._log_file}.tmp"
+            with open(temp, "w") as f:
+                for agent in self.agents.values():
+                    f.write(json.dumps({"op": "register", "agent": agent}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._log.close()
+            os.replace(temp, self._log_file)
+            self._log = open(self._log_file, "a")
+            self._records = len(self.agents)
+
+    def close(self) -> None:
+        with self._lock:
+            self._log.close()
+
+    # Index maintenance
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        op = record["op"]
+        if op == "register":
+            agent = record["agent"]
+            self._unindex(agent["name"])
+            self.agents[agent["name"]] = agent
+            self._index(agent)
+        elif op == "update":
+            agent = self.agents.get(record["name"])
+            if agent is None:
+                return
+            changes = record["changes"]
+            if "capabilities" in changes:
+                self._unindex(agent["name"])
+                agent.update(changes)
+                self._index(agent)
+            else:
+                self._set_load_entry(agent, remove=True)
+                agent.update(changes)
+                self._set_load_entry(agent)
+        elif op == "deregister":
+            self._unindex(record["name"])
+            self.agents.pop(record["name"], None)
+
+    def _index(self, agent: Dict[str, Any]) -> None:
+        terms = capability_terms(agent.get("capabilities"))
+        self._terms[agent["name"]] = terms
+        for term in terms:
+            self._postings.setdefault(term, set()).add(agent["name"])
+        self._set_load_entry(agent)
+
+    def _unindex(self, name: str) -> None:
+        agent = self.agents.get(name)
+        if agent is None:
+            return
+        for term in self._terms.pop(name, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(name)
+                if not postings:
+                    del self._postings[term]
+        self._set_load_entry(agent, remove=True)
+
+    def _set_load_entry(self, agent: Dict[str, Any], remove: bool = False) -> None:
+        if agent.get("status") != "available":
+            return
+        entry = (agent.get("load", 0), agent["name"])
+        i = bisect.bisect_left(self._by_load, entry)
+        if remove:
+            if i < len(self._by_load) and self._by_load[i] == entry:
+                del self._by_load[i]
+        else:
+            self._by_load.insert(i, entry)
+
+    # Registry operations
+
+    def register(self, name: str, agent_type: str, capabilities: Capabilities,
+                 endpoint: str = "", status: str = "available") -> Dict[str, Any]:
+        now = timestamp()
+        agent = {
+            "name": name,
+            "type": agent_type,
+            "capabilities": capabilities,
+            "endpoint": endpoint,
+            "status": status,
+            "load": 0,
+            "created_at": now,
+            "last_seen": now,
+        }
+        with self._lock:
+            record = {"op": "register", "agent": agent}
+            self._apply(record)
+            self._write(record)
+        return agent
+
+    def update(self, name: str, status: Optional[str] = None,
+               load: Optional[float] = None, **fields: Any) -> Dict[str, Any]:
+        """Change status, load, capabilities or other fields, and refresh last_seen"""
+        if status is not None and status not in STATUSES:
+            raise ValueError(f"Unknown agent status: {status}")
+        if "created_at" in fields:
+            raise ValueError("Cannot update created_at; re-register the agent instead")
+        changes = {"last_seen": timestamp(), **fields}
+        if status is not None:
+            changes["status"] = status
+        if load is not None:
+            changes["load"] = load
+        with self._lock:
+            if name not in self.agents:
+                raise ValueError(f"Agent not registered: {name}")
+            record = {"op": "update", "name": name, "changes": changes}
+            self._apply(record)
+            self._write(record)
+            return self.agents[name]
+
+    def deregister(self, name: str) -> bool:
+        with self._lock:
+            if name not in self.agents:
+                return False
+            record = {"op": "deregister", "name": name}
+            self._apply(record)
+            self._write(record)
+            return True
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.agents.get(name)
+
+    def list(self, status: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [agent for agent in self.agents.values()
+                    if status is None or agent.get("status") == status]
+
+    def find(self, capabilities: Optional[Capabilities] = None, max_load: float = 100,
+             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Available agents with every required capability and load <= max_load, least loaded first"""
+        required = capability_terms(capabilities, requirement=True)
+        with self._lock:
+            end = bisect.bisect_right(self._by_load, (max_load, "\uffff"))
+            candidates = self._candidates(required)
+            if candidates is None or len(candidates) >= end:
+                names: Iterable[str] = (name for _, name in self._by_load[:end]
+                                        if candidates is None or name in candidates)
+            else:
+                names = sorted(
+                    (name for name in candidates
+                     if self.agents[name].get("status") == "available"
+                     and self.agents[name].get("load", 0) <= max_load),
+                    key=lambda name: (self.agents[name].get("load", 0), name),
+                )
+            found = []
+            for name in names:
+                found.append(self.agents[name])
+                if limit is not None and len(found) == limit:
+                    break
+            return found
+
+    def _candidates(self, required: Set[str]) -> Optional[Set[str]]:
+        """Agents having every required term; None when nothing is required"""
+        if not required:
+            return None
+        postings = sorted((self._postings.get(term, set()) for term in required), key=len)
+        candidates = set(postings[0])
+        for other in postings[1:]:
+            if not candidates:
+                break
+            candidates &= other
+        return candidates
+
+    def capabilities(self) -> Dict[str, int]:
+        """Number of agents per capability term"""
+        with self._lock:
+            return {term: len(names) for term, names in sorted(self._postings.items())}
+
+    def __len__(self) -> int:
+        return len(self.agents)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.agents
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+"""
+In-memory BM25 keyword index
+
+An inverted index (term -> {doc ID: term frequency}) with incremental add and
+remove, used next to Chroma's vector search for exact-identifier queries such
+as issue numbers, function names or field names. The tokenizer keeps compound
+identifiers (`user-031`, `chroma_client.py`, `setField`) as whole terms and
+also indexes their parts, so either form matches.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+WORD = re.compile(r"[A-Za-z0-9_]+(?:[-.][A-Za-z0-9_]+)*")
+PARTS = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    terms = []
+    for word in WORD.findall(text):
+        terms.append(word.lower())
+        parts = [part.lower() for part in PARTS.findall(word)]
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+def rrf(rankings: List[List[str]], k: int = 60,
+        weights: Optional[List[float]] = None) -> List[Tuple[str, float]]:
+    """Reciprocal-rank fusion of ranked ID lists, best first"""
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights or [1.0] * len(rankings)):
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class BM25Index:
+    """Incrementally updated Okapi BM25 index over documents with metadata"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.documents: Dict[str, str] = {}
+        self.metadatas: Dict[str, Dict[str, Any]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.lengths
+
+    def add(self, doc_id: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Index a document, replacing any previous version with the same ID"""
+        if doc_id in self.lengths:
+            self.remove(doc_id)
+        counts = Counter(tokenize(text))
+        for term, count in counts.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        length = sum(counts.values())
+        self.lengths[doc_id] = length
+        self._total_length += length
+        self.documents[doc_id] = text
+        self.metadatas[doc_id] = metadata or {}
+
+    def remove(self, doc_id: str) -> None:
+        if doc_id not in self.lengths:
+            return
+        for term in set(tokenize(self.documents[doc_id])):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
+        self._total_length -= self.lengths.pop(doc_id)
+        del self.documents[doc_id]
+        del self.metadatas[doc_id]
+
+    def search(self, query: str, k: int = 10,
+               where: Optional[Dict[str, Any]] = None) -> List[Tuple[str, float]]:
+        """Top-k (doc ID, score) pairs; only documents sharing a query term are scored"""
+        if not self.lengths:
+            return []
+        count = len(self.lengths)
+        average = self._total_length / count
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / average)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        if where:
+            scores = {doc_id: score for doc_id, score in scores.items()
+                      if matches(self.metadatas[doc_id], where)}
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], item[0]))
+
+
+def matches(metadata: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    """Evaluate a Chroma `where` filter (equality, $eq/$ne/$in/$nin, $and/$or)"""
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if op == "$eq" and value != operand:
+                    return False
+                if op == "$ne" and value == operand:
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$nin" and value in operand:
+                    return False
+                if op not in ("$eq", "$ne", "$in", "$nin"):
+                    raise ValueError(f"Unsupported filter operator for keyword search: {op}")
+        elif metadata.get(key) != condition:
+            return False
+    return True
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+"""
+Chroma HTTP API client
+
+Clients for the Chroma v2 REST API served by the `chroma` container
+(http://localhost:8100):
+
+- `AsyncChromaClient` keeps a pool of keep-alive connections (httpx), so
+  concurrent agents share warm connections instead of opening one per call.
+  Queries take many texts per request and can fan out across collections
+  concurrently.
+- `ChromaClient` is a synchronous facade over the async client for scripts.
+  It runs the client on a private event loop thread, so it can be shared
+  between worker threads and they all draw from the same pool.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from embeddings import Embedder
+
+DEFAULT_URL = "http://localhost:8100"
+DEFAULT_TENANT = "default_tenant"
+DEFAULT_DATABASE = "default_database"
+
+
+class ChromaError(Exception):
+    """Raised when the Chroma API returns an error response"""
+
+
+def _records(ids, documents, embeddings, metadatas) -> Dict[str, Any]:
+    body: Dict[str, Any] = {"ids": ids}
+    if documents is not None:
+        body["documents"] = documents
+    if embeddings is not None:
+        body["embeddings"] = embeddings
+    if metadatas is not None:
+        body["metadatas"] = metadatas
+    return body
+
+
+class AsyncChromaClient:
+    """Pooled asynchronous client for one Chroma tenant/database"""
+
+    def __init__(self, url: str = DEFAULT_URL, tenant: str = DEFAULT_TENANT,
+                 database: str = DEFAULT_DATABASE, timeout: float = 30.0,
+                 max_connections: int = 20, embed: Optional[Embedder] = None):
+        self.url = url.rstrip("/")
+        self.base = f"/api/v2/tenants/{tenant}/databases/{database}"
+        self.embed = embed
+        self._http = httpx.AsyncClient(
+            base_url=self.url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections,
+                                max_keepalive_connections=max_connections),
+        )
+        self._collections: Dict[str, str] = {}
+
+    async def _request(self, method: str, path: str, **kwargs) -> Any:
+        try:
+            response = await self._http.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            raise ChromaError(f"{method} {path} failed: {e}") from e
+        if response.status_code >= 400:
+            raise ChromaError(
+                f"{method} {path} returned {response.status_code}: {response.text[:300]}"
+            )
+        return response.json() if response.content else None
+
+    # Server
+
+    async def heartbeat(self) -> Dict[str, Any]:
+        return await self._request("GET", "/api/v2/heartbeat")
+
+    async def max_batch_size(self) -> int:
+        """Largest number of records the server accepts in one write"""
+        checks = await self._request("GET", "/api/v2/pre-flight-checks")
+        return int(checks.get("max_batch_size", 1000))
+
+    # Collections
+
+    async def list_collections(self) -> List[Dict[str, Any]]:
+        return await self._request("GET", f"{self.base}/collections")
+
+    async def get_or_create_collection(self, name: str,
+                                       metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Return the collection's ID, creating the collection if needed"""
+        if name in self._collections:
+            return self._collections[name]
+        body: Dict[str, Any] = {"name": name, "get_or_create": True}
+        if metadata:
+            body["metadata"] = metadata
+        collection = await self._request("POST", f"{self.base}/collections", json=body)
+        self._collections[name] = collection["id"]
+        return collection["id"]
+
+    async def count(self, collection_id: str) -> int:
+        return await self._request("GET", f"{self.base}/collections/{collection_id}/count")
+
+    # Records
+
+    async def add(self, collection_id: str, ids: List[str],
+                  documents: Optional[List[str]] = None,
+                  embeddings: Optional[List[List[float]]] = None,
+                  metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        await self._request("POST", f"{self.base}/collections/{collection_id}/add",
+                            json=_records(ids, documents, embeddings, metadatas))
+
+    async def upsert(self, collection_id: str, ids: List[str],
+                     documents: Optional[List[str]] = None,
+                     embeddings: Optional[List[List[float]]] = None,
+                     metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        await self._request("POST", f"{self.base}/collections/{collection_id}/upsert",
+                            json=_records(ids, documents, embeddings, metadatas))
+
+    async def get(self, collection_id: str, ids: Optional[List[str]] = None,
+                  where: Optional[Dict[str, Any]] = None, include: Optional[List[str]] = None,
+                  limit: Optional[int] = None, offset: Optional[int] = None) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"include": include or ["metadatas"]}
+        if ids is not None:
+            body["ids"] = ids
+        if where:
+            body["where"] = where
+        if limit is not None:
+            body["limit"] = limit
+        if offset is not None:
+            body["offset"] = offset
+        return await self._request("POST", f"{self.base}/collections/{collection_id}/get",
+                                   json=body)
+
+    async def delete(self, collection_id: str, ids: Optional[List[str]] = None,
+                     where: Optional[Dict[str, Any]] = None) -> None:
+        body: Dict[str, Any] = {}
+        if ids is not None:
+            body["ids"] = ids
+        if where:
+            body["where"] = where
+        await self._request("POST", f"{self.base}/collections/{collection_id}/delete", json=body)
+
+    async def query(self, collection_id: str, query_embeddings: List[List[float]],
+                    n_results: int = 10, where: Optional[Dict[str, Any]] = None,
+                    include: Optional[List[str]] = None) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "query_embeddings": query_embeddings,
+            "n_results": n_results,
+            "include": include or ["documents", "metadatas", "distances"],
+        }
+        if where:
+            body["where"] = where
+        return await self._request("POST", f"{self.base}/collections/{collection_id}/query",
+                                   json=body)
+
+    # Text queries
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        if self.embed is None:
+            raise ChromaError("No embedder configured for text queries")
+        # Embedding is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self.embed, texts)
+
+    async def query_texts(self, collection: str, texts: List[str], n_results: int = 10,
+                          where: Optional[Dict[str, Any]] = None,
+                          include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """All texts against one collection in a single request"""
+        collection_id, embeddings = await asyncio.gather(
+            self.get_or_create_collection(collection), self.embed_texts(texts)
+        )
+        return await self.query(collection_id, embeddings, n_results, where, include)
+
+    async def query_collections(self, collections: List[str], texts: List[str],
+                                n_results: int = 10, where: Optional[Dict[str, Any]] = None,
+                                include: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """The same texts against several collections concurrently, embedding once"""
+        embeddings = await self.embed_texts(texts)
+        ids = await asyncio.gather(*(self.get_or_create_collection(c) for c in collections))
+        results = await asyncio.gather(*(
+            self.query(collection_id, embeddings, n_results, where, include)
+            for collection_id in ids
+        ))
+        return dict(zip(collections, results))
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+class ChromaClient:
+    """Synchronous facade over AsyncChromaClient, safe to share between threads"""
+
+    def __init__(self, url: str = DEFAULT_URL, tenant: str = DEFAULT_TENANT,
+                 database: str = DEFAULT_DATABASE, timeout: float = 30.0,
+                 max_connections: int = 20, embed: Optional[Embedder] = None):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="chroma-client", daemon=True)
+        self._thread.start()
+        self.client: AsyncChromaClient = self._run(self._create(
+            url, tenant, database, timeout, max_connections, embed
+        ))
+        self.url = self.client.url
+
+    @staticmethod
+    async def _create(*args) -> AsyncChromaClient:
+        # httpx binds its pool to the loop it is created on
+        return AsyncChromaClient(*args)
+
+    def _run(self, coroutine) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def heartbeat(self) -> Dict[str, Any]:
+        return self._run(self.client.heartbeat())
+
+    def max_batch_size(self) -> int:
+        return self._run(self.client.max_batch_size())
+
+    def list_collections(self) -> List[Dict[str, Any]]:
+        return self._run(self.client.list_collections())
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        return self._run(self.client.get_or_create_collection(name, metadata))
+
+    def count(self, collection_id: str) -> int:
+        return self._run(self.client.count(collection_id))
+
+    def add(self, collection_id: str, ids: List[str], documents: Optional[List[str]] = None,
+            embeddings: Optional[List[List[float]]] = None,
+            metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        self._run(self.client.add(collection_id, ids, documents, embeddings, metadatas))
+
+    def upsert(self, collection_id: str, ids: List[str], documents: Optional[List[str]] = None,
+               embeddings: Optional[List[List[float]]] = None,
+               metadatas: Optional[List[Dict[str, Any]]] = None) -> None:
+        self._run(self.client.upsert(collection_id, ids, documents, embeddings, metadatas))
+
+    def get(self, collection_id: str, ids: Optional[List[str]] = None,
+            where: Optional[Dict[str, Any]] = None, include: Optional[List[str]] = None,
+            limit: Optional[int] = None, offset: Optional[int] = None) -> Dict[str, Any]:
+        return self._run(self.client.get(collection_id, ids, where, include, limit, offset))
+
+    def delete(self, collection_id: str, ids: Optional[List[str]] = None,
+               where: Optional[Dict[str, Any]] = None) -> None:
+        self._run(self.client.delete(collection_id, ids, where))
+
+    def query(self, collection_id: str, query_embeddings: List[List[float]], n_results: int = 10,
+              where: Optional[Dict[str, Any]] = None,
+              include: Optional[List[str]] = None) -> Dict[str, Any]:
+        return self._run(self.client.query(collection_id, query_embeddings, n_results,
+                                           where, include))
+
+    def query_texts(self, collection: str, texts: List[str], n_results: int = 10,
+                    where: Optional[Dict[str, Any]] = None,
+                    include: Optional[List[str]] = None) -> Dict[str, Any]:
+        return self._run(self.client.query_texts(collection, texts, n_results, where, include))
+
+    def query_collections(self, collections: List[str], texts: List[str], n_results: int = 10,
+                          where: Optional[Dict[str, Any]] = None,
+                          include: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        return self._run(self.client.query_collections(collections, texts, n_results,
+                                                       where, include))
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._run(self.client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""
+Bulk ingestion of issues and architecture docs into Chroma
+
+Documents flow through three stages:
+
+    source generator -> batcher -> embedding workers -> upsert
+
+Batches are sized to the server's `max_batch_size` (or a smaller configured
+cap). Embedding runs in a thread pool, and a semaphore bounds the number of
+batches in flight so a slow server or embedder applies back-pressure to the
+source instead of letting pending batches pile up in memory.
+
+Documents are plain dicts: {"id", "document", "metadata"}.
+"""
+
+import glob
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from chroma_client import ChromaClient
+from embeddings import Embedder
+from markdown_chunks import chunk_markdown
+from project_migration import iter_repo_issues
+
+
+def issue_documents(session, owner: str, repo: str) -> Iterator[Dict[str, Any]]:
+    """One document per repository issue, streamed from the bulk issue fetch"""
+    for issue in iter_repo_issues(session, owner, repo):
+        text = f"#{issue['number']} {issue['title']}\n\n{issue.get('body') or ''}".strip()
+        yield {
+            "id": f"{owner}/{repo}#{issue['number']}",
+            "document": text,
+            "metadata": {
+                "source": "github_issue",
+                "repository": f"{owner}/{repo}",
+                "number": issue["number"],
+                "state": issue.get("state", ""),
+                "labels": ",".join(issue.get("labels", [])),
+                "url": issue.get("url", ""),
+                "updated_at": issue.get("updatedAt", ""),
+            },
+        }
+
+
+def markdown_files(root: str, pattern: str = "**/*.md") -> List[str]:
+    """Markdown files under root as sorted relative paths"""
+    return sorted(
+        os.path.relpath(path, root)
+        for path in glob.glob(os.path.join(root, pattern), recursive=True)
+    )
+
+
+def markdown_documents(root: str, pattern: str = "**/*.md",
+                       max_chars: int = 2000) -> Iterator[Dict[str, Any]]:
+    """Heading-aware chunks of every markdown file under root"""
+    for relative in markdown_files(root, pattern):
+        with open(os.path.join(root, relative), encoding="utf-8") as f:
+            yield from chunk_markdown(f.read(), relative, max_chars)
+
+
+def batched(documents: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class IngestPipeline:
+    """Embeds and upserts document batches into one collection"""
+
+    def __init__(self, client: ChromaClient, collection: str, embed: Embedder,
+                 batch_size: Optional[int] = None, workers: int = 4,
+                 max_in_flight: Optional[int] = None):
+        self.client = client
+        self.collection_id = client.get_or_create_collection(collection)
+        self.embed = embed
+        server_max = client.max_batch_size()
+        self.batch_size = min(batch_size, server_max) if batch_size else server_max
+        self.workers = workers
+        self._in_flight = threading.BoundedSemaphore(max_in_flight or workers * 2)
+        self._lock = threading.Lock()
+        self.failed_ids: Set[str] = set()
+        self.stats = {"documents": 0, "batches": 0, "failed": 0,
+                      "embed_seconds": 0.0, "upsert_seconds": 0.0}
+
+    def _process(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            started = time.monotonic()
+            embeddings = self.embed([doc["document"] for doc in batch])
+            embedded = time.monotonic()
+            self.client.upsert(
+                self.collection_id,
+                ids=[doc["id"] for doc in batch],
+                documents=[doc["document"] for doc in batch],
+                embeddings=embeddings,
+                metadatas=[doc["metadata"] for doc in batch],
+            )
+            with self._lock:
+                self.stats["documents"] += len(batch)
+                self.stats["batches"] += 1
+                self.stats["embed_seconds"] += embedded - started
+                self.stats["upsert_seconds"] += time.monotonic() - embedded
+        except Exception as e:
+            print(f"  ✗ Batch starting at {batch[0]['id']}: {e}")
+            with self._lock:
+                self.stats["failed"] += len(batch)
+                self.failed_ids.update(doc["id"] for doc in batch)
+        finally:
+            self._in_flight.release()
+
+    def run(self, documents: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Ingest all documents and return throughput statistics"""
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for batch in batched(documents, self.batch_size):
+                # Blocks the source while too many batches are pending
+                self._in_flight.acquire()
+                pool.submit(self._process, batch)
+        elapsed = time.monotonic() - started
+        stats = dict(self.stats)
+        stats["embed_seconds"] = round(stats["embed_seconds"], 2)
+        stats["upsert_seconds"] = round(stats["upsert_seconds"], 2)
+        stats["seconds"] = round(elapsed, 2)
+        stats["docs_per_minute"] = round(stats["documents"] / elapsed * 60) if elapsed else 0
+        return stats
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+"""
+Chroma tool implementations for the knowledge-base MCP server
+
+Plain methods behind the `chroma_*` MCP tools served by
+`scripts/chroma/chroma-kb-server.py`. Tool names and arguments match the
+upstream chroma-mcp server so agents can use either. Documents and query
+texts are embedded through a `CachedEmbedder`, so adding documents that were
+embedded before (by this server or by the bulk ingestion scripts sharing the
+same cache file) skips the model. Query results are served from a
+`QueryCache` per query text, so repeated questions skip both the embedder
+and the vector index; adding documents invalidates the collection's entries.
+
+`hybrid_query` fuses BM25 keyword ranks from an in-process inverted index with
+vector ranks by reciprocal-rank fusion. The keyword index of a collection is
+loaded from Chroma on first use, updated by `add_documents`, and reloaded when
+the collection's record count changes or the index is older than
+`keyword_max_age` (writes by other processes).
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from bm25 import BM25Index, rrf
+from chroma_client import ChromaClient
+from embedding_cache import CachedEmbedder
+from query_cache import QueryCache, merge_results, split_result
+
+
+class ChromaTools:
+    """Collection and document operations with client-side, cached embeddings"""
+
+    def __init__(self, client: ChromaClient, embed: CachedEmbedder,
+                 results: Optional[QueryCache] = None, keyword_check_interval: float = 30.0,
+                 keyword_max_age: float = 600.0):
+        self.client = client
+        self.embed = embed
+        self.results = results if results is not None else QueryCache()
+        self.keyword_check_interval = keyword_check_interval
+        self.keyword_max_age = keyword_max_age
+        # collection -> (index, loaded at, last count check)
+        self._keyword: Dict[str, Tuple[BM25Index, float, float]] = {}
+        self._keyword_lock = threading.Lock()
+
+    def list_collections(self) -> List[str]:
+        return [collection["name"] for collection in self.client.list_collections()]
+
+    def create_collection(self, collection_name: str,
+                          metadata: Optional[Dict[str, Any]] = None) -> str:
+        self.client.get_or_create_collection(collection_name, metadata)
+        return f"Collection '{collection_name}' is ready"
+
+    def add_documents(self, collection_name: str, documents: List[str], ids: List[str],
+                      metadatas: Optional[List[Dict[str, Any]]] = None) -> str:
+        if len(ids) != len(documents):
+            raise ValueError("ids and documents must have the same length")
+        collection_id = self.client.get_or_create_collection(collection_name)
+        try:
+            self.client.add(collection_id, ids=ids, documents=documents,
+                            embeddings=self.embed(documents), metadatas=metadatas)
+        finally:
+            # Bump even on failure: the write may have partially applied
+            self.results.bump(collection_name)
+        with self._keyword_lock:
+            if collection_name in self._keyword:
+                index = self._keyword[collection_name][0]
+                for i, (doc_id, document) in enumerate(zip(ids, documents)):
+                    index.add(doc_id, document, metadatas[i] if metadatas else None)
+        return f"Added {len(documents)} documents to '{collection_name}'"
+
+    def query_documents(self, collection_name: str, query_texts: List[str], n_results: int = 5,
+                        where: Optional[Dict[str, Any]] = None,
+                        include: Optional[List[str]] = None) -> Dict[str, Any]:
+        keys = [self.results.key(collection_name, text, n_results, where, include)
+                for text in query_texts]
+        parts = [self.results.get(key) for key in keys]
+        missing = [i for i, part in enumerate(parts) if part is None]
+        if missing:
+            collection_id = self.client.get_or_create_collection(collection_name)
+            result = self.client.query(
+                collection_id, self.embed([query_texts[i] for i in missing]),
+                n_results=n_results, where=where, include=include,
+            )
+            for i, part in zip(missing, split_result(result, len(missing))):
+                parts[i] = part
+                self.results.put(keys[i], part)
+        return merge_results(parts)
+
+    def _load_keyword_index(self, collection_id: str, page: int = 1000) -> BM25Index:
+        index = BM25Index()
+        offset = 0
+        while True:
+            batch = self.client.get(collection_id, include=["documents", "metadatas"],
+                                    limit=page, offset=offset)
+            ids = batch.get("ids") or []
+            for doc_id, document, metadata in zip(
+                ids, batch.get("documents") or [None] * len(ids),
+                batch.get("metadatas") or [None] * len(ids),
+            ):
+                index.add(doc_id, document or "", metadata)
+            if len(ids) < page:
+                return index
+            offset += page
+
+    def keyword_index(self, collection_name: str) -> BM25Index:
+        """The collection's BM25 index, (re)loaded from Chroma when stale"""
+        with self._keyword_lock:
+            collection_id = self.client.get_or_create_collection(collection_name)
+            now = time.monotonic()
+            entry = self._keyword.get(collection_name)
+            if entry is not None:
+                index, loaded_at, checked_at = entry
+                if now - loaded_at < self.keyword_max_age:
+                    if now - checked_at < self.keyword_check_interval:
+                        return index
+                    if self.client.count(collection_id) == len(index):
+                        self._keyword[collection_name] = (index, loaded_at, now)
+                        return index
+            index = self._load_keyword_index(collection_id)
+            self._keyword[collection_name] = (index, now, now)
+            return index
+
+    def hybrid_query(self, collection_name: str, query_text: str, n_results: int = 5,
+                     where: Optional[Dict[str, Any]] = None, mode: str = "hybrid",
+                     candidates: int = 50) -> List[Dict[str, Any]]:
+        """Keyword, vector or RRF-fused hybrid search for one query text"""
+        if mode not in ("hybrid", "keyword", "vector"):
+            raise ValueError("mode must be 'hybrid', 'keyword' or 'vector'")
+        depth = max(candidates, n_results)
+        found: Dict[str, Dict[str, Any]] = {}
+        rankings: List[List[str]] = []
+
+        keyword_ranks: Dict[str, int] = {}
+        if mode != "vector":
+            index = self.keyword_index(collection_name)
+            ranked = [doc_id for doc_id, _ in index.search(query_text, depth, where)]
+            keyword_ranks = {doc_id: rank for rank, doc_id in enumerate(ranked, start=1)}
+            for doc_id in ranked:
+                found[doc_id] = {"id": doc_id, "document": index.documents[doc_id],
+                                 "metadata": index.metadatas[doc_id]}
+            rankings.append(ranked)
+
+        vector_ranks: Dict[str, int] = {}
+        if mode != "keyword":
+            result = self.query_documents(collection_name, [query_text], depth, where,
+                                          ["documents", "metadatas", "distances"])
+            ranked = result["ids"][0]
+            vector_ranks = {doc_id: rank for rank, doc_id in enumerate(ranked, start=1)}
+            for i, doc_id in enumerate(ranked):
+                found.setdefault(doc_id, {
+                    "id": doc_id,
+                    "document": result["documents"][0][i],
+                    "metadata": result["metadatas"][0][i],
+                })["distance"] = result["distances"][0][i]
+            rankings.append(ranked)
+
+        hits = []
+        for doc_id, score in rrf(rankings)[:n_results]:
+            hit = dict(found[doc_id], score=round(score, 6))
+            hit["keyword_rank"] = keyword_ranks.get(doc_id)
+            hit["vector_rank"] = vector_ranks.get(doc_id)
+            hits.append(hit)
+        return hits
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return {
+            "embeddings": dict(self.embed.stats, entries=len(self.embed.cache)),
+            "queries": dict(self.results.stats, entries=len(self.results)),
+        }
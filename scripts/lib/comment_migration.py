@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+
+"""
+Comment migration stage
+
+Streams issue comments through paginated `comments(first: 100)` connections
+and copies them into the project as draft issues, one per source issue
+("Comments: #N <title>"), whose bodies hold the migrated comments. Writes are
+sent as batched GraphQL documents (several aliased mutations per request).
+
+Every migrated comment is rendered with a `<!-- comment-sha:... -->` marker
+holding a hash of its author, timestamp and normalized body. Re-runs read the
+markers back from the existing drafts and only append comments whose hash is
+not there yet, so repeated migrations are idempotent.
+
+Projects V2 has no API for item notes, which is why draft issue bodies are
+the write target.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+COMMENT_PAGE = 100
+ISSUE_PAGE = 50
+
+# Draft issue bodies are limited to 65536 characters
+MAX_BODY = 65000
+
+DRAFT_TITLE_PREFIX = "Comments: #"
+
+HASH_MARKER = re.compile(r"<!-- comment-sha:([0-9a-f]{16}) -->")
+
+ISSUES_WITH_COMMENTS_QUERY = """
+query($owner:String!, $name:String!, $cursor:String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: %d, after: $cursor, states: [OPEN, CLOSED]) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        number
+        title
+        comments(first: %d) {
+          pageInfo {
+            hasNextPage
+            endCursor
+          }
+          nodes {
+            author {
+              login
+            }
+            createdAt
+            body
+            url
+          }
+        }
+      }
+    }
+  }
+}
+""" % (ISSUE_PAGE, COMMENT_PAGE)
+
+ISSUE_COMMENTS_QUERY = """
+query($owner:String!, $name:String!, $number:Int!, $cursor:String) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) {
+      comments(first: %d, after: $cursor) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          author {
+            login
+          }
+          createdAt
+          body
+          url
+        }
+      }
+    }
+  }
+}
+""" % COMMENT_PAGE
+
+PROJECT_DRAFTS_QUERY = """
+query($projectId:ID!, $cursor:String) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: 100, after: $cursor) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+          content {
+            ... on DraftIssue {
+              id
+              title
+              body
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def normalize(text: str) -> str:
+    """Normalize line endings and trailing whitespace before hashing"""
+    lines = (text or "").replace("\r\n", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def comment_hash(comment: Dict[str, Any]) -> str:
+    author = (comment.get("author") or {}).get("login", "ghost")
+    content = f"{author}\n{comment.get('createdAt', '')}\n{normalize(comment.get('body', ''))}"
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+def render_comment(comment: Dict[str, Any], digest: str) -> str:
+    author = (comment.get("author") or {}).get("login", "ghost")
+    return (
+        f"<!-- comment-sha:{digest} -->\n"
+        f"**@{author}** commented on {comment.get('createdAt', '')} "
+        f"([original]({comment.get('url', '')})):\n\n"
+        f"{normalize(comment.get('body', ''))}\n\n---\n"
+    )
+
+
+def draft_title(number: int, title: str) -> str:
+    return f"{DRAFT_TITLE_PREFIX}{number} {title}"
+
+
+def batch_document(mutations: List[Tuple[str, str, Dict[str, Any]]]) -> Tuple[str, Dict[str, Any]]:
+    """Combine (field, arguments, variables) mutations into one aliased document
+
+    `arguments` refers to its variables as `$name`; each mutation's variables
+    are renamed `$m<i>_name` so they do not collide.
+    """
+    declarations = []
+    selections = []
+    variables = {}
+    for i, (field, arguments, values) in enumerate(mutations):
+        for name, (gql_type, value) in values.items():
+            declarations.append(f"$m{i}_{name}:{gql_type}")
+            variables[f"m{i}_{name}"] = value
+            arguments = re.sub(rf"\${name}\b", f"$m{i}_{name}", arguments)
+        selections.append(f"  m{i}: {field}(input: {{{arguments}}}) {{ clientMutationId }}")
+    document = f"mutation({', '.join(declarations)}) {{\n" + "\n".join(selections) + "\n}"
+    return document, variables
+
+
+class CommentMigrator:
+    """Streams comments into per-issue draft issues with batched writes"""
+
+    def __init__(self, session, owner: str, repo: str, project_id: str, batch_size: int = 10):
+        self.session = session
+        self.owner = owner
+        self.repo = repo
+        self.project_id = project_id
+        self.batch_size = batch_size
+        self.drafts: Dict[int, Dict[str, Any]] = {}
+        self._pending: List[Tuple[str, str, Dict[str, Any]]] = []
+        self.stats = {
+            "issues": 0, "comments": 0, "copied": 0, "skipped": 0,
+            "truncated": 0, "requests": 0,
+        }
+
+    # Reading
+
+    def load_drafts(self) -> None:
+        """Index existing comment drafts in the project by issue number"""
+        cursor = None
+        pattern = re.compile(rf"^{re.escape(DRAFT_TITLE_PREFIX)}(\d+)\b")
+        while True:
+            data = self.session.query(
+                PROJECT_DRAFTS_QUERY, {"projectId": self.project_id, "cursor": cursor}
+            )
+            page = data["node"]["items"]
+            for node in page["nodes"]:
+                content = node.get("content") or {}
+                match = pattern.match(content.get("title") or "")
+                if match:
+                    self.drafts[int(match.group(1))] = content
+            if not page["pageInfo"]["hasNextPage"]:
+                return
+            cursor = page["pageInfo"]["endCursor"]
+
+    def _remaining_comments(self, number: int, cursor: str) -> Iterator[Dict[str, Any]]:
+        while cursor:
+            data = self.session.query(ISSUE_COMMENTS_QUERY, {
+                "owner": self.owner, "name": self.repo,
+                "number": number, "cursor": cursor,
+            })
+            connection = data["repository"]["issue"]["comments"]
+            yield from connection["nodes"]
+            info = connection["pageInfo"]
+            cursor = info["endCursor"] if info["hasNextPage"] else None
+
+    def stream_issues(self, numbers: Optional[Set[int]] = None) -> Iterator[Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]]:
+        """Yield (issue, comments) for each issue that has comments
+
+        The first page of comments arrives with the issue listing; further
+        pages are only fetched when the caller iterates past them.
+        """
+        cursor = None
+        while True:
+            data = self.session.query(ISSUES_WITH_COMMENTS_QUERY, {
+                "owner": self.owner, "name": self.repo, "cursor": cursor
+            })
+            page = data["repository"]["issues"]
+            for issue in page["nodes"]:
+                if numbers is not None and issue["number"] not in numbers:
+                    continue
+                connection = issue.pop("comments")
+                if not connection["nodes"]:
+                    continue
+                info = connection["pageInfo"]
+                rest = self._remaining_comments(
+                    issue["number"], info["endCursor"] if info["hasNextPage"] else None
+                )
+
+                def comments(first=connection["nodes"], rest=rest):
+                    yield from first
+                    yield from rest
+                yield issue, comments()
+            if not page["pageInfo"]["hasNextPage"]:
+                return
+            cursor = page["pageInfo"]["endCursor"]
+
+    # Writing
+
+    def _queue(self, field: str, arguments: str, values: Dict[str, Any]) -> None:
+        self._pending.append((field, arguments, values))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Send all queued mutations as one request"""
+        if not self._pending:
+            return
+        document, variables = batch_document(self._pending)
+        self._pending = []
+        self.session.query(document, variables)
+        self.stats["requests"] += 1
+
+    def migrate_issue(self, issue: Dict[str, Any], comments: Iterator[Dict[str, Any]]) -> int:
+        """Queue the write for one issue's new comments; returns how many"""
+        number = issue["number"]
+        draft = self.drafts.get(number)
+        body = draft.get("body", "") if draft else ""
+        seen = set(HASH_MARKER.findall(body))
+
+        additions = []
+        for comment in comments:
+            self.stats["comments"] += 1
+            digest = comment_hash(comment)
+            if digest in seen:
+                self.stats["skipped"] += 1
+                continue
+            seen.add(digest)
+            additions.append(render_comment(comment, digest))
+
+        if not additions:
+            return 0
+
+        if not body:
+            body = f"Comments migrated from #{number}.\n\n---\n"
+        copied = 0
+        for block in additions:
+            if len(body) + len(block) > MAX_BODY:
+                self.stats["truncated"] += len(additions) - copied
+                print(f"  ⚠️ Draft for #{number} is full; {len(additions) - copied} comments not copied")
+                break
+            body += block
+            copied += 1
+
+        if draft:
+            self._queue("updateProjectV2DraftIssue",
+                        "draftIssueId: $draftId, body: $body",
+                        {"draftId": ("ID!", draft["id"]), "body": ("String!", body)})
+            draft["body"] = body
+        else:
+            self._queue("addProjectV2DraftIssue",
+                        "projectId: $projectId, title: $title, body: $body",
+                        {"projectId": ("ID!", self.project_id),
+                         "title": ("String!", draft_title(number, issue["title"])),
+                         "body": ("String!", body)})
+        self.stats["copied"] += copied
+        return copied
+
+    def run(self, numbers: Optional[Set[int]] = None) -> Dict[str, int]:
+        """Migrate comments for all issues (or only the given numbers)"""
+        self.load_drafts()
+        for issue, comments in self.stream_issues(numbers):
+            self.stats["issues"] += 1
+            copied = self.migrate_issue(issue, comments)
+            if copied:
+                print(f"  ✓ #{issue['number']}: {copied} new comments queued")
+        self.flush()
+        return self.stats
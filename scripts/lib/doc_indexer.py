@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+
+"""
+Incremental markdown indexer for Chroma
+
+Keeps a Chroma collection in step with a markdown tree using a small state
+file that records, per file, its mtime, size, content hash and the hashes of
+the chunks it produced:
+
+- files whose mtime and size are unchanged are skipped without being read;
+- files whose content hash is unchanged only have their mtime refreshed;
+- changed files are re-chunked, and only chunks whose hash changed are
+  embedded and upserted; chunks that disappeared are deleted;
+- files that were removed have all their chunks deleted.
+
+State for a file is only advanced once its chunks were written, so a failed
+run is retried on the next one.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from chroma_client import ChromaClient
+from chroma_ingest import IngestPipeline, markdown_files
+from embeddings import Embedder
+from markdown_chunks import chunk_markdown
+
+
+class DocIndexer:
+    """Syncs the chunks of a markdown tree into one collection"""
+
+    def __init__(self, client: ChromaClient, collection: str, embed: Embedder, root: str,
+                 state_path: str, max_chars: int = 2000, workers: int = 4):
+        self.client = client
+        self.root = root
+        self.state_path = state_path
+        self.max_chars = max_chars
+        self.pipeline = IngestPipeline(client, collection, embed, workers=workers)
+        self.state: Dict[str, Any] = {"files": {}}
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                self.state = json.load(f)
+
+    def save_state(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        temp = f"{self.state_path}.tmp"
+        with open(temp, "w") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(temp, self.state_path)
+
+    def _delete(self, ids: List[str]) -> None:
+        size = self.pipeline.batch_size
+        for start in range(0, len(ids), size):
+            self.client.delete(self.pipeline.collection_id, ids=ids[start:start + size])
+
+    def run(self, force: bool = False) -> Dict[str, Any]:
+        """Index changes since the last run (everything when force is set)"""
+        files = self.state["files"]
+        stats = {"files": 0, "unchanged": 0, "changed": 0, "removed": 0,
+                 "upserted": 0, "deleted": 0, "failed": 0}
+        upserts: List[Dict[str, Any]] = []
+        deletes: List[str] = []
+        pending: Dict[str, Dict[str, Any]] = {}
+
+        current = markdown_files(self.root)
+        for relative in current:
+            stats["files"] += 1
+            path = os.path.join(self.root, relative)
+            info = os.stat(path)
+            known = files.get(relative)
+            if (not force and known and known["mtime"] == info.st_mtime
+                    and known["size"] == info.st_size):
+                stats["unchanged"] += 1
+                continue
+
+            with open(path, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            if not force and known and known["sha256"] == digest:
+                known.update(mtime=info.st_mtime, size=info.st_size)
+                stats["unchanged"] += 1
+                continue
+
+            stats["changed"] += 1
+            old_chunks = known["chunks"] if known else {}
+            chunks = chunk_markdown(raw.decode("utf-8"), relative, self.max_chars)
+            new_chunks = {chunk["id"]: chunk["metadata"]["hash"] for chunk in chunks}
+            upserts.extend(
+                chunk for chunk in chunks
+                if force or old_chunks.get(chunk["id"]) != chunk["metadata"]["hash"]
+            )
+            deletes.extend(sorted(set(old_chunks) - set(new_chunks)))
+            pending[relative] = {"mtime": info.st_mtime, "size": info.st_size,
+                                 "sha256": digest, "chunks": new_chunks}
+
+        for relative in sorted(set(files) - set(current)):
+            stats["removed"] += 1
+            deletes.extend(sorted(files.pop(relative)["chunks"]))
+
+        if upserts:
+            self.pipeline.run(upserts)
+        if deletes:
+            self._delete(deletes)
+        stats["upserted"] = len(upserts) - len(self.pipeline.failed_ids)
+        stats["deleted"] = len(deletes)
+
+        failed_files = {chunk["metadata"]["path"] for chunk in upserts
+                        if chunk["id"] in self.pipeline.failed_ids}
+        stats["failed"] = len(failed_files)
+        for relative, entry in pending.items():
+            if relative not in failed_files:
+                files[relative] = entry
+        self.save_state()
+        return stats
+
+
+def default_state_path(collection: str, root: Optional[str] = None) -> str:
+    """Per-collection state file under ~/.cache"""
+    name = collection
+    if root:
+        name += "-" + hashlib.sha256(os.path.abspath(root).encode()).hexdigest()[:8]
+    return os.path.join(os.path.expanduser("~"), ".cache", f"chroma-doc-index-{name}.json")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+"""
+Persistent embedding cache
+
+Embeddings are stored in a SQLite file keyed by a hash of (model, normalized
+content), so re-ingesting an unchanged issue body or markdown chunk costs a
+lookup instead of a model call. The cache is bounded by entry count: once it
+is exceeded, least recently used entries are evicted down to 90% of the bound.
+Vectors are stored as packed float32.
+"""
+
+import array
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from embeddings import Embedder
+
+DEFAULT_PATH = os.environ.get(
+    "EMBEDDING_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "chroma-embeddings.sqlite")
+)
+EVICT_TO = 0.9  # fraction of max_entries kept after an eviction
+
+
+def normalize(text: str) -> str:
+    """Whitespace-insensitive form of a document used for cache keys"""
+    return " ".join(text.split())
+
+
+def cache_key(model: str, text: str) -> str:
+    return hashlib.sha256(f"{model}\0{normalize(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU map from cache key to vector"""
+
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = 200_000):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS by_last_used ON embeddings(last_used)")
+        self._db.commit()
+        # Entry count kept in step with inserts and evictions, so COUNT(*) only
+        # runs when the bound is exceeded (and picks up other processes' writes)
+        self._count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the keys that are present; marks them as used"""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, blob in rows:
+                    vector = array.array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+            if found:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._db.commit()
+        return found
+
+    def put_many(self, vectors: Dict[str, List[float]]) -> None:
+        now = time.time()
+        rows = [(array.array("f", vector).tobytes(), now, key) for key, vector in vectors.items()]
+        with self._lock:
+            # Insert new keys first: total_changes then counts only entries that did not exist
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO embeddings (vector, last_used, key) VALUES (?, ?, ?)", rows
+            )
+            added = self._db.total_changes - before
+            if added < len(rows):
+                self._db.executemany(
+                    "UPDATE embeddings SET vector = ?, last_used = ? WHERE key = ?", rows
+                )
+            self._count += added
+            if self._count > self.max_entries:
+                self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        excess = count - int(self.max_entries * EVICT_TO) if count > self.max_entries else 0
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM embeddings WHERE key IN ("
+                " SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+        self._count = count - excess
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._count = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return self._count
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CachedEmbedder:
+    """Embedder wrapper that only computes vectors missing from the cache"""
+
+    def __init__(self, embed: Embedder, model: str, cache: Optional[EmbeddingCache] = None):
+        self.embed = embed
+        self.model = model
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: List[str]) -> List[List[float]]:
+        keys = [cache_key(self.model, text) for text in texts]
+        vectors = self.cache.get_many(keys)
+        # Identical texts within a batch are embedded once
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            computed = dict(zip(missing, self.embed(list(missing.values()))))
+            self.cache.put_many(computed)
+            vectors.update(computed)
+        with self._lock:
+            self.stats["misses"] += len(missing)
+            self.stats["hits"] += len(texts) - len(missing)
+        return [vectors[key] for key in keys]
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+
+"""
+Embedding functions for Chroma ingestion
+
+The Chroma HTTP API stores vectors but does not compute them, so documents
+are embedded client-side. By default this uses the same model Chroma's own
+Python client uses (all-MiniLM-L6-v2 through `chromadb`); a
+sentence-transformers model can be named instead. Both are optional
+dependencies and are only imported when an embedder is requested.
+"""
+
+from typing import Callable, List
+
+Embedder = Callable[[List[str]], List[List[float]]]
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+
+def get_embedder(model: str = DEFAULT_MODEL) -> Embedder:
+    """Return a function mapping a batch of texts to embedding vectors"""
+    if model == DEFAULT_MODEL:
+        try:
+            from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+        except ImportError:
+            pass
+        else:
+            function = DefaultEmbeddingFunction()
+            return lambda texts: [list(map(float, v)) for v in function(texts)]
+
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        raise ImportError(
+            "No embedding backend found. Install one with "
+            "'pip install chromadb' or 'pip install sentence-transformers'"
+        )
+    encoder = SentenceTransformer(model)
+    return lambda texts: encoder.encode(texts, convert_to_numpy=True).tolist()
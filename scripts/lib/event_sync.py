@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+
+"""
+Webhook-driven incremental project sync
+
+Applies GitHub `issues`, `projects_v2_item` and `sub_issues` webhook payloads
+to a ProjectIndex and plans only the mutations those events make necessary,
+instead of rescanning the whole project. Planning is separate from execution
+so recorded payloads can be replayed against an index snapshot offline.
+
+Planned actions are plain dicts:
+    {"op": "add_issue", "number": 12}
+    {"op": "set_field", "number": 12, "field": "Priority", "value": "High"}
+    {"op": "fetch_item", "item_id": "PVTI_..."}
+"""
+
+import copy
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from field_rules import label_values
+from project_index import ProjectIndex
+
+ISSUE_ACTIONS_TRACKED = {
+    "opened", "reopened", "edited", "labeled", "unlabeled", "closed",
+    "transferred", "deleted",
+}
+
+
+class EventSync:
+    """Turns webhook events into index updates and a minimal mutation plan"""
+
+    def __init__(self, index: ProjectIndex):
+        self.index = index
+        self.stats = {"events": 0, "ignored": 0, "actions": 0}
+
+    # Planning
+
+    def apply(self, event: str, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Apply one event to the index and return the actions it requires"""
+        self.stats["events"] += 1
+        handler = {
+            "issues": self._on_issue,
+            "projects_v2_item": self._on_project_item,
+            "sub_issues": self._on_sub_issue,
+        }.get(event)
+        actions = handler(payload) if handler else None
+        if actions is None:
+            self.stats["ignored"] += 1
+            return []
+        return actions
+
+    def apply_batch(self, events: Iterable[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Apply events in order and return one deduplicated plan for all of them"""
+        adds: Dict[int, Dict[str, Any]] = {}
+        fetches: Dict[str, Dict[str, Any]] = {}
+        sets: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        for event, payload in events:
+            for action in self.apply(event, payload):
+                if action["op"] == "add_issue":
+                    adds[action["number"]] = action
+                elif action["op"] == "fetch_item":
+                    fetches[action["item_id"]] = action
+                else:
+                    # Later events supersede earlier ones for the same field
+                    sets[(action["number"], action["field"])] = action
+        plan = list(adds.values()) + list(fetches.values()) + list(sets.values())
+        self.stats["actions"] += len(plan)
+        return plan
+
+    def _is_our_repo(self, repository: Optional[Dict[str, Any]]) -> bool:
+        return bool(repository) and repository.get("name") == self.index.repo
+
+    def _on_issue(self, payload: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        action = payload.get("action")
+        issue = payload.get("issue") or {}
+        number = issue.get("number")
+        if action not in ISSUE_ACTIONS_TRACKED or number is None:
+            return None
+        if not self._is_our_repo(payload.get("repository")):
+            return None
+
+        item = self.index.find(number=number)
+        if action in ("deleted", "transferred"):
+            # GitHub removes the project item along with the issue
+            if item is not None:
+                self.index.remove_item(item["id"])
+            return []
+
+        labels = [label.get("name") for label in issue.get("labels", [])]
+        actions = []
+        if item is None:
+            actions.append({"op": "add_issue", "number": number})
+            current = {}
+        else:
+            updated = copy.deepcopy(item)
+            updated["title"] = issue.get("title", item.get("title"))
+            updated["state"] = (issue.get("state") or "").upper() or item.get("state")
+            updated["labels"] = labels
+            self.index.upsert_item(updated)
+            current = updated["fields"]
+
+        for field, value in label_values(labels, number,
+                                         f"{self.index.owner}/{self.index.repo}").items():
+            if field in self.index.fields and current.get(field) != value:
+                actions.append({
+                    "op": "set_field", "number": number,
+                    "field": field, "value": value,
+                })
+        return actions
+
+    def _on_project_item(self, payload: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        action = payload.get("action")
+        project_item = payload.get("projects_v2_item") or {}
+        if project_item.get("project_node_id") != self.index.project_id:
+            return None
+        item_id = project_item.get("node_id")
+        if not item_id:
+            return None
+
+        if action in ("deleted", "archived"):
+            self.index.remove_item(item_id)
+            return []
+        if action in ("created", "restored", "edited", "converted"):
+            # Payloads carry IDs only; refresh just this item
+            return [{"op": "fetch_item", "item_id": item_id}]
+        return []
+
+    def _on_sub_issue(self, payload: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        action = payload.get("action")
+        parent = (payload.get("parent_issue") or {}).get("number")
+        child = (payload.get("sub_issue") or {}).get("number")
+        if action not in ("sub_issue_added", "sub_issue_removed",
+                          "parent_issue_added", "parent_issue_removed"):
+            return None
+        item = self.index.find(number=child)
+        if item is None:
+            return []
+
+        updated = copy.deepcopy(item)
+        if action.endswith("_added"):
+            updated["parent"] = parent
+        elif updated.get("parent") == parent:
+            updated.pop("parent", None)
+        self.index.upsert_item(updated)
+        return []
+
+    # Execution
+
+    def execute(self, plan: List[Dict[str, Any]], dry_run: bool = False) -> Dict[str, int]:
+        """Run planned actions against the API (or just print them)"""
+        results = {"applied": 0, "skipped": 0, "failed": 0}
+        for action in plan:
+            if dry_run:
+                print(f"  [dry-run] {action}")
+                results["skipped"] += 1
+                continue
+            try:
+                if action["op"] == "add_issue":
+                    self.index.add_issue(action["number"])
+                elif action["op"] == "fetch_item":
+                    item = self.index.fetch_item(action["item_id"])
+                    if item is not None:
+                        self.index.upsert_item(item)
+                elif action["op"] == "set_field":
+                    item = self.index.find(number=action["number"])
+                    if item is None or item["fields"].get(action["field"]) == action["value"]:
+                        results["skipped"] += 1
+                        continue
+                    self.index.set_field(item["id"], action["field"], action["value"])
+                results["applied"] += 1
+            except Exception as e:
+                print(f"  ✗ {action}: {e}")
+                results["failed"] += 1
+        return results
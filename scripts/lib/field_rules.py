@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+"""
+Label-to-field rules for project items
+
+Field values are derived from a declarative rule file
+(`scripts/fields/field-rules.json`) instead of per-script label parsing and
+hand-maintained mapping dicts. The file is compiled once into lookup tables:
+
+- every distinct label string is resolved to its (field, value) pairs once,
+  so mapping a whole repository is a dict lookup per label rather than a
+  prefix scan per label per item;
+- per-issue overrides (the former COMPONENT/STORY_POINTS/PRIORITY mappings)
+  and parent epics are declared per repository ("owner/repo"), since issue
+  numbers are only unique within one;
+- with a project field registry, values are further resolved to interned
+  field and option IDs ready to be sent as mutations.
+
+Precedence, lowest to highest: defaults, per-issue overrides, label rules.
+An override fills in a field the issue has no label for; a label on the
+issue always wins. The first matching label wins for each field.
+"""
+
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+RULES_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "fields", "field-rules.json"
+)
+
+TRANSFORMS = {
+    "strip": lambda v: v,
+    "title": lambda v: v.title(),
+    "int": int,
+}
+
+
+class FieldRules:
+    """Compiled label and per-issue rules"""
+
+    def __init__(self, rules: Dict[str, Any]):
+        labels = rules.get("labels", {})
+        self._exact = {
+            sys.intern(label): tuple(values.items())
+            for label, values in labels.get("exact", {}).items()
+        }
+        self._prefixes = [
+            (prefix, sys.intern(spec["field"]), TRANSFORMS[spec.get("transform", "strip")])
+            for prefix, spec in labels.get("prefix", {}).items()
+        ]
+        self.defaults = dict(rules.get("defaults", {}))
+        # "owner/repo" -> issue number -> {field: value}
+        self.overrides: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        # "owner/repo" -> user story number -> epic number
+        self.parents: Dict[str, Dict[int, int]] = {}
+        for repo, spec in rules.get("repositories", {}).items():
+            overrides = self.overrides.setdefault(repo, {})
+            for field, mapping in spec.get("issues", {}).items():
+                for number, value in mapping.items():
+                    overrides.setdefault(int(number), {})[sys.intern(field)] = value
+            self.parents[repo] = {int(k): int(v) for k, v in spec.get("parents", {}).items()}
+        # label -> ((field, value), ...), filled on first sight of each label
+        self._label_table: Dict[str, Tuple[Tuple[str, Any], ...]] = {}
+
+    def _resolve_label(self, label: str) -> Tuple[Tuple[str, Any], ...]:
+        pairs = self._label_table.get(label)
+        if pairs is not None:
+            return pairs
+        pairs = self._exact.get(label, ())
+        for prefix, field, transform in self._prefixes:
+            if label.startswith(prefix):
+                try:
+                    pairs = pairs + ((field, transform(label[len(prefix):].strip())),)
+                except ValueError:
+                    pass  # e.g. "points:lots" - ignore the label
+                break
+        self._label_table[sys.intern(label)] = pairs
+        return pairs
+
+    def compile_labels(self, labels: Iterable[str]) -> None:
+        """Resolve a label vocabulary up front (e.g. all labels of a repository)"""
+        for label in set(labels):
+            self._resolve_label(label)
+
+    def values_for(self, labels: Iterable[str], number: Optional[int] = None,
+                   repo: Optional[str] = None) -> Dict[str, Any]:
+        """Field values for an issue of repo ("owner/repo") from its labels and overrides"""
+        values = dict(self.defaults)
+        if number is not None and repo is not None:
+            values.update(self.overrides.get(repo, {}).get(int(number), {}))
+        from_labels: Dict[str, Any] = {}
+        for label in labels:
+            for field, value in self._resolve_label(label):
+                from_labels.setdefault(field, value)
+        values.update(from_labels)
+        return values
+
+    def map_issues(self, issues: Iterable[Dict[str, Any]],
+                   repo: Optional[str] = None) -> Dict[int, Dict[str, Any]]:
+        """Field values for many issues ({"number", "labels"}) of one repository in one pass"""
+        issues = list(issues)
+        self.compile_labels(
+            label for issue in issues for label in label_names(issue.get("labels", []))
+        )
+        return {
+            int(issue["number"]): self.values_for(
+                label_names(issue.get("labels", [])), issue["number"], repo
+            )
+            for issue in issues
+        }
+
+    def issue_values(self, field: str, repo: str) -> Dict[str, Any]:
+        """Per-issue overrides of a repository for one field as {"number": value}"""
+        return {
+            str(number): values[field]
+            for number, values in sorted(self.overrides.get(repo, {}).items())
+            if field in values
+        }
+
+    def children(self, repo: str) -> Dict[str, List[str]]:
+        """Parent epics of a repository as {"epic": ["story", ...]}"""
+        children: Dict[str, List[str]] = {}
+        for story, epic in sorted(self.parents.get(repo, {}).items()):
+            children.setdefault(str(epic), []).append(str(story))
+        return children
+
+
+class OptionTable:
+    """Field values resolved to interned field/option IDs for one project"""
+
+    def __init__(self, fields: Dict[str, Dict[str, Any]]):
+        """fields: {name: {"id", "dataType", "options": {name: id}}}"""
+        self._ids: Dict[Tuple[str, Any], Tuple[str, str, Any]] = {}
+        self.fields = fields
+        for name, field in fields.items():
+            for option, option_id in field.get("options", {}).items():
+                self._ids[(name, option)] = (
+                    sys.intern(field["id"]), "singleSelectOptionId", sys.intern(option_id)
+                )
+
+    def resolve(self, field: str, value: Any) -> Optional[Tuple[str, str, Any]]:
+        """(field ID, value kind, value) for a field value, or None if unknown"""
+        resolved = self._ids.get((field, value))
+        if resolved is not None:
+            return resolved
+        spec = self.fields.get(field)
+        if spec and spec.get("dataType") == "NUMBER":
+            try:
+                return spec["id"], "number", float(value)
+            except (TypeError, ValueError):
+                return None
+        return None
+
+
+def label_names(labels: List[Any]) -> List[str]:
+    """Label names from either plain strings or {"name": ...} objects"""
+    return [label if isinstance(label, str) else label.get("name", "") for label in labels]
+
+
+def load_rules(path: str = RULES_FILE) -> FieldRules:
+    with open(path) as f:
+        return FieldRules(json.load(f))
+
+
+_DEFAULT_RULES: Optional[FieldRules] = None
+
+
+def default_rules() -> FieldRules:
+    """The repository's rule file, compiled once per process"""
+    global _DEFAULT_RULES
+    if _DEFAULT_RULES is None:
+        _DEFAULT_RULES = load_rules()
+    return _DEFAULT_RULES
+
+
+def label_values(labels: List[str], number: Optional[int] = None,
+                 repo: Optional[str] = None) -> Dict[str, Any]:
+    """Field values implied by an issue's labels (and the repository's per-issue overrides)"""
+    return default_rules().values_for(labels, number, repo)
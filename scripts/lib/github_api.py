@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+"""
+Shared GitHub API helpers for the project scripts
+
+Wraps the `gh` CLI the same way the individual scripts do, but routes reads
+through a SingleFlight group so that identical queries (same query text and
+variables, or the same `gh` command line) issued by several workers share one
+network call. Mutations are never coalesced and should be followed by
+`invalidate()` when they change data that later reads depend on.
+
+Long-running processes (see `project-daemon.py`) use GraphQLSession instead,
+which authenticates once and keeps an HTTPS connection to the API open.
+"""
+
+import http.client
+import json
+import os
+import subprocess
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from single_flight import SingleFlight
+
+# Shared by every read in this process; scripts are short-lived, so results
+# stay valid for the length of a typical run unless explicitly invalidated
+READS = SingleFlight(ttl=300)
+
+
+def run_command(cmd: List[str]) -> Tuple[bool, str]:
+    """Run a command and return if it succeeded and the output"""
+    try:
+        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        return True, result.stdout
+    except subprocess.CalledProcessError as e:
+        return False, f"Error: {e.stderr}"
+
+
+def graphql_command(query: str, variables: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Build the `gh api graphql` command line for a query"""
+    cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for name, value in sorted((variables or {}).items()):
+        cmd += ["-f", f"{name}={value}"]
+    return cmd
+
+
+def read_key(cmd: List[str]) -> Tuple[str, ...]:
+    """Coalescing key for a read: the full command line"""
+    return tuple(cmd)
+
+
+def cached_command(cmd: List[str]) -> Tuple[bool, str]:
+    """Run a read-only command, sharing the result with duplicate callers"""
+    key = read_key(cmd)
+    success, output = READS.do(key, lambda: run_command(cmd))
+    if not success:
+        # Let the next caller retry instead of reusing the failure
+        READS.forget(key)
+    return success, output
+
+
+def cached_graphql(query: str, variables: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
+    """Run a read-only GraphQL query, keyed by query text and variables"""
+    return cached_command(graphql_command(query, variables))
+
+
+def graphql(query: str, variables: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
+    """Run a GraphQL mutation (or any uncached query)"""
+    return run_command(graphql_command(query, variables))
+
+
+def invalidate(cmd: Optional[List[str]] = None) -> None:
+    """Forget a cached read (or all of them) after a mutation"""
+    READS.forget(read_key(cmd) if cmd is not None else None)
+
+
+def parse_json(output: str) -> Optional[Any]:
+    """Parse command output as JSON, returning None on failure"""
+    try:
+        return json.loads(output)
+    except json.JSONDecodeError:
+        return None
+
+
+class GraphQLError(Exception):
+    """Raised when the GraphQL API returns errors or an unusable response"""
+
+    def __init__(self, message: str, errors: Optional[List[Any]] = None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def get_token() -> str:
+    """Get a GitHub token from the environment or the gh CLI"""
+    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+    if token:
+        return token
+    success, output = run_command(["gh", "auth", "token"])
+    if not success or not output.strip():
+        raise GraphQLError(f"Could not get a GitHub token: {output}")
+    return output.strip()
+
+
+class GraphQLSession:
+    """GraphQL client that reuses one keep-alive HTTPS connection"""
+
+    HOST = "api.github.com"
+
+    def __init__(self, token: Optional[str] = None, timeout: float = 30.0,
+                 budget=None):
+        self.token = token or get_token()
+        self.timeout = timeout
+        # Optional RateBudget shared with other processes using this token
+        self.budget = budget
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        # http.client connections are not thread-safe
+        self._lock = threading.Lock()
+
+    def _connection(self) -> http.client.HTTPSConnection:
+        if self._conn is None:
+            self._conn = http.client.HTTPSConnection(
+                self.HOST, timeout=self.timeout
+            )
+        return self._conn
+
+    def _post(self, body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        headers = {
+            "Authorization": f"bearer {self.token}",
+            "Content-Type": "application/json",
+            "User-Agent": "ai-assistant-project-scripts",
+            "Connection": "keep-alive",
+        }
+        # Retry once on a connection the server closed while idle
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request("POST", "/graphql", body=body, headers=headers)
+                response = conn.getresponse()
+                return response.status, response.read(), dict(response.getheaders())
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+        raise GraphQLError("unreachable")
+
+    def query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a query or mutation and return its `data` object"""
+        body = json.dumps({"query": query, "variables": variables or {}})
+        if self.budget is not None:
+            self.budget.acquire()
+        with self._lock:
+            status, payload, headers = self._post(body.encode("utf-8"))
+
+        headers = {k.lower(): v for k, v in headers.items()}
+        if self.budget is not None and headers.get("x-ratelimit-remaining") == "0":
+            self.budget.drain_until(float(headers.get("x-ratelimit-reset", 0)))
+
+        try:
+            result = json.loads(payload)
+        except json.JSONDecodeError:
+            raise GraphQLError(f"HTTP {status}: {payload[:200]!r}")
+        if status != 200 or result.get("errors"):
+            errors = result.get("errors", [])
+            message = "; ".join(e.get("message", str(e)) for e in errors)
+            raise GraphQLError(message or f"HTTP {status}", errors)
+        return result.get("data") or {}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
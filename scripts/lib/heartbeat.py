@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+
+"""
+Heartbeat deadline tracker
+
+Replaces `check_stale_agents()` of the Agent Registry design, which maps over
+every agent to find those not seen for 5 minutes. Each heartbeat pushes the
+agent's new deadline onto a min-heap; `expire()` pops only the deadlines that
+have passed, skipping entries superseded by a later heartbeat, so a check
+costs O(expired log n) and can run every second. Superseded entries are
+dropped in bulk when they outnumber the tracked agents.
+
+Status changes (an agent going stale, and a stale agent beating again) are
+passed to listeners and kept in a bounded, sequence-numbered event buffer.
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_TIMEOUT = 300
+STALE = "unavailable"
+RECOVERED = "available"
+
+Listener = Callable[[Dict[str, Any]], None]
+
+
+class HeartbeatTracker:
+    """Min-heap of per-agent heartbeat deadlines"""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT,
+                 clock: Callable[[], float] = time.time, max_events: int = 10_000):
+        self.timeout = timeout
+        self.clock = clock
+        self.last_seen: Dict[str, float] = {}
+        self.stale: Dict[str, float] = {}
+        # (deadline, name); an entry is live only if it matches last_seen
+        self._heap: List[Tuple[float, str]] = []
+        self._listeners: List[Listener] = []
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=max_events)
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener: Listener) -> None:
+        self._listeners.append(listener)
+
+    def _emit(self, name: str, status: str, at: float) -> Dict[str, Any]:
+        self._sequence += 1
+        event = {"seq": self._sequence, "agent": name, "status": status, "at": at}
+        self._events.append(event)
+        return event
+
+    def _notify(self, events: List[Dict[str, Any]]) -> None:
+        # Listeners run outside the lock so they may call back into the tracker
+        for event in events:
+            for listener in self._listeners:
+                listener(event)
+
+    def beat(self, name: str, at: Optional[float] = None) -> None:
+        """Record a heartbeat; a stale agent is reported as recovered"""
+        at = self.clock() if at is None else at
+        events = []
+        with self._lock:
+            if at < self.last_seen.get(name, float("-inf")):
+                return
+            self.last_seen[name] = at
+            heapq.heappush(self._heap, (at + self.timeout, name))
+            if self.stale.pop(name, None) is not None:
+                events.append(self._emit(name, RECOVERED, at))
+            if len(self._heap) > 2 * len(self.last_seen) + 64:
+                self._heap = [(deadline, agent) for deadline, agent in self._heap
+                              if deadline == self.last_seen.get(agent, float("nan")) + self.timeout]
+                heapq.heapify(self._heap)
+        self._notify(events)
+
+    track = beat
+
+    def restore(self, name: str, last_seen: float) -> None:
+        """Track an agent that had already gone stale; its next heartbeat recovers it"""
+        with self._lock:
+            self.last_seen[name] = last_seen
+            self.stale[name] = last_seen + self.timeout
+
+    def seen(self) -> Dict[str, float]:
+        """Copy of the last heartbeat time per agent"""
+        with self._lock:
+            return dict(self.last_seen)
+
+    def forget(self, name: str) -> None:
+        """Stop tracking a deregistered agent"""
+        with self._lock:
+            self.last_seen.pop(name, None)
+            self.stale.pop(name, None)
+
+    def expire(self, now: Optional[float] = None) -> List[str]:
+        """Mark agents whose deadline passed as stale; returns their names"""
+        now = self.clock() if now is None else now
+        expired = []
+        events = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                deadline, name = heapq.heappop(self._heap)
+                seen = self.last_seen.get(name)
+                if seen is None or seen + self.timeout != deadline or name in self.stale:
+                    continue  # superseded by a later heartbeat, or forgotten
+                self.stale[name] = deadline
+                expired.append(name)
+                events.append(self._emit(name, STALE, now))
+        self._notify(events)
+        return expired
+
+    def events(self, after: int = 0) -> List[Dict[str, Any]]:
+        """Buffered status-change events with a sequence number above `after`"""
+        with self._lock:
+            return [event for event in self._events if event["seq"] > after]
+
+    def run(self, interval: float = 1.0, stop: Optional[threading.Event] = None) -> threading.Thread:
+        """Call expire() every `interval` seconds on a daemon thread"""
+        stop = stop or threading.Event()
+
+        def loop():
+            while not stop.wait(interval):
+                self.expire()
+
+        thread = threading.Thread(target=loop, name="heartbeat-expiry", daemon=True)
+        thread.start()
+        return thread
+
+    def __len__(self) -> int:
+        return len(self.last_seen)
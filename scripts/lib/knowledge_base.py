@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+"""
+Knowledge base engine
+
+Python implementation of the storage and vector search of the Knowledge Base
+component (docs/architecture/components/knowledge-base.md). Instead of one
+`.vec` file per item scanned by `find_nearest_vectors()`, item vectors live
+in a `VectorIndex` (memory-mapped float32 matrix with an IVF index), and the
+md5 placeholder of `get_embedding()` is replaced by a real embedding model.
+
+Layout under the knowledge directory:
+    items.jsonl   append-only log of item puts and deletes
+    vectors/      VectorIndex files
+
+`compact()` writes a compacted log and index next to these (`*.compact`),
+commits them by creating a `COMPACTED` marker and then swaps them in; a
+marker found on open means the swap is finished, and leftovers without one
+are discarded.
+"""
+
+import json
+import os
+import secrets
+import shutil
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from embeddings import Embedder, get_embedder
+from vector_index import VectorIndex
+
+
+class KnowledgeBase:
+    """Knowledge items with batched semantic search"""
+
+    def __init__(self, root: str, embed: Optional[Embedder] = None, nprobe: int = 8):
+        self.root = root
+        self.nprobe = nprobe
+        self._embed = embed
+        self._lock = threading.RLock()
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self._row_to_id: Dict[int, str] = {}
+        self.index: Optional[VectorIndex] = None
+        os.makedirs(root, exist_ok=True)
+        self._log_file = os.path.join(root, "items.jsonl")
+        self._vector_dir = os.path.join(root, "vectors")
+        self._marker_file = os.path.join(root, "COMPACTED")
+        self._finish_compaction()
+        self._load()
+
+    @property
+    def embed(self) -> Embedder:
+        if self._embed is None:
+            self._embed = get_embedder()
+        return self._embed
+
+    def _load(self) -> None:
+        if os.path.exists(self._log_file):
+            with open(self._log_file) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if record["op"] == "put":
+                        self.items[record["item"]["id"]] = record["item"]
+                    else:
+                        self.items.pop(record["id"], None)
+        self._row_to_id = {item["row"]: item_id for item_id, item in self.items.items()}
+        dim_file = os.path.join(self._vector_dir, "vectors.json")
+        if os.path.exists(dim_file):
+            with open(dim_file) as f:
+                self._open_index(json.load(f)["dim"])
+        self._recover()
+
+    def _recover(self) -> None:
+        """Reconcile the item log with the index after a crash between their writes"""
+        count = self.index.count if self.index is not None else 0
+        # Items logged without a saved vector cannot be searched; drop them
+        for item_id in [item_id for item_id, item in self.items.items() if item["row"] >= count]:
+            self._row_to_id.pop(self.items.pop(item_id)["row"], None)
+        if self.index is not None:
+            # Rows saved but never logged, or replaced before their tombstone was saved
+            orphans = set(range(count)) - self.index.deleted - set(self._row_to_id)
+            if orphans:
+                self.index.delete(sorted(orphans))
+
+    def _open_index(self, dim: int) -> VectorIndex:
+        if self.index is None:
+            self.index = VectorIndex(self._vector_dir, dim, self.nprobe)
+        return self.index
+
+    def _append(self, records: Iterable[Dict[str, Any]]) -> None:
+        with open(self._log_file, "a") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # Items
+
+    def add_items(self, items: List[Dict[str, Any]]) -> List[str]:
+        """Add items ({title, content, category, tags, source}) in one batch"""
+        if not items:
+            return []
+        vectors = np.asarray(
+            self.embed([f"{item['title']} {item['content']}" for item in items]),
+            dtype=np.float32,
+        )
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        with self._lock:
+            rows = self._open_index(vectors.shape[1]).add(vectors)
+            # Vectors are saved before the log refers to their rows
+            self.index.save()
+            records = []
+            replaced = []
+            for item, row in zip(items, rows):
+                stored = {
+                    "id": item.get("id") or f"kb_{int(time.time())}_{secrets.token_hex(4)}",
+                    "title": item["title"],
+                    "content": item["content"],
+                    "category": item.get("category", ""),
+                    "tags": list(item.get("tags", [])),
+                    "source": item.get("source", ""),
+                    "created_at": item.get("created_at", timestamp),
+                    "updated_at": timestamp,
+                    "row": row,
+                }
+                previous = self.items.get(stored["id"])
+                if previous is not None:
+                    stored["created_at"] = previous["created_at"]
+                    replaced.append(previous["row"])
+                    self._row_to_id.pop(previous["row"], None)
+                self.items[stored["id"]] = stored
+                self._row_to_id[row] = stored["id"]
+                records.append({"op": "put", "item": stored})
+            self._append(records)
+            # Saved with the next change; _recover() redoes it after a crash
+            self.index.delete(replaced)
+        return [record["item"]["id"] for record in records]
+
+    def add_item(self, title: str, content: str, category: str = "",
+                 tags: Optional[List[str]] = None, source: str = "") -> str:
+        return self.add_items([{"title": title, "content": content, "category": category,
+                                "tags": tags or [], "source": source}])[0]
+
+    def update_item(self, item_id: str, **changes) -> Dict[str, Any]:
+        """Replace fields of an item; content changes are re-embedded"""
+        with self._lock:
+            item = dict(self.items[item_id])
+        item.update(changes)
+        self.add_items([item])
+        return self.items[item_id]
+
+    def get_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        return self.items.get(item_id)
+
+    def delete_item(self, item_id: str) -> bool:
+        with self._lock:
+            item = self.items.pop(item_id, None)
+            if item is None:
+                return False
+            self.index.delete([item["row"]])
+            self._row_to_id.pop(item["row"], None)
+            self._append([{"op": "delete", "id": item_id}])
+            self.index.save()
+            return True
+
+    # Search
+
+    def search_batch(self, queries: List[str], k: int = 10,
+                     category: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """Top-k items per query, as item dicts with a `relevance` score"""
+        if self.index is None or not queries:
+            return [[] for _ in queries]
+        vectors = np.asarray(self.embed(queries), dtype=np.float32)
+        # Over-fetch when filtering so enough items survive the filter
+        fetch = k * 4 if category else k
+        with self._lock:
+            hits = self.index.search(vectors, fetch)
+            results = []
+            for query_hits in hits:
+                found = []
+                for row, score in query_hits:
+                    item = self.items.get(self._row_to_id.get(row, ""))
+                    if item is None or (category and item["category"] != category):
+                        continue
+                    found.append(dict(item, relevance=round(score, 4)))
+                    if len(found) == k:
+                        break
+                results.append(found)
+        return results
+
+    def search(self, query: str, k: int = 10,
+               category: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.search_batch([query], k, category)[0]
+
+    def compact(self) -> None:
+        """Rewrite the item log with only live items and the index without deleted rows"""
+        with self._lock:
+            self._finish_compaction()  # discards output of an earlier failed attempt
+            items = sorted(self.items.values(), key=lambda item: item["row"])
+            if self.index is not None:
+                self.index.copy_rows(f"{self._vector_dir}.compact",
+                                     [item["row"] for item in items])
+                items = [dict(item, row=row) for row, item in enumerate(items)]
+            with open(f"{self._log_file}.compact", "w") as f:
+                for item in items:
+                    f.write(json.dumps({"op": "put", "item": item}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self._marker_file, "w") as f:
+                os.fsync(f.fileno())
+
+            dim = self.index.dim if self.index is not None else None
+            self.index = None
+            self._finish_compaction()
+            self.items = {item["id"]: item for item in items}
+            self._row_to_id = {item["row"]: item["id"] for item in items}
+            if dim is not None:
+                self._open_index(dim)
+
+    def _finish_compaction(self) -> None:
+        """Swap in committed compaction output, or discard output that was never committed"""
+        vectors, log = f"{self._vector_dir}.compact", f"{self._log_file}.compact"
+        if not os.path.exists(self._marker_file):
+            shutil.rmtree(vectors, ignore_errors=True)
+            if os.path.exists(log):
+                os.unlink(log)
+            return
+        # Each step is skipped once done, so an interrupted swap resumes here
+        if os.path.exists(vectors):
+            shutil.rmtree(self._vector_dir, ignore_errors=True)
+            os.rename(vectors, self._vector_dir)
+        if os.path.exists(log):
+            os.replace(log, self._log_file)
+        os.unlink(self._marker_file)
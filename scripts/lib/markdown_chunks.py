@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+"""
+Heading-aware markdown chunking
+
+Splits a markdown file into chunks that follow its heading structure. Each
+heading starts a section; sections longer than `max_chars` are split at
+paragraph boundaries (fenced code blocks are kept whole where they fit).
+Every chunk is prefixed with its heading breadcrumb so it embeds with its
+context.
+
+Chunk IDs are derived from the file path, the heading path and the chunk's
+position within its section, so editing one section leaves the IDs (and
+content hashes) of every other section unchanged.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, List, Tuple
+
+HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "section"
+
+
+def split_sections(text: str) -> List[Tuple[List[str], str]]:
+    """(heading path, body) for each section, in document order"""
+    sections: List[Tuple[List[str], str]] = []
+    path: List[Tuple[int, str]] = []
+    lines: List[str] = []
+    in_fence = False
+
+    def flush():
+        body = "\n".join(lines).strip()
+        if body:
+            sections.append(([title for _, title in path], body))
+
+    for line in text.splitlines():
+        if FENCE.match(line):
+            in_fence = not in_fence
+        match = None if in_fence else HEADING.match(line)
+        if match:
+            flush()
+            lines = [line]
+            level = len(match.group(1))
+            while path and path[-1][0] >= level:
+                path.pop()
+            path.append((level, match.group(2)))
+        else:
+            lines.append(line)
+    flush()
+    return sections
+
+
+def split_paragraphs(body: str) -> List[str]:
+    """Blank-line separated blocks, never splitting inside a code fence"""
+    blocks: List[str] = []
+    current: List[str] = []
+    in_fence = False
+    for line in body.splitlines():
+        if FENCE.match(line):
+            in_fence = not in_fence
+        if not line.strip() and not in_fence:
+            if current:
+                blocks.append("\n".join(current))
+                current = []
+            continue
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def pack(blocks: List[str], max_chars: int) -> List[str]:
+    """Greedily pack blocks into pieces of at most max_chars"""
+    pieces: List[str] = []
+    current = ""
+    for block in blocks:
+        # Oversized blocks are hard-split; nothing better preserves meaning
+        while len(block) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(block[:max_chars])
+            block = block[max_chars:]
+        if current and len(current) + 2 + len(block) > max_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current}\n\n{block}" if current else block
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def chunk_markdown(text: str, path: str, max_chars: int = 2000) -> List[Dict[str, Any]]:
+    """Chunks of a markdown file as ingestion documents with stable IDs"""
+    chunks = []
+    seen: Dict[str, int] = {}
+    for headings, body in split_sections(text):
+        anchor = "/".join(slugify(h) for h in headings) or "preamble"
+        # Repeated heading paths (e.g. two "Example" sections) get a suffix
+        occurrence = seen.get(anchor, 0)
+        seen[anchor] = occurrence + 1
+        if occurrence:
+            anchor = f"{anchor}~{occurrence}"
+        breadcrumb = " > ".join([path] + headings)
+        for position, piece in enumerate(pack(split_paragraphs(body), max_chars)):
+            document = f"{breadcrumb}\n\n{piece}"
+            chunks.append({
+                "id": f"{path}#{anchor}:{position}",
+                "document": document,
+                "metadata": {
+                    "source": "markdown",
+                    "path": path,
+                    "heading": " > ".join(headings),
+                    "chunk": position,
+                    "hash": content_hash(document),
+                },
+            })
+    return chunks
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+"""
+Pooled MCP client sessions
+
+Opening an MCP session costs a connection, an `initialize` handshake and
+usually a `list_tools` call before the first real request. `MCPSessionPool`
+pays that once per pooled session: sessions stay initialized, the tool list
+is fetched once and cached, and tool calls are spread over the sessions and
+pipelined (an MCP session multiplexes concurrent requests by ID), so a call
+costs a single round trip.
+
+Each session lives in its own task because the streamable HTTP transport
+must be entered and exited from the same task. A session whose transport
+fails is replaced in the background. `MCPClient` is a synchronous facade for
+scripts, in the style of `chroma_client.ChromaClient`.
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+DEFAULT_URL = "http://localhost:8080/mcp"
+
+
+class _Slot:
+    """One long-lived session and the task that owns its transport"""
+
+    def __init__(self):
+        self.session: Optional[ClientSession] = None
+        self.ready = asyncio.Event()
+        self.closing = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.in_flight = 0
+        self.error: Optional[BaseException] = None
+
+
+class MCPSessionPool:
+    """A fixed number of initialized MCP sessions shared by concurrent callers"""
+
+    def __init__(self, url: str = DEFAULT_URL, size: int = 4, connect_timeout: float = 30.0,
+                 reconnect_delay: float = 1.0):
+        self.url = url
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self.reconnect_delay = reconnect_delay
+        self._slots: List[_Slot] = []
+        self._tools: Optional[List[Any]] = None
+        self._closed = False
+        self.stats = {"calls": 0, "retries": 0, "reconnects": 0}
+
+    async def _hold(self, slot: _Slot, delay: float) -> None:
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            async with streamablehttp_client(self.url) as (read_stream, write_stream, _):
+                async with ClientSession(read_stream, write_stream) as session:
+                    await session.initialize()
+                    if self._tools is None:
+                        self._tools = (await session.list_tools()).tools
+                    slot.session = session
+                    slot.ready.set()
+                    await slot.closing.wait()
+        except Exception as e:
+            slot.error = e
+        finally:
+            slot.session = None
+            slot.ready.set()
+            if not self._closed and not slot.closing.is_set():
+                self._replace(slot)
+
+    def _start(self, delay: float = 0.0) -> _Slot:
+        slot = _Slot()
+        slot.task = asyncio.create_task(self._hold(slot, delay))
+        return slot
+
+    def _replace(self, slot: _Slot) -> None:
+        if slot in self._slots:
+            self.stats["reconnects"] += 1
+            # Back off so an unreachable server is not hammered with reconnects
+            self._slots[self._slots.index(slot)] = self._start(self.reconnect_delay)
+
+    async def start(self) -> "MCPSessionPool":
+        """Open and initialize all sessions"""
+        self._slots = [self._start() for _ in range(self.size)]
+        await asyncio.wait_for(
+            asyncio.gather(*(slot.ready.wait() for slot in self._slots)), self.connect_timeout
+        )
+        if not any(slot.session for slot in self._slots):
+            errors = {str(slot.error) for slot in self._slots if slot.error}
+            await self.close()
+            raise ConnectionError(f"Could not open MCP sessions to {self.url}: {', '.join(errors)}")
+        return self
+
+    async def _acquire(self) -> _Slot:
+        for _ in range(2):
+            live = [slot for slot in self._slots if slot.session is not None]
+            if live:
+                return min(live, key=lambda slot: slot.in_flight)
+            # Every session is reconnecting; wait for the first to come back
+            waiters = [asyncio.ensure_future(slot.ready.wait()) for slot in self._slots]
+            _, pending = await asyncio.wait(waiters, timeout=self.connect_timeout,
+                                            return_when=asyncio.FIRST_COMPLETED)
+            for waiter in pending:
+                waiter.cancel()
+        raise ConnectionError(f"No MCP session available for {self.url}")
+
+    async def tools(self) -> List[Any]:
+        """Tool definitions, fetched once when the first session initialized"""
+        return list(self._tools or [])
+
+    async def tool_names(self) -> List[str]:
+        return [tool.name for tool in await self.tools()]
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a tool on the least busy session, retrying once if that session died"""
+        self.stats["calls"] += 1
+        for attempt in range(2):
+            slot = await self._acquire()
+            slot.in_flight += 1
+            try:
+                return await slot.session.call_tool(name, arguments or {})
+            except Exception:
+                if attempt or slot.session is not None:
+                    raise
+                self.stats["retries"] += 1
+            finally:
+                slot.in_flight -= 1
+
+    async def call_many(self, calls: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Any]:
+        """Pipeline many tool calls concurrently; results are in call order"""
+        return await asyncio.gather(*(self.call_tool(name, arguments) for name, arguments in calls))
+
+    async def close(self) -> None:
+        self._closed = True
+        for slot in self._slots:
+            slot.closing.set()
+        await asyncio.gather(*(slot.task for slot in self._slots if slot.task),
+                             return_exceptions=True)
+        self._slots = []
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+class MCPClient:
+    """Synchronous facade over MCPSessionPool, safe to share between threads"""
+
+    def __init__(self, url: str = DEFAULT_URL, size: int = 4, connect_timeout: float = 30.0):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="mcp-client", daemon=True)
+        self._thread.start()
+        self.pool = MCPSessionPool(url, size, connect_timeout)
+        try:
+            self._run(self.pool.start())
+        except BaseException:
+            self._stop()
+            raise
+
+    def _run(self, coroutine) -> Any:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def tool_names(self) -> List[str]:
+        return self._run(self.pool.tool_names())
+
+    def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        return self._run(self.pool.call_tool(name, arguments))
+
+    def call_many(self, calls: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Any]:
+        return self._run(self.pool.call_many(list(calls)))
+
+    def _stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._run(self.pool.close())
+        self._stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+
+"""
+Asyncio message broker for the communication hub
+
+Replaces the per-message `route_message()` of
+docs/architecture/components/communication-hub.md, which looks up the
+recipient's endpoint and `curl`s every message separately. Agents instead
+keep one connection open to the hub and receive their messages on it.
+
+Each agent has a mailbox with four priority lanes:
+
+    critical > high > normal > bulk
+
+A delivery task per connected agent drains the lanes in priority order and
+writes everything that is queued as one batch line, so small messages share
+writes and a critical message never waits behind queued bulk ones. Messages
+for agents that are not connected wait in their mailbox.
+
+Mailboxes shed load by lane: bulk messages are refused once a mailbox is half
+full and normal ones at 80%. Critical and high messages evict the oldest
+lower-priority message when the mailbox is full, and are refused only when
+nothing can be evicted. A refused message raises `Overloaded`. A mailbox is
+dropped once it is empty and its agent is disconnected.
+
+The wire protocol is the line-delimited JSON of `rpc.py`. A connection
+becomes an agent's delivery channel after `{"method": "connect", "params":
+{"agent": NAME}}`, and then also receives `{"messages": [...]}` lines between
+responses.
+
+With a `store` (`message_log.MessageLog`), every accepted message is appended
+to it before it is queued, so a message that could not be stored is never
+delivered, and `retrieve` reads it back by ID.
+
+Accepted, delivered and shed messages are counted, and the time from
+acceptance to delivery is recorded, per route (sender->recipient) and message
+type in a `metrics.Metrics`; the `metrics` method returns a snapshot.
+"""
+
+import asyncio
+import json
+import secrets
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from metrics import Labels, Metrics
+from rpc import RPCError
+
+PRIORITIES = ("critical", "high", "normal", "bulk")
+# Fraction of a mailbox's capacity above which a lane's messages are shed
+SHED_AT = {"critical": 1.0, "high": 1.0, "normal": 0.8, "bulk": 0.5}
+# Type prefixes routed ahead of the default lane
+TYPE_PRIORITIES = {"control.": "critical", "error.": "high", "event.": "bulk"}
+
+Queued = Tuple[bytes, float, Labels]  # encoded message, time accepted, metric labels
+
+
+class Overloaded(Exception):
+    """Raised when a message is shed because the recipient's mailbox is full"""
+
+
+def generate_message_id() -> str:
+    return f"msg_{int(time.time())}_{secrets.token_hex(8)}"
+
+
+def timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+def message_priority(message: Dict[str, Any]) -> str:
+    """The content's priority if it names a lane, else one implied by the type"""
+    content = message.get("content")
+    if isinstance(content, dict) and content.get("priority") in PRIORITIES:
+        return content["priority"]
+    for prefix, priority in TYPE_PRIORITIES.items():
+        if str(message.get("type", "")).startswith(prefix):
+            return priority
+    return "normal"
+
+
+class Mailbox:
+    """Priority lanes of queued messages for one agent"""
+
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        self.lanes: Dict[str, Deque[Queued]] = {priority: deque() for priority in PRIORITIES}
+        self.depth = 0
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def _lower(self, priority: str) -> List[str]:
+        """Non-empty lanes below a priority"""
+        return [lane for lane in PRIORITIES[PRIORITIES.index(priority) + 1:] if self.lanes[lane]]
+
+    def admit(self, priority: str) -> None:
+        """Raise Overloaded if put() would refuse a message in this lane"""
+        if self.depth >= self.capacity * SHED_AT[priority] and (
+                SHED_AT[priority] < 1.0 or not self._lower(priority)):
+            raise Overloaded(f"Mailbox for {self.name} is full ({self.depth} queued), "
+                             f"{priority} message refused")
+
+    def put(self, priority: str, entry: Queued) -> Optional[Tuple[str, Queued]]:
+        """Queue a message; returns the lane and entry of an evicted message, if any"""
+        evicted = None
+        self.admit(priority)
+        if self.depth >= self.capacity * SHED_AT[priority]:
+            lower = self._lower(priority)
+            evicted = (lower[-1], self.lanes[lower[-1]].popleft())
+            self.depth -= 1
+        self.lanes[priority].append(entry)
+        self.depth += 1
+        self.ready.set()
+        return evicted
+
+    def take(self, max_messages: int, max_bytes: int) -> List[Tuple[str, Queued]]:
+        """Up to max_messages messages (at least one) in priority order"""
+        batch: List[Tuple[str, Queued]] = []
+        size = 0
+        for priority in PRIORITIES:
+            lane = self.lanes[priority]
+            while lane and len(batch) < max_messages:
+                if batch and size + len(lane[0][0]) > max_bytes:
+                    break
+                entry = lane.popleft()
+                batch.append((priority, entry))
+                size += len(entry[0])
+        self.depth -= len(batch)
+        if not self.depth:
+            self.ready.clear()
+        return batch
+
+    def requeue(self, batch: List[Tuple[str, Queued]]) -> None:
+        """Put an undelivered batch back at the front of its lanes"""
+        for priority, entry in reversed(batch):
+            self.lanes[priority].appendleft(entry)
+        self.depth += len(batch)
+        if self.depth:
+            self.ready.set()
+
+    def urgent(self) -> bool:
+        return bool(self.lanes["critical"] or self.lanes["high"])
+
+
+class MessageHub:
+    """Routes messages to persistently connected agents through priority mailboxes"""
+
+    def __init__(self, capacity: int = 1000, batch_size: int = 64,
+                 batch_bytes: int = 64 << 10, linger: float = 0.002, store=None,
+                 metrics: Optional[Metrics] = None):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.linger = linger
+        self.store = store
+        self.metrics = metrics if metrics is not None else Metrics("hub")
+        self.mailboxes: Dict[str, Mailbox] = {}
+        self.counts = {"accepted": 0, "delivered": 0, "batches": 0,
+                       "shed": {priority: 0 for priority in PRIORITIES}}
+
+    def mailbox(self, name: str) -> Mailbox:
+        if name not in self.mailboxes:
+            self.mailboxes[name] = Mailbox(name, self.capacity)
+        return self.mailboxes[name]
+
+    # Routing
+
+    def send(self, sender: str, recipient: str, type: str, content: Any = None,
+             priority: Optional[str] = None, correlation_id: Optional[str] = None,
+             reply_to: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a message for its recipient; raises Overloaded if it is shed"""
+        if priority is not None and priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority} (expected one of {', '.join(PRIORITIES)})")
+        message = {
+            "message_id": generate_message_id(),
+            "sender": sender,
+            "recipient": recipient,
+            "type": type,
+            "timestamp": timestamp(),
+        }
+        if correlation_id is not None:
+            message["correlation_id"] = correlation_id
+        if reply_to is not None:
+            message["reply_to"] = reply_to
+        message["content"] = content
+        lane = priority or message_priority(message)
+        frame = json.dumps(message, separators=(",", ":"), default=str).encode()
+        labels = (("route", f"{sender}->{recipient}"), ("type", type))
+        if recipient in self.mailboxes:
+            try:
+                self.mailboxes[recipient].admit(lane)
+            except Overloaded:
+                self._shed(lane, labels)
+                raise
+        if self.store is not None:
+            self.store.append(message["message_id"], frame)
+        mailbox = self.mailbox(recipient)
+        evicted = mailbox.put(lane, (frame, time.monotonic(), labels))
+        if evicted:
+            self._shed(evicted[0], evicted[1][2])
+        self.counts["accepted"] += 1
+        self.metrics.count("messages_accepted", labels)
+        return {"message_id": message["message_id"], "status": "queued", "priority": lane,
+                "connected": mailbox.writer is not None}
+
+    def _prune(self, mailbox: Mailbox) -> None:
+        """Drop an empty mailbox of a disconnected agent"""
+        if mailbox.writer is None and not mailbox.depth and self.mailboxes.get(mailbox.name) is mailbox:
+            del self.mailboxes[mailbox.name]
+
+    def _shed(self, lane: str, labels: Labels) -> None:
+        self.counts["shed"][lane] += 1
+        self.metrics.count("messages_shed", labels + (("lane", lane),))
+
+    def retrieve(self, message_id: str) -> Dict[str, Any]:
+        message = self.store.get(message_id) if self.store is not None else None
+        if message is None:
+            raise ValueError(f"Message not found: {message_id}")
+        return message
+
+    # Connections
+
+    def connect(self, name: str, writer: asyncio.StreamWriter) -> Mailbox:
+        """Make writer the delivery channel for an agent, replacing any previous one"""
+        mailbox = self.mailbox(name)
+        if mailbox.writer is not None and mailbox.writer is not writer:
+            mailbox.writer.close()
+        if mailbox.task is not None:
+            mailbox.task.cancel()
+        mailbox.writer = writer
+        mailbox.task = asyncio.create_task(self._deliver(mailbox, writer))
+        return mailbox
+
+    def disconnect(self, name: str, writer: asyncio.StreamWriter) -> None:
+        mailbox = self.mailboxes.get(name)
+        if mailbox is None or mailbox.writer is not writer:
+            return
+        mailbox.writer = None
+        if mailbox.task is not None:
+            mailbox.task.cancel()
+            mailbox.task = None
+
+    async def _deliver(self, mailbox: Mailbox, writer: asyncio.StreamWriter) -> None:
+        try:
+            await self._deliver_batches(mailbox, writer)
+        finally:
+            # After an undelivered batch has been requeued
+            self._prune(mailbox)
+
+    async def _deliver_batches(self, mailbox: Mailbox, writer: asyncio.StreamWriter) -> None:
+        while True:
+            await mailbox.ready.wait()
+            # A short linger lets small routine messages share a write
+            if self.linger and not mailbox.urgent() and mailbox.depth < self.batch_size:
+                await asyncio.sleep(self.linger)
+            batch = mailbox.take(self.batch_size, self.batch_bytes)
+            if not batch:
+                continue
+            try:
+                writer.write(b'{"messages":[' + b",".join(entry[0] for _, entry in batch) + b"]}\n")
+                await writer.drain()
+            except (ConnectionError, asyncio.CancelledError):
+                # Written data may not have arrived; redeliver on the next connection
+                mailbox.requeue(batch)
+                raise
+            self.counts["delivered"] += len(batch)
+            self.counts["batches"] += 1
+            delivered = time.monotonic()
+            for _, (_, accepted, labels) in batch:
+                self.metrics.count("messages_delivered", labels)
+                self.metrics.observe("delivery_latency", labels, int((delivered - accepted) * 1e6))
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection (`asyncio.start_unix_server` callback)"""
+        agent = None
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    params = request.get("params", {})
+                    method = request.get("method")
+                    if method == "connect":
+                        if agent is not None:
+                            self.disconnect(agent, writer)
+                        agent = params["agent"]
+                        self.connect(agent, writer)
+                        result = {"agent": agent, "queued": self.mailboxes[agent].depth}
+                    elif method == "send":
+                        result = self.send(**params)
+                    elif method == "retrieve":
+                        result = self.retrieve(**params)
+                    elif method == "metrics":
+                        result = self.metrics.snapshot(by=("route", "type"))
+                    elif method == "stats":
+                        result = self.stats()
+                    else:
+                        raise RPCError(f"Unknown method: {method}")
+                    response = {"result": result}
+                except Exception as e:
+                    response = {"error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response, default=str).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if agent is not None:
+                self.disconnect(agent, writer)
+            writer.close()
+
+    def close(self) -> None:
+        """Close every agent connection; queued messages stay in their mailboxes"""
+        for mailbox in self.mailboxes.values():
+            if mailbox.writer is not None:
+                writer = mailbox.writer
+                self.disconnect(mailbox.name, writer)
+                writer.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            **({"store": self.store.stats()} if self.store is not None else {}),
+            "connected": sorted(name for name, mailbox in self.mailboxes.items() if mailbox.writer),
+            "queued": {name: {lane: len(frames) for lane, frames in mailbox.lanes.items() if frames}
+                       for name, mailbox in self.mailboxes.items() if mailbox.depth},
+        }
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+
+"""
+Segmented append-only message log
+
+Replaces the one-file-per-message `store_message()` of
+docs/architecture/components/communication-hub.md. Messages are appended
+to the active segment file with the length + CRC32 framing of `wal.py`. When
+the segment reaches `segment_bytes`, it is sealed and a new one is started.
+Segments are named by the sequence number of their first record:
+
+    00000000000000000000.log   sealed
+    00000000000000000000.idx   message ID -> position, written when sealed
+    00000000000000041877.log   active
+
+An in-memory index maps each message ID to (segment, position, length), so
+`get()` is one positioned read. On open, the index is loaded from the `.idx`
+files of sealed segments, and only the active segment is scanned.
+
+`delete()` appends a tombstone. `maintain()` drops whole segments whose newest
+record is older than the retention period, and compacts a sealed segment once
+most of its records have been deleted.
+"""
+
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from wal import HEADER
+
+Location = Tuple[int, int, int]  # segment base, record position, record length
+
+
+def segment_name(base: int, suffix: str = ".log") -> str:
+    return f"{base:020d}{suffix}"
+
+
+def frame(payload: bytes) -> bytes:
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def scan(path: str) -> Iterator[Tuple[int, int, bytes]]:
+    """(position, length, payload) of each intact record in a segment"""
+    with open(path, "rb") as f:
+        data = f.read()
+    offset = 0
+    while offset + HEADER.size <= len(data):
+        length, crc = HEADER.unpack_from(data, offset)
+        payload = data[offset + HEADER.size:offset + HEADER.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        yield offset, HEADER.size + length, payload
+        offset += HEADER.size + length
+
+
+class Segment:
+    def __init__(self, root: str, base: int):
+        self.base = base
+        self.path = os.path.join(root, segment_name(base))
+        self.index_path = os.path.join(root, segment_name(base, ".idx"))
+        self.records = 0
+        self.live = 0
+        self.size = 0
+        self._fd: Optional[int] = None
+
+    def read(self, position: int, length: int) -> bytes:
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDONLY)
+        return os.pread(self._fd, length, position)
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def newest(self) -> float:
+        return os.path.getmtime(self.path)
+
+
+class MessageLog:
+    """Message store of rolling segment files with an in-memory ID index"""
+
+    def __init__(self, root: str, segment_bytes: int = 64 << 20,
+                 retention: float = 7 * 86400, compact_below: float = 0.5,
+                 fsync: bool = False, clock: Callable[[], float] = time.time):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        self.retention = retention
+        self.compact_below = compact_below
+        self.fsync = fsync
+        self.clock = clock
+        self.index: Dict[str, Location] = {}
+        # Deleted ID -> (segment holding the record, tombstone location); the
+        # tombstone must be kept until the record's segment is dropped or compacted
+        self._deleted: Dict[str, Tuple[int, Location]] = {}
+        self._segments: List[Segment] = []
+        self._active = None
+        self._next = 0
+        self._lock = threading.RLock()
+        os.makedirs(root, exist_ok=True)
+        self._load()
+
+    # Loading
+
+    def _load(self) -> None:
+        bases = sorted(int(name[:-4]) for name in os.listdir(self.root)
+                       if name.endswith(".log") and name[:-4].isdigit())
+        for position, base in enumerate(bases):
+            segment = Segment(self.root, base)
+            self._segments.append(segment)
+            sealed = position < len(bases) - 1
+            if sealed and os.path.exists(segment.index_path):
+                self._load_index(segment)
+            else:
+                self._scan(segment, truncate=not sealed)
+                if sealed:
+                    self._write_index(segment)
+        if self._segments:
+            self._active = open(self._segments[-1].path, "ab")
+        else:
+            self._roll()
+
+    def _load_index(self, segment: Segment) -> None:
+        with open(segment.index_path) as f:
+            header = json.loads(f.readline())
+            for line in f:
+                message_id, position, length, deleted = json.loads(line)
+                self._record(segment, message_id, position, length, deleted)
+        segment.records = header["records"]
+        segment.size = header["size"]
+
+    def _scan(self, segment: Segment, truncate: bool) -> None:
+        end = 0
+        for position, length, payload in scan(segment.path):
+            record = json.loads(payload)
+            self._record(segment, record["message_id"], position, length,
+                         deleted=record.get("deleted", False))
+            end = position + length
+        if truncate and os.path.getsize(segment.path) != end:
+            # Drop a torn tail so new records follow the last intact one
+            os.truncate(segment.path, end)
+        segment.size = end
+        self._next = segment.base + segment.records
+
+    def _record(self, segment: Segment, message_id: str, position: int, length: int,
+                deleted: bool = False) -> None:
+        """Apply one record to the index"""
+        segment.records += 1
+        previous = self.index.pop(message_id, None)
+        if previous is not None:
+            self._segment(previous[0]).live -= 1
+        if deleted:
+            if previous is not None:
+                self._deleted[message_id] = (previous[0], (segment.base, position, length))
+            return
+        self.index[message_id] = (segment.base, position, length)
+        segment.live += 1
+
+    def _segment(self, base: int) -> Segment:
+        for segment in reversed(self._segments):
+            if segment.base == base:
+                return segment
+        raise KeyError(base)
+
+    def _write_index(self, segment: Segment) -> None:
+        """Persist the locations of a sealed segment's live records and needed tombstones"""
+        entries = [(position, length, message_id, False)
+                   for message_id, (base, position, length) in self.index.items()
+                   if base == segment.base]
+        entries += [(position, length, message_id, True)
+                    for message_id, (_, (base, position, length)) in self._deleted.items()
+                    if base == segment.base]
+        tmp = segment.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(json.dumps({"records": segment.records, "size": segment.size}) + "\n")
+            for position, length, message_id, deleted in sorted(entries):
+                f.write(json.dumps([message_id, position, length, deleted]) + "\n")
+        os.replace(tmp, segment.index_path)
+
+    # Writing
+
+    def _roll(self) -> None:
+        """Seal the active segment and start a new one"""
+        if self._active is not None:
+            self._active.close()
+            self._write_index(self._segments[-1])
+        segment = Segment(self.root, self._next)
+        self._segments.append(segment)
+        self._active = open(segment.path, "ab")
+
+    def _append(self, message_id: str, payload: bytes, deleted: bool = False) -> None:
+        data = frame(payload)
+        segment = self._segments[-1]
+        if segment.size and segment.size + len(data) > self.segment_bytes:
+            self._roll()
+            segment = self._segments[-1]
+        self._active.write(data)
+        self._active.flush()
+        if self.fsync:
+            os.fsync(self._active.fileno())
+        self._record(segment, message_id, segment.size, len(data), deleted)
+        segment.size += len(data)
+        self._next += 1
+
+    def append(self, message_id: str, payload: bytes) -> None:
+        """Append an encoded message (JSON object bytes with this message_id)"""
+        with self._lock:
+            self._append(message_id, payload)
+
+    def put(self, message: Dict[str, Any]) -> str:
+        self.append(message["message_id"], json.dumps(message, separators=(",", ":")).encode())
+        return message["message_id"]
+
+    def delete(self, message_id: str) -> bool:
+        with self._lock:
+            if message_id not in self.index:
+                return False
+            self._append(message_id, json.dumps({"message_id": message_id, "deleted": True}).encode(),
+                         deleted=True)
+            return True
+
+    # Reading
+
+    def get_raw(self, message_id: str) -> Optional[bytes]:
+        with self._lock:
+            location = self.index.get(message_id)
+            if location is None:
+                return None
+            base, position, length = location
+            data = self._segment(base).read(position, length)
+        if len(data) < length:
+            raise IOError(f"Short read for {message_id} in {segment_name(base)}: "
+                          f"{len(data)} of {length} bytes")
+        payload = data[HEADER.size:]
+        if zlib.crc32(payload) != HEADER.unpack_from(data)[1]:
+            raise IOError(f"Corrupt record for {message_id} in {segment_name(base)}")
+        return payload
+
+    def get(self, message_id: str) -> Optional[Dict[str, Any]]:
+        payload = self.get_raw(message_id)
+        return None if payload is None else json.loads(payload)
+
+    def __contains__(self, message_id: str) -> bool:
+        return message_id in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def scan(self, since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Stored messages in append order, optionally from a timestamp (for audits)"""
+        with self._lock:
+            segments = list(self._segments)
+            self._active.flush()
+        for segment in segments:
+            if not os.path.exists(segment.path):
+                continue
+            for position, _, payload in scan(segment.path):
+                record = json.loads(payload)
+                if self.index.get(record["message_id"], (None, None))[:2] != (segment.base, position):
+                    continue
+                if since is None or record.get("timestamp", "") >= since:
+                    yield record
+
+    # Maintenance
+
+    def maintain(self) -> Dict[str, int]:
+        """Apply time retention, then compact mostly-deleted sealed segments"""
+        removed = compacted = 0
+        with self._lock:
+            cutoff = self.clock() - self.retention
+            while len(self._segments) > 1 and self._segments[0].newest() < cutoff:
+                self._drop(self._segments.pop(0))
+                removed += 1
+            for segment in self._segments[:-1]:
+                if segment.records and segment.live / segment.records < self.compact_below:
+                    self._compact(segment)
+                    compacted += 1
+                if not segment.records:
+                    self._segments.remove(segment)
+                    self._drop(segment)
+                    removed += 1
+        return {"segments_removed": removed, "segments_compacted": compacted}
+
+    def _drop(self, segment: Segment) -> None:
+        segment.close()
+        for message_id in [message_id for message_id, location in self.index.items()
+                           if location[0] == segment.base]:
+            del self.index[message_id]
+        self._forget_tombstones(segment.base)
+        for message_id in [message_id for message_id, (_, location) in self._deleted.items()
+                           if location[0] == segment.base]:
+            del self._deleted[message_id]
+        for path in (segment.path, segment.index_path):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def _forget_tombstones(self, base: int) -> None:
+        """Tombstones for records that were in this segment are no longer needed"""
+        for message_id in [message_id for message_id, (target, _) in self._deleted.items()
+                           if target == base]:
+            del self._deleted[message_id]
+
+    def _compact(self, segment: Segment) -> None:
+        """Rewrite a sealed segment with only its live records and needed tombstones"""
+        tmp = segment.path + ".compact"
+        locations = {}
+        size = 0
+        with open(tmp, "wb") as out:
+            for position, length, payload in scan(segment.path):
+                record = json.loads(payload)
+                message_id = record["message_id"]
+                if record.get("deleted"):
+                    # Keep a tombstone while an older segment still holds the record
+                    target, location = self._deleted.get(message_id, (None, None))
+                    if location != (segment.base, position, length) or target == segment.base:
+                        continue
+                elif self.index.get(message_id, (None, None))[:2] != (segment.base, position):
+                    continue
+                out.write(frame(payload))
+                locations[message_id] = (size, length, record.get("deleted", False))
+                size += length
+            out.flush()
+            os.fsync(out.fileno())
+        # Keep the segment's age for retention
+        stat = os.stat(segment.path)
+        os.utime(tmp, (stat.st_atime, stat.st_mtime))
+        segment.close()
+        # The old index no longer matches once the file is replaced; without one,
+        # a restart rescans the segment instead
+        if os.path.exists(segment.index_path):
+            os.unlink(segment.index_path)
+        os.replace(tmp, segment.path)
+        self._forget_tombstones(segment.base)
+        segment.records = len(locations)
+        segment.live = 0
+        segment.size = size
+        for message_id, (position, length, deleted) in locations.items():
+            if deleted:
+                self._deleted[message_id] = (self._deleted[message_id][0],
+                                             (segment.base, position, length))
+            else:
+                self.index[message_id] = (segment.base, position, length)
+                segment.live += 1
+        self._write_index(segment)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "messages": len(self.index),
+                "segments": len(self._segments),
+                "bytes": sum(segment.size for segment in self._segments),
+                "tombstones": len(self._deleted),
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._active.close()
+            for segment in self._segments:
+                segment.close()
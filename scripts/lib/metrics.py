@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+"""
+In-process counters and latency histograms
+
+Replaces metrics recomputed from logs (`monitor_hub_performance()` in
+docs/architecture/components/communication-hub.md greps the whole log for
+throughput and averages the last 100 lines for latency) with values kept as
+events happen.
+
+`Histogram` is HDR-style: values (integers, e.g. microseconds) fall into
+log-linear buckets with 2^(bits-1) sub-buckets per power of two, so recording
+is O(1) and any percentile is accurate to about 1 / 2^(bits-1) (0.8% by
+default) across the whole range. Buckets are kept sparsely, so a histogram
+costs memory only for the ranges it has seen.
+
+`Rate` keeps per-second counts over a sliding window for messages/sec.
+
+`Metrics` holds both, keyed by metric name and label values, and renders them
+as a JSON snapshot or in the Prometheus text format for scraping.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class Histogram:
+    """Log-linear bucketed histogram of non-negative integers"""
+
+    def __init__(self, bits: int = 8):
+        self.bits = bits
+        self.counts: Dict[int, int] = defaultdict(int)
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self.bits
+        if shift <= 0:
+            return value
+        half = 1 << (self.bits - 1)
+        return (1 << self.bits) + (shift - 1) * half + (value >> shift) - half
+
+    def _highest(self, index: int) -> int:
+        """Largest value that falls into a bucket"""
+        if index < 1 << self.bits:
+            return index
+        half = 1 << (self.bits - 1)
+        shift, offset = divmod(index - (1 << self.bits), half)
+        shift += 1
+        return ((half + offset + 1) << shift) - 1
+
+    def record(self, value: int, count: int = 1) -> None:
+        value = max(int(value), 0)
+        self.counts[self._index(value)] += count
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, quantile: float) -> int:
+        """Value at or below which `quantile` of the recorded values fall"""
+        if not self.count:
+            return 0
+        rank = max(1, round(quantile * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._highest(index), self.max)
+        return self.max
+
+    def merge(self, other: "Histogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        summary = {"count": self.count, "mean": round(self.total / self.count, 1) if self.count else 0,
+                   "min": self.min or 0, "max": self.max or 0}
+        for quantile in QUANTILES:
+            summary[f"p{quantile * 100:g}".replace(".", "")] = self.percentile(quantile)
+        return summary
+
+
+class Rate:
+    """Total count plus per-second counts over a sliding window"""
+
+    def __init__(self, window: int = 60, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.clock = clock
+        self.total = 0
+        self._slots = [0] * window
+        self._seconds = [0] * window
+        self._started = clock()
+
+    def add(self, count: int = 1) -> None:
+        second = int(self.clock())
+        slot = second % self.window
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._slots[slot] = 0
+        self._slots[slot] += count
+        self.total += count
+
+    def per_second(self) -> float:
+        now = self.clock()
+        second = int(now)
+        recent = sum(count for count, at in zip(self._slots, self._seconds)
+                     if second - self.window < at <= second)
+        return recent / max(min(self.window, now - self._started), 1)
+
+
+class Metrics:
+    """Named, labelled rates and histograms with JSON and Prometheus output"""
+
+    def __init__(self, namespace: str = "", window: int = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        self.namespace = namespace
+        self.window = window
+        self.clock = clock
+        self.rates: Dict[str, Dict[Labels, Rate]] = defaultdict(dict)
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def count(self, name: str, labels: Labels = (), value: int = 1) -> None:
+        with self._lock:
+            rate = self.rates[name].get(labels)
+            if rate is None:
+                rate = self.rates[name][labels] = Rate(self.window, self.clock)
+            rate.add(value)
+
+    def observe(self, name: str, labels: Labels, value: int) -> None:
+        with self._lock:
+            histogram = self.histograms[name].get(labels)
+            if histogram is None:
+                histogram = self.histograms[name][labels] = Histogram()
+            histogram.record(value)
+
+    def snapshot(self, by: Iterable[str] = ()) -> Dict[str, Any]:
+        """Totals, rates and percentiles overall, per label in `by`, and per label set"""
+        by = tuple(by)
+        with self._lock:
+            counters = {name: self._rollup(series, by, self._rate_summary)
+                        for name, series in self.rates.items()}
+            histograms = {name: self._rollup(series, by, self._histogram_summary)
+                          for name, series in self.histograms.items()}
+        return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "counters": counters, "histograms": histograms}
+
+    @staticmethod
+    def _rate_summary(rates: List[Rate]) -> Dict[str, Any]:
+        return {"total": sum(rate.total for rate in rates),
+                "per_second": round(sum(rate.per_second() for rate in rates), 3)}
+
+    @staticmethod
+    def _histogram_summary(histograms: List[Histogram]) -> Dict[str, Any]:
+        merged = Histogram()
+        for histogram in histograms:
+            merged.merge(histogram)
+        return merged.snapshot()
+
+    @staticmethod
+    def _rollup(series, by, summarize) -> Dict[str, Any]:
+        result = {"all": summarize(list(series.values()))}
+        for label in by:
+            groups: Dict[str, list] = defaultdict(list)
+            for labels, metric in series.items():
+                groups[dict(labels).get(label, "")].append(metric)
+            result[label] = {value: summarize(metrics) for value, metrics in sorted(groups.items())}
+        result["series"] = [dict(dict(labels), **summarize([metric]))
+                            for labels, metric in sorted(series.items())]
+        return result
+
+    def prometheus(self) -> str:
+        """Text exposition format; histogram values are exported in seconds from microseconds"""
+        prefix = f"{self.namespace}_" if self.namespace else ""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.rates.items()):
+                metric = f"{prefix}{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                for labels, rate in sorted(series.items()):
+                    lines.append(f"{metric}{format_labels(labels)} {rate.total}")
+            for name, series in sorted(self.histograms.items()):
+                metric = f"{prefix}{name}_seconds"
+                lines.append(f"# TYPE {metric} summary")
+                for labels, histogram in sorted(series.items()):
+                    for quantile in QUANTILES:
+                        value = histogram.percentile(quantile) / 1e6
+                        lines.append(f"{metric}{format_labels(labels + (('quantile', str(quantile)),))} {value:g}")
+                    lines.append(f"{metric}_sum{format_labels(labels)} {histogram.total / 1e6:g}")
+                    lines.append(f"{metric}_count{format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, path: str, by: Iterable[str] = ()) -> None:
+        """Atomically replace a JSON snapshot file"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(by), f, indent=2)
+        os.replace(tmp, path)
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + "}"
@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+
+"""
+In-memory index of a GitHub Project (V2)
+
+Loads every project item and the project's field registry once, then answers
+lookups by issue number or title from memory. Mutations go through the API
+and are applied to the index as they succeed, so the index stays current
+without re-listing the project.
+"""
+
+import json
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from field_rules import OptionTable
+from github_api import GraphQLError
+
+# Selection shared by the full listing and single-item lookups
+ITEM_SELECTION = """
+          id
+          content {
+            ... on Issue {
+              id
+              number
+              title
+              state
+              repository {
+                name
+                owner {
+                  login
+                }
+              }
+              labels(first: 20) {
+                nodes {
+                  name
+                }
+              }
+            }
+            ... on DraftIssue {
+              title
+            }
+          }
+          fieldValues(first: 20) {
+            nodes {
+              ... on ProjectV2ItemFieldSingleSelectValue {
+                name
+                field { ... on ProjectV2FieldCommon { name } }
+              }
+              ... on ProjectV2ItemFieldNumberValue {
+                number
+                field { ... on ProjectV2FieldCommon { name } }
+              }
+              ... on ProjectV2ItemFieldTextValue {
+                text
+                field { ... on ProjectV2FieldCommon { name } }
+              }
+            }
+          }
+"""
+
+ITEMS_QUERY = """
+query($projectId:ID!, $cursor:String) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: 100, after: $cursor) {
+        pageInfo {
+          hasNextPage
+          endCursor
+        }
+        nodes {
+""" + ITEM_SELECTION + """
+        }
+      }
+    }
+  }
+}
+"""
+
+ITEM_QUERY = """
+query($itemId:ID!) {
+  node(id: $itemId) {
+    ... on ProjectV2Item {
+""" + ITEM_SELECTION + """
+    }
+  }
+}
+"""
+
+FIELDS_QUERY = """
+query($projectId:ID!) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      fields(first: 50) {
+        nodes {
+          ... on ProjectV2FieldCommon {
+            id
+            name
+            dataType
+          }
+          ... on ProjectV2SingleSelectField {
+            options {
+              id
+              name
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+ISSUE_ID_QUERY = """
+query($owner:String!, $name:String!, $number:Int!) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) {
+      id
+    }
+  }
+}
+"""
+
+ADD_ITEM_MUTATION = """
+mutation($projectId:ID!, $contentId:ID!) {
+  addProjectV2ItemById(input: {projectId: $projectId, contentId: $contentId}) {
+    item {
+      id
+    }
+  }
+}
+"""
+
+DELETE_ITEM_MUTATION = """
+mutation($projectId:ID!, $itemId:ID!) {
+  deleteProjectV2Item(input: {projectId: $projectId, itemId: $itemId}) {
+    deletedItemId
+  }
+}
+"""
+
+SET_OPTION_MUTATION = """
+mutation($projectId:ID!, $itemId:ID!, $fieldId:ID!, $optionId:String!) {
+  updateProjectV2ItemFieldValue(input: {
+    projectId: $projectId
+    itemId: $itemId
+    fieldId: $fieldId
+    value: {
+      singleSelectOptionId: $optionId
+    }
+  }) {
+    projectV2Item {
+      id
+    }
+  }
+}
+"""
+
+SET_NUMBER_MUTATION = """
+mutation($projectId:ID!, $itemId:ID!, $fieldId:ID!, $number:Float!) {
+  updateProjectV2ItemFieldValue(input: {
+    projectId: $projectId
+    itemId: $itemId
+    fieldId: $fieldId
+    value: {
+      number: $number
+    }
+  }) {
+    projectV2Item {
+      id
+    }
+  }
+}
+"""
+
+
+def parse_item(node: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a project item node into the index's item shape"""
+    content = node.get("content") or {}
+    repository = content.get("repository") or {}
+    fields = {}
+    for value in (node.get("fieldValues") or {}).get("nodes", []):
+        field_name = (value.get("field") or {}).get("name")
+        if not field_name:
+            continue
+        for key in ("name", "number", "text"):
+            if key in value:
+                fields[field_name] = value[key]
+                break
+
+    return {
+        "id": node.get("id"),
+        "issue_id": content.get("id"),
+        "number": content.get("number"),
+        "title": content.get("title"),
+        "state": content.get("state"),
+        "repo": repository.get("name"),
+        "owner": (repository.get("owner") or {}).get("login"),
+        "labels": [
+            label.get("name")
+            for label in (content.get("labels") or {}).get("nodes", [])
+        ],
+        "fields": fields,
+    }
+
+
+class ProjectIndex:
+    """Project items and fields, indexed by item ID, issue number and title"""
+
+    def __init__(self, session, owner: str, repo: str, project_id: str):
+        self.session = session
+        self.owner = owner
+        self.repo = repo
+        self.project_id = project_id
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.fields: Dict[str, Dict[str, Any]] = {}
+        self.options = OptionTable({})
+        self._by_number: Dict[int, str] = {}
+        self._by_title: Dict[str, List[str]] = defaultdict(list)
+        self._lock = threading.RLock()
+
+    # Loading
+
+    def load(self) -> None:
+        """(Re)load the field registry and every project item"""
+        fields = self._fetch_fields()
+        items = self._fetch_items()
+        with self._lock:
+            self.fields = fields
+            self.options = OptionTable(fields)
+            self.items = {}
+            self._by_number = {}
+            self._by_title = defaultdict(list)
+            for item in items:
+                self._insert(item)
+
+    def save_snapshot(self, path: str) -> None:
+        """Write the fields and items to a JSON file"""
+        with self._lock:
+            snapshot = {"fields": self.fields, "items": list(self.items.values())}
+            with open(path, "w") as f:
+                json.dump(snapshot, f, indent=2)
+
+    def load_snapshot(self, path: str) -> None:
+        """Replace the index contents with a snapshot written by save_snapshot"""
+        with open(path) as f:
+            snapshot = json.load(f)
+        with self._lock:
+            self.fields = snapshot.get("fields", {})
+            self.options = OptionTable(self.fields)
+            self.items = {}
+            self._by_number = {}
+            self._by_title = defaultdict(list)
+            for item in snapshot.get("items", []):
+                self._insert(item)
+
+    def _fetch_fields(self) -> Dict[str, Dict[str, Any]]:
+        data = self.session.query(FIELDS_QUERY, {"projectId": self.project_id})
+        fields = {}
+        for node in data.get("node", {}).get("fields", {}).get("nodes", []):
+            if not node.get("name"):
+                continue
+            fields[node["name"]] = {
+                "id": node.get("id"),
+                "dataType": node.get("dataType"),
+                "options": {
+                    opt.get("name"): opt.get("id")
+                    for opt in node.get("options", [])
+                },
+            }
+        return fields
+
+    def _fetch_items(self) -> List[Dict[str, Any]]:
+        items = []
+        cursor = None
+        while True:
+            data = self.session.query(
+                ITEMS_QUERY, {"projectId": self.project_id, "cursor": cursor}
+            )
+            page = data.get("node", {}).get("items", {})
+            items.extend(parse_item(node) for node in page.get("nodes", []))
+            page_info = page.get("pageInfo", {})
+            if not page_info.get("hasNextPage"):
+                return items
+            cursor = page_info.get("endCursor")
+
+    # Index maintenance
+
+    def _insert(self, item: Dict[str, Any]) -> None:
+        self.items[item["id"]] = item
+        if item.get("number") is not None and item.get("repo") == self.repo:
+            self._by_number[int(item["number"])] = item["id"]
+        if item.get("title"):
+            self._by_title[item["title"]].append(item["id"])
+
+    def _remove(self, item_id: str) -> Optional[Dict[str, Any]]:
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return None
+        number = item.get("number")
+        if number is not None and self._by_number.get(int(number)) == item_id:
+            del self._by_number[int(number)]
+            # Another (duplicate) item may still represent the issue
+            for other in self.items.values():
+                if other.get("number") == number and other.get("repo") == self.repo:
+                    self._by_number[int(number)] = other["id"]
+                    break
+        title_ids = self._by_title.get(item.get("title"), [])
+        if item_id in title_ids:
+            title_ids.remove(item_id)
+            if not title_ids:
+                del self._by_title[item["title"]]
+        return item
+
+    def upsert_item(self, item: Dict[str, Any]) -> None:
+        """Insert an item or replace the indexed copy"""
+        with self._lock:
+            self._remove(item["id"])
+            self._insert(item)
+
+    def remove_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Drop an item from the index, returning it if it was present"""
+        with self._lock:
+            return self._remove(item_id)
+
+    # Lookups
+
+    def find(self, number: Optional[int] = None, title: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Find an item by issue number (preferred) or title"""
+        with self._lock:
+            if number is not None:
+                item_id = self._by_number.get(int(number))
+                if item_id:
+                    return self.items[item_id]
+            if title is not None:
+                ids = self._by_title.get(title)
+                if ids:
+                    return self.items[ids[0]]
+        return None
+
+    def all_items(self) -> List[Dict[str, Any]]:
+        """Every item, copied out under the lock"""
+        with self._lock:
+            return list(self.items.values())
+
+    def duplicates(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Titles that appear on more than one project item"""
+        with self._lock:
+            return {
+                title: [self.items[i] for i in ids]
+                for title, ids in self._by_title.items() if len(ids) > 1
+            }
+
+    def missing_field(self, field_name: str) -> List[Dict[str, Any]]:
+        """Issue items that have no value for a field"""
+        with self._lock:
+            return [
+                item for item in self.items.values()
+                if item.get("number") is not None
+                and field_name not in item["fields"]
+            ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts describing the indexed project"""
+        with self._lock:
+            return {
+                "project_id": self.project_id,
+                "items": len(self.items),
+                "issues": len(self._by_number),
+                "fields": sorted(self.fields),
+                "duplicate_titles": sum(
+                    1 for ids in self._by_title.values() if len(ids) > 1
+                ),
+            }
+
+    # Mutations
+
+    def add_issue(self, number: int) -> Dict[str, Any]:
+        """Add an issue to the project (no-op if already present)"""
+        existing = self.find(number=number)
+        if existing:
+            return existing
+
+        data = self.session.query(ISSUE_ID_QUERY, {
+            "owner": self.owner, "name": self.repo, "number": int(number)
+        })
+        issue = (data.get("repository") or {}).get("issue")
+        if not issue:
+            raise GraphQLError(f"Issue #{number} not found in {self.owner}/{self.repo}")
+
+        data = self.session.query(ADD_ITEM_MUTATION, {
+            "projectId": self.project_id, "contentId": issue["id"]
+        })
+        item_id = data["addProjectV2ItemById"]["item"]["id"]
+        item = self.fetch_item(item_id) or {
+            "id": item_id, "issue_id": issue["id"], "number": int(number),
+            "title": None, "state": None, "repo": self.repo,
+            "owner": self.owner, "labels": [], "fields": {},
+        }
+        self.upsert_item(item)
+        return item
+
+    def fetch_item(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a single item from the API (without indexing it)"""
+        data = self.session.query(ITEM_QUERY, {"itemId": item_id})
+        node = data.get("node")
+        return parse_item(node) if node else None
+
+    def delete_item(self, item_id: str) -> None:
+        """Delete an item from the project"""
+        self.session.query(DELETE_ITEM_MUTATION, {
+            "projectId": self.project_id, "itemId": item_id
+        })
+        self.remove_item(item_id)
+
+    def set_field(self, item_id: str, field_name: str, value: Any) -> None:
+        """Set a single-select (by option name) or number field on an item"""
+        if field_name not in self.fields:
+            raise GraphQLError(f"Field '{field_name}' not found in project")
+        resolved = self.options.resolve(field_name, value)
+        if resolved is None:
+            raise GraphQLError(f"'{value}' is not a valid value for {field_name}")
+
+        field_id, kind, field_value = resolved
+        variables = {
+            "projectId": self.project_id,
+            "itemId": item_id,
+            "fieldId": field_id,
+        }
+        if kind == "singleSelectOptionId":
+            variables["optionId"] = field_value
+            self.session.query(SET_OPTION_MUTATION, variables)
+        else:
+            variables["number"] = field_value
+            self.session.query(SET_NUMBER_MUTATION, variables)
+
+        with self._lock:
+            item = self.items.get(item_id)
+            if item is not None:
+                item["fields"][field_name] = value
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+"""
+Issue-to-project migration over a ProjectIndex
+
+Ensures every repository issue is a project item whose fields match its
+labels, and sets parent/sub-issue relationships. Used by the project daemon
+and by the sharded multi-project runner.
+"""
+
+import contextlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from field_rules import default_rules
+from github_api import GraphQLError
+from project_index import ProjectIndex
+
+REPO_ISSUES_QUERY = """
+query($owner:String!, $name:String!, $cursor:String, $states:[IssueState!], $since:DateTime) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $cursor, states: $states, filterBy: {since: $since}) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        id
+        number
+        title
+        body
+        state
+        url
+        createdAt
+        updatedAt
+        labels(first: 20) {
+          nodes {
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+ADD_SUB_ISSUE_MUTATION = """
+mutation($parentId:ID!, $childId:ID!) {
+  addSubIssue(input: {
+    issueId: $parentId,
+    subIssueId: $childId,
+    replaceParent: true
+  }) {
+    issue {
+      number
+    }
+  }
+}
+"""
+
+
+def iter_repo_issues(session, owner: str, repo: str, states: Iterable[str] = ("OPEN", "CLOSED"),
+                     since: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Stream a repository's issues page by page, with label names flattened
+
+    `since` (ISO 8601) limits the stream to issues updated at or after it.
+    """
+    cursor = None
+    while True:
+        data = session.query(REPO_ISSUES_QUERY, {
+            "owner": owner, "name": repo, "cursor": cursor,
+            "states": list(states), "since": since
+        })
+        page = data["repository"]["issues"]
+        for node in page["nodes"]:
+            node["labels"] = [label["name"] for label in node["labels"]["nodes"]]
+            yield node
+        if not page["pageInfo"]["hasNextPage"]:
+            return
+        cursor = page["pageInfo"]["endCursor"]
+
+
+def fetch_repo_issues(session, owner: str, repo: str) -> Dict[int, Dict[str, Any]]:
+    """All issues of a repository keyed by number"""
+    return {issue["number"]: issue for issue in iter_repo_issues(session, owner, repo)}
+
+
+def set_parent(index: ProjectIndex, parent: int, child: int) -> bool:
+    """Make child a sub-issue of parent (already-linked pairs are fine)"""
+    parent_item = index.find(number=parent)
+    child_item = index.find(number=child)
+    if not parent_item or not child_item:
+        raise GraphQLError(f"Issue #{parent} or #{child} is not in the project")
+    try:
+        index.session.query(ADD_SUB_ISSUE_MUTATION, {
+            "parentId": parent_item["issue_id"],
+            "childId": child_item["issue_id"],
+        })
+    except GraphQLError as e:
+        if "duplicate sub-issues" not in str(e):
+            raise
+    return True
+
+
+def set_field_if_changed(index: ProjectIndex, number: int, field: str, value: Any) -> bool:
+    """Set a field on an issue's item unless it already has that value"""
+    item = index.find(number=number)
+    if item is None:
+        raise GraphQLError(f"Issue #{number} is not in the project")
+    if item["fields"].get(field) == value:
+        return False
+    index.set_field(item["id"], field, value)
+    return True
+
+
+def migrate_project(index: ProjectIndex, issues: Dict[int, Dict[str, Any]],
+                    limit: Optional[int] = None,
+                    parents: Optional[Dict[str, List[str]]] = None,
+                    write_lock=None) -> Dict[str, int]:
+    """Ensure issues are in the project with label-derived fields and parents"""
+    lock = write_lock or contextlib.nullcontext()
+    stats = {"processed": 0, "added": 0, "updated": 0, "failed": 0, "parents": 0}
+    numbers = sorted(issues)[:limit] if limit else sorted(issues)
+    values = default_rules().map_issues((issues[number] for number in numbers),
+                                        f"{index.owner}/{index.repo}")
+    for number in numbers:
+        try:
+            with lock:
+                if index.find(number=number) is None:
+                    index.add_issue(number)
+                    stats["added"] += 1
+                for field, value in values[number].items():
+                    if field in index.fields:
+                        set_field_if_changed(index, number, field, value)
+            stats["updated"] += 1
+        except GraphQLError as e:
+            print(f"  ✗ Issue #{number}: {e}")
+            stats["failed"] += 1
+        stats["processed"] += 1
+
+    for parent, children in (parents or {}).items():
+        for child in children:
+            try:
+                with lock:
+                    set_parent(index, int(parent), int(child))
+                stats["parents"] += 1
+            except GraphQLError as e:
+                print(f"  ✗ Parent #{parent} -> #{child}: {e}")
+                stats["failed"] += 1
+    return stats
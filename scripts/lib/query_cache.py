@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Read-through cache for Chroma query results
+
+Results are cached per query text, keyed by (collection, collection version,
+normalized-text hash, n_results, where-filter, include). Each collection has a
+version counter that writes through the same process bump; since the version
+is part of the key, a write makes every earlier result for that collection
+unreachable at once, and those entries age out of the LRU. The TTL bounds
+how stale a result can get when another process writes to the collection.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from embedding_cache import normalize
+
+
+def split_result(result: Dict[str, Any], count: int) -> List[Dict[str, Any]]:
+    """Per-text results from a Chroma query response covering count texts"""
+    parts: List[Dict[str, Any]] = [{} for _ in range(count)]
+    for field, value in result.items():
+        for i, part in enumerate(parts):
+            if field != "include" and isinstance(value, list) and len(value) == count:
+                part[field] = value[i]
+            else:
+                part[field] = value
+    return parts
+
+
+def merge_results(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Inverse of split_result"""
+    merged: Dict[str, Any] = {}
+    for field in parts[0] if parts else ():
+        values = [part[field] for part in parts]
+        if field == "include" or all(value is None for value in values):
+            merged[field] = values[0]
+        else:
+            merged[field] = values
+    return merged
+
+
+class QueryCache:
+    """TTL + LRU map of per-text query results, invalidated by collection version"""
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def key(self, collection: str, text: str, n_results: int,
+            where: Optional[Dict[str, Any]], include: Optional[List[str]]) -> Tuple:
+        digest = hashlib.sha256(normalize(text).encode("utf-8")).hexdigest()
+        filters = json.dumps(where, sort_keys=True) if where else ""
+        return (collection, self._versions.get(collection, 0), digest, n_results,
+                filters, tuple(include or ()))
+
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(self, key: Tuple, result: Dict[str, Any]) -> None:
+        with self._lock:
+            # A write may have landed while the query was in flight
+            if key[1] != self._versions.get(key[0], 0):
+                return
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self, collection: str) -> None:
+        """Invalidate every cached result for a collection after a write"""
+        with self._lock:
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+            self.stats["invalidations"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+
+"""
+Process-shared request budgets
+
+A token bucket whose state lives in shared memory, so every worker process
+using the same GitHub token draws from one budget. GitHub allows 5000
+GraphQL points per hour per token; the default rate stays under that.
+"""
+
+import multiprocessing
+import time
+
+
+class RateBudget:
+    """Token bucket shared between processes (pass it via a Pool initializer)"""
+
+    def __init__(self, per_hour: float = 4500, burst: float = 50):
+        self.rate = per_hour / 3600.0
+        self.burst = burst
+        self._tokens = multiprocessing.Value("d", burst, lock=False)
+        self._updated = multiprocessing.Value("d", time.time(), lock=False)
+        self._lock = multiprocessing.Lock()
+
+    def acquire(self, cost: float = 1.0) -> float:
+        """Block until `cost` tokens are available; returns seconds waited"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.time()
+                elapsed = now - self._updated.value
+                self._tokens.value = min(
+                    self.burst, self._tokens.value + elapsed * self.rate
+                )
+                self._updated.value = now
+                if self._tokens.value >= cost:
+                    self._tokens.value -= cost
+                    return waited
+                delay = (cost - self._tokens.value) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def drain_until(self, reset_at: float) -> None:
+        """Empty the bucket until `reset_at` (epoch seconds), e.g. on a 403"""
+        with self._lock:
+            self._tokens.value = -max(0.0, reset_at - time.time()) * self.rate
+            self._updated.value = time.time()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+"""
+Minimal JSON RPC over a Unix domain socket
+
+Each request is one line of JSON, `{"method": ..., "params": {...}}`, and
+each response is one line, `{"result": ...}` or `{"error": "..."}`. A client
+connection may send any number of requests in sequence.
+"""
+
+import json
+import os
+import socket
+import socketserver
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "project-daemon.sock"
+)
+
+
+class RPCError(Exception):
+    """Raised by the client when the server reports an error"""
+
+
+class SocketInUse(Exception):
+    """Raised when a server is already listening on a socket path"""
+
+
+def claim_socket(path: str) -> None:
+    """Remove a socket file left by a server that died; raise SocketInUse if one answers"""
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise SocketInUse(f"A server is already listening on {path}")
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                method = self.server.methods.get(request.get("method"))
+                if method is None:
+                    raise RPCError(f"Unknown method: {request.get('method')}")
+                response = {"result": method(**request.get("params", {}))}
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+
+class RPCServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix-socket server dispatching to registered methods"""
+
+    daemon_threads = True
+
+    def __init__(self, path: str = DEFAULT_SOCKET):
+        claim_socket(path)
+        self.methods: Dict[str, Callable[..., Any]] = {}
+        super().__init__(path, _Handler)
+        os.chmod(path, 0o600)
+
+    def register(self, name: str, fn: Callable[..., Any]) -> None:
+        self.methods[name] = fn
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class RPCClient:
+    """Client keeping one connection open for a sequence of calls"""
+
+    def __init__(self, path: str = DEFAULT_SOCKET, timeout: Optional[float] = 300):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(path)
+        self._reader = self.sock.makefile("rb")
+
+    def call(self, method: str, **params: Any) -> Any:
+        request = json.dumps({"method": method, "params": params})
+        self.sock.sendall(request.encode() + b"\n")
+        line = self._reader.readline()
+        if not line:
+            raise RPCError("Connection closed by server")
+        response = json.loads(line)
+        if "error" in response:
+            raise RPCError(response["error"])
+        return response.get("result")
+
+    def close(self) -> None:
+        self._reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
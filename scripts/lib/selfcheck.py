@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+
+"""
+Runner for the repository's `test_*.py` check scripts when run directly
+
+The scripts are plain pytest modules; `run(globals())` at their end lets them
+also run without pytest, printing one ✓/✗ line per test.
+"""
+
+import sys
+import traceback
+from typing import Any, Dict
+
+
+def run(namespace: Dict[str, Any]) -> None:
+    """Call every `test_*` function in a module namespace and exit non-zero on failure"""
+    tests = [(name, fn) for name, fn in namespace.items() if name.startswith("test_") and callable(fn)]
+    failed = 0
+    for name, fn in tests:
+        try:
+            fn()
+            print(f"✓ {name}")
+        except Exception:
+            failed += 1
+            print(f"✗ {name}")
+            traceback.print_exc()
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+Single-flight request coalescing
+
+Deduplicates identical reads so that concurrent callers asking for the same
+key share one underlying call, and callers arriving shortly after a call
+completed reuse its result instead of hitting the network again.
+
+Usage:
+    flight = SingleFlight(ttl=30)
+    data = flight.do(("issue", "42"), lambda: fetch_issue("42"))
+    flight.forget(("issue", "42"))   # after a mutation touching issue 42
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """An in-flight (or completed) call shared by every waiter on a key"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.finished_at = 0.0
+
+
+class SingleFlight:
+    """Coalesce duplicate calls by key, with a short-lived result cache"""
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.stats = {"calls": 0, "shared": 0, "cached": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn()'s result, sharing it with any duplicate caller of key"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                if not call.done.is_set():
+                    self.stats["shared"] += 1
+                elif time.monotonic() - call.finished_at <= self.ttl:
+                    self.stats["cached"] += 1
+                else:
+                    call = None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                self.stats["calls"] += 1
+                leader = True
+            else:
+                leader = False
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            call.finished_at = time.monotonic()
+            with self._lock:
+                # Failures are shared with current waiters but never cached
+                if call.error is not None and self._calls.get(key) is call:
+                    del self._calls[key]
+                self._evict()
+            call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def forget(self, key: Optional[Hashable] = None) -> None:
+        """Drop the cached result for key, or for every key if None"""
+        with self._lock:
+            if key is None:
+                self._calls = {
+                    k: c for k, c in self._calls.items() if not c.done.is_set()
+                }
+            else:
+                call = self._calls.get(key)
+                if call is not None and call.done.is_set():
+                    del self._calls[key]
+
+    def _evict(self) -> None:
+        """Remove expired entries and trim to max_entries (lock held)"""
+        now = time.monotonic()
+        expired = [
+            k for k, c in self._calls.items()
+            if c.done.is_set() and now - c.finished_at > self.ttl
+        ]
+        for k in expired:
+            del self._calls[k]
+
+        overflow = len(self._calls) - self.max_entries
+        if overflow > 0:
+            completed = sorted(
+                (k for k, c in self._calls.items() if c.done.is_set()),
+                key=lambda k: self._calls[k].finished_at
+            )
+            for k in completed[:overflow]:
+                del self._calls[k]
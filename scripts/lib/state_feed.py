@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+
+"""
+State change feed
+
+Publish/subscribe for the agent state store, replacing polling of
+`load_agent_state()`. The store publishes one event per committed save or
+delete, in commit order, each with a feed-wide sequence number:
+
+    {"seq", "agent_id", "state_type", "version", "timestamp", "kind"}
+
+Subscribers register an agent ID prefix and optionally a set of state types,
+and read batches of events from an asyncio iterator. Events are coalesced per
+(agent, state type) while a subscriber is behind: a consumer that is slow
+sees only the latest version of each key, not every intermediate one.
+
+Recent events are kept in a ring buffer so a subscriber can resume after the
+last sequence number it processed. Sequence numbers are scoped to the feed's
+`epoch`, which changes when the process restarts; resuming from another epoch,
+from a point older than the buffer, or from a number this feed has not reached
+yet (a restart the subscriber did not pass an epoch for), yields a `{"kind": "reset"}` event,
+after which the subscriber should reload the state it tracks.
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+Event = Dict[str, Any]
+
+
+class Subscription:
+    """Async iterator of coalesced event batches for one subscriber"""
+
+    def __init__(self, feed: "StateFeed", agent_prefix: str, state_types: Optional[Set[str]],
+                 loop: asyncio.AbstractEventLoop):
+        self.feed = feed
+        self.agent_prefix = agent_prefix
+        self.state_types = state_types
+        self.loop = loop
+        self.last_seq = 0
+        self._pending: "OrderedDict[Tuple[str, str], Event]" = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._closed = False
+
+    def matches(self, event: Event) -> bool:
+        if event["kind"] == "reset":
+            return True
+        return (event["agent_id"].startswith(self.agent_prefix)
+                and (self.state_types is None or event["state_type"] in self.state_types))
+
+    def _offer(self, event: Event) -> None:
+        """Queue an event (called with the feed lock held), replacing older ones for the key"""
+        key = (event.get("agent_id", ""), event.get("state_type", ""))
+        previous = self._pending.pop(key, None)
+        if previous is not None and previous["seq"] > event["seq"]:
+            event = previous
+        self._pending[key] = event
+
+    def _wake(self) -> None:
+        self._wakeup.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> List[Event]:
+        while True:
+            if self._closed:
+                raise StopAsyncIteration
+            batch = self.feed._drain(self)
+            if batch:
+                self.last_seq = batch[-1]["seq"]
+                return batch
+            self._wakeup.clear()
+            # Re-check after clearing so a publish in between is not missed
+            if not self.feed._has_pending(self):
+                await self._wakeup.wait()
+
+    def close(self) -> None:
+        self._closed = True
+        self.feed._unsubscribe(self)
+        if not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._wake)
+
+
+class StateFeed:
+    """Sequence-numbered state change events with prefix subscriptions"""
+
+    def __init__(self, retention: int = 10_000):
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        self._buffer: Deque[Event] = deque(maxlen=retention)
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+
+    def publish(self, changes: Iterable[Dict[str, Any]]) -> None:
+        """Publish committed changes ({agent_id, state_type, version, timestamp, kind}) in order; thread-safe"""
+        woken = []
+        with self._lock:
+            for change in changes:
+                self.seq += 1
+                event = dict(change, seq=self.seq)
+                self._buffer.append(event)
+                for subscription in self._subscriptions:
+                    if subscription.matches(event):
+                        subscription._offer(event)
+                        woken.append(subscription)
+        for subscription in set(woken):
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._wake)
+            except RuntimeError:
+                # The subscriber's event loop is closed; nobody will read it again
+                self._unsubscribe(subscription)
+
+    def subscribe(self, agent_prefix: str = "", state_types: Optional[Iterable[str]] = None,
+                  after: Optional[int] = None, epoch: Optional[str] = None) -> Subscription:
+        """Subscribe from the current event loop; `after` resumes from a sequence number"""
+        subscription = Subscription(self, agent_prefix,
+                                    set(state_types) if state_types else None,
+                                    asyncio.get_running_loop())
+        with self._lock:
+            if after is not None:
+                oldest = self._buffer[0]["seq"] if self._buffer else self.seq + 1
+                # A sequence number past ours was issued before a restart
+                if ((epoch is not None and epoch != self.epoch)
+                        or after < oldest - 1 or after > self.seq):
+                    subscription._offer({"seq": self.seq, "kind": "reset", "epoch": self.epoch,
+                                         "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ",
+                                                                    time.gmtime())})
+                else:
+                    for event in self._buffer:
+                        if event["seq"] > after and subscription.matches(event):
+                            subscription._offer(event)
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def _drain(self, subscription: Subscription) -> List[Event]:
+        with self._lock:
+            batch = sorted(subscription._pending.values(), key=lambda event: event["seq"])
+            subscription._pending.clear()
+        return batch
+
+    def _has_pending(self, subscription: Subscription) -> bool:
+        with self._lock:
+            return bool(subscription._pending)
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"epoch": self.epoch, "seq": self.seq, "buffered": len(self._buffer),
+                    "subscribers": len(self._subscriptions)}
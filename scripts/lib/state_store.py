@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+
+"""
+Versioned agent state store
+
+Python implementation of the Agent State Store
+(docs/architecture/components/agent-state-store.md). Instead of a full JSON
+file plus a git commit per save:
+
+    - the latest state of each (agent, state type) is served from an LRU
+      memory cache
+    - each version is stored as a content-addressed, zlib-compressed chunk
+      holding either a JSON-patch delta from the previous version or, every
+      `snapshot_every` versions (or when the delta would be larger), a full
+      snapshot, so disk usage grows with the size of changes
+    - a per-key history index (`history/<agent>/<state_type>.jsonl`) maps
+      versions to chunks and is loaded lazily
+
+`restore_state_version()` reads the nearest snapshot at or below the version
+and applies at most `snapshot_every - 1` deltas.
+
+Writes are compare-and-set on the current version (`expected_version`) and
+go through a write-ahead log with group commit: each save is one WAL record
+carrying its chunk, concurrent saves share one fsync, and the chunk and
+history files are written after the commit without fsyncs of their own. A
+checkpoint fsyncs those files and empties the log once it grows past
+`checkpoint_bytes`; on startup the log is replayed to redo any record whose
+files were not yet written.
+
+With a `StateFeed`, every committed save and delete is published to its
+subscribers in commit order.
+
+Only one process may open a store directory: the constructor takes an
+exclusive lock on its `LOCK` file and raises `StoreLocked` if another process
+holds it.
+
+Layout under the store directory:
+    LOCK                            held by the process that has the store open
+    state.wal                       write-ahead log
+    objects/ab/cdef...              chunks named by the sha256 of their content
+    history/<agent>/<type>.jsonl    one record per version
+"""
+
+import copy
+import fcntl
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from state_feed import StateFeed
+from wal import WriteAheadLog
+
+STATE_TYPES = ("config", "runtime", "memory")
+Key = Tuple[str, str]
+
+
+class StoreLocked(Exception):
+    """Raised when another process has the store directory open"""
+
+
+class VersionConflict(Exception):
+    """Raised when a compare-and-set save finds a different current version"""
+
+
+def timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+# JSON patch (RFC 6902 add / remove / replace)
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """JSON patch turning `old` into `new`; appended list items become `add` ops"""
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, f"{path}/{_escape(key)}"))
+        return ops
+    if isinstance(old, list):
+        ops = []
+        for i in range(min(len(old), len(new))):
+            if old[i] != new[i]:
+                ops.extend(diff(old[i], new[i], f"{path}/{i}"))
+        for value in new[len(old):]:
+            ops.append({"op": "add", "path": f"{path}/-", "value": value})
+        for i in range(len(old) - 1, len(new) - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        return ops
+    if old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def apply_patch(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply a JSON patch in place and return the (possibly replaced) document"""
+    for op in ops:
+        if op["path"] == "":
+            document = copy.deepcopy(op["value"]) if op["op"] != "remove" else None
+            continue
+        *parents, last = [_unescape(token) for token in op["path"].split("/")[1:]]
+        target = document
+        for token in parents:
+            target = target[int(token)] if isinstance(target, list) else target[token]
+        if isinstance(target, list):
+            if op["op"] == "remove":
+                del target[int(last)]
+            elif last == "-":
+                target.append(copy.deepcopy(op["value"]))
+            elif op["op"] == "add":
+                target.insert(int(last), copy.deepcopy(op["value"]))
+            else:
+                target[int(last)] = copy.deepcopy(op["value"])
+        elif op["op"] == "remove":
+            del target[last]
+        else:
+            target[last] = copy.deepcopy(op["value"])
+    return document
+
+
+class LRU:
+    """Small OrderedDict-based LRU map with hit/miss counters"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class StateStore:
+    """Agent state with an LRU hot cache, delta-compressed history and a group-committed WAL"""
+
+    def __init__(self, root: str, cache_size: int = 1024, snapshot_every: int = 20,
+                 chunk_cache_size: int = 256, wal: bool = True,
+                 checkpoint_bytes: int = 16 << 20, feed: Optional[StateFeed] = None):
+        self.root = root
+        self.feed = feed
+        self.snapshot_every = snapshot_every
+        self.checkpoint_bytes = checkpoint_bytes
+        self.cache = LRU(cache_size)
+        self._chunks = LRU(chunk_cache_size)
+        # (agent, state type) -> version records, loaded on first access
+        self._history: Dict[Key, List[Dict[str, Any]]] = {}
+        # Chunks of committed saves whose object files are not written yet
+        self._unwritten: Dict[str, Any] = {}
+        # Files written since the last checkpoint
+        self._dirty: Set[str] = set()
+        self._lock = threading.RLock()
+        os.makedirs(root, exist_ok=True)
+        self._lock_file = open(os.path.join(root, "LOCK"), "a")
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self._lock_file.close()
+            raise StoreLocked(f"State store {root} is open in another process")
+        self._objects = os.path.join(root, "objects")
+        self._history_dir = os.path.join(root, "history")
+        os.makedirs(self._objects, exist_ok=True)
+        os.makedirs(self._history_dir, exist_ok=True)
+        self._wal: Optional[WriteAheadLog] = None
+        if wal:
+            self._wal = WriteAheadLog(os.path.join(root, "state.wal"), self._apply)
+            self._apply(list(self._wal.replay()), replay=True)
+            self._checkpoint()
+
+    # Chunks
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self._objects, digest[:2], digest[2:])
+
+    @staticmethod
+    def _encode_chunk(payload: Any) -> bytes:
+        return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+
+    def _write_chunk(self, digest: str, payload: Any) -> None:
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp, "wb") as f:
+            f.write(zlib.compress(self._encode_chunk(payload)))
+        os.replace(temp, path)
+        self._dirty.add(path)
+
+    def _get_chunk(self, digest: str) -> Any:
+        payload = self._chunks.get(digest)
+        if payload is None:
+            payload = self._unwritten.get(digest)
+        if payload is None:
+            with open(self._object_path(digest), "rb") as f:
+                payload = json.loads(zlib.decompress(f.read()))
+            self._chunks.put(digest, payload)
+        return payload
+
+    # History index
+
+    def _history_file(self, key: Key) -> str:
+        return os.path.join(self._history_dir, key[0], f"{key[1]}.jsonl")
+
+    def _records(self, key: Key) -> List[Dict[str, Any]]:
+        records = self._history.get(key)
+        if records is None:
+            records = []
+            path = self._history_file(key)
+            if os.path.exists(path):
+                with open(path) as f:
+                    lines = f.readlines()
+                for line in lines:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Torn write from a crash; the WAL replay re-appends it
+                        with open(path, "w") as f:
+                            f.writelines(json.dumps(record) + "\n" for record in records)
+                        break
+            self._history[key] = records
+        return records
+
+    # Commit path
+
+    def _commit(self, entry: Dict[str, Any]) -> Optional[int]:
+        """Log an entry (caller holds the lock); returns the LSN to wait for"""
+        if entry["payload"] is not None:
+            self._unwritten[entry["record"]["chunk"]] = entry["payload"]
+        if self._wal is None:
+            self._apply([entry])
+            return None
+        return self._wal.submit(entry)
+
+    def _wait(self, lsn: Optional[int]) -> None:
+        if lsn is not None:
+            self._wal.wait(lsn)
+
+    def _apply(self, entries: List[Dict[str, Any]], replay: bool = False) -> None:
+        """Write the chunk and history files of committed entries, in log order"""
+        lines: Dict[str, List[str]] = {}
+        for entry in entries:
+            key = tuple(entry["key"])
+            record = entry["record"]
+            if entry["payload"] is not None:
+                self._write_chunk(record["chunk"], entry["payload"])
+            if replay:
+                records = self._records(key)
+                if len(records) >= record["version"]:
+                    continue  # already in the history file
+                records.append(record)
+            path = self._history_file(key)
+            lines.setdefault(path, []).append(json.dumps(record) + "\n")
+        for path, batch in lines.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a") as f:
+                f.writelines(batch)
+            self._dirty.add(path)
+        for entry in entries:
+            if entry["payload"] is not None:
+                self._unwritten.pop(entry["record"]["chunk"], None)
+        if self.feed is not None and not replay:
+            # Runs in the WAL commit callback: a feed failure must not fail the log
+            try:
+                self.feed.publish(
+                    {"agent_id": entry["key"][0], "state_type": entry["key"][1],
+                     "version": entry["record"]["version"],
+                     "timestamp": entry["record"]["timestamp"],
+                     "kind": "delete" if entry["record"]["kind"] == "delete" else "save"}
+                    for entry in entries
+                )
+            except Exception as e:
+                print(f"  ⚠️ State feed publish failed: {e}")
+        if self._wal is not None and self._wal.size() > self.checkpoint_bytes:
+            self._checkpoint()
+
+    def _checkpoint(self) -> None:
+        """Make applied files durable, then empty the WAL"""
+        directories = set()
+        for path in self._dirty:
+            with open(path, "rb") as f:
+                os.fsync(f.fileno())
+            directories.add(os.path.dirname(path))
+        for directory in directories:
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self._dirty.clear()
+        if self._wal is not None:
+            self._wal.truncate()
+
+    def _reconstruct(self, key: Key, version: int) -> Optional[Dict[str, Any]]:
+        """Envelope of a stored version: nearest snapshot plus the deltas after it"""
+        records = self._records(key)
+        if not 1 <= version <= len(records):
+            return None
+        target = records[version - 1]
+        if target["kind"] == "delete":
+            return None
+        start = version - 1
+        while records[start]["kind"] != "snapshot":
+            start -= 1
+        data = copy.deepcopy(self._get_chunk(records[start]["chunk"]))
+        for record in records[start + 1:version]:
+            data = apply_patch(data, self._get_chunk(record["chunk"]))
+        return {"agent_id": key[0], "state_type": key[1], "timestamp": target["timestamp"],
+                "version": version, "data": data}
+
+    # Public API
+
+    def save(self, agent_id: str, state_type: str, data: Any,
+             expected_version: Optional[int] = None) -> Dict[str, Any]:
+        """Store a new version and return its envelope once it is durable
+
+        With `expected_version`, the save only succeeds if that is the current
+        version (0 for state that does not exist); otherwise VersionConflict.
+        """
+        key = (agent_id, state_type)
+        with self._lock:
+            current = self._latest(key)
+            current_version = current["version"] if current is not None else 0
+            if expected_version is not None and expected_version != current_version:
+                raise VersionConflict(
+                    f"{state_type} state of agent {agent_id} is at version "
+                    f"{current_version}, not {expected_version}"
+                )
+            records = self._records(key)
+            version = len(records) + 1
+            kind = "snapshot"
+            payload = data
+            if current is not None and (version - 1) % self.snapshot_every:
+                patch = diff(current["data"], data)
+                if len(json.dumps(patch)) < len(json.dumps(data)):
+                    kind, payload = "delta", patch
+            raw = self._encode_chunk(payload)
+            envelope = {"agent_id": agent_id, "state_type": state_type,
+                        "timestamp": timestamp(), "version": version,
+                        "data": copy.deepcopy(data)}
+            record = {"version": version, "timestamp": envelope["timestamp"], "kind": kind,
+                      "chunk": hashlib.sha256(raw).hexdigest(), "size": len(raw)}
+            records.append(record)
+            self.cache.put(key, envelope)
+            lsn = self._commit({"key": key, "record": record, "payload": json.loads(raw)})
+            result = copy.deepcopy(envelope)
+        self._wait(lsn)
+        return result
+
+    def _latest(self, key: Key) -> Optional[Dict[str, Any]]:
+        envelope = self.cache.get(key)
+        if envelope is None:
+            envelope = self._reconstruct(key, len(self._records(key)))
+            if envelope is not None:
+                self.cache.put(key, envelope)
+        return envelope
+
+    def load(self, agent_id: str, state_type: str) -> Optional[Dict[str, Any]]:
+        """Latest envelope ({agent_id, state_type, timestamp, version, data}) or None"""
+        with self._lock:
+            envelope = self._latest((agent_id, state_type))
+            return copy.deepcopy(envelope) if envelope is not None else None
+
+    def load_version(self, agent_id: str, state_type: str, version: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._reconstruct((agent_id, state_type), version)
+
+    def delete(self, agent_id: str, state_type: str = "all") -> int:
+        """Mark state deleted; history is kept so versions can still be restored"""
+        types = STATE_TYPES if state_type == "all" else (state_type,)
+        lsns = []
+        with self._lock:
+            for kind in types:
+                key = (agent_id, kind)
+                if self._latest(key) is None:
+                    continue
+                records = self._records(key)
+                # A tombstone breaks the delta chain, so the next save is a snapshot
+                record = {"version": len(records) + 1, "timestamp": timestamp(),
+                          "kind": "delete", "chunk": None, "size": 0}
+                records.append(record)
+                self.cache.pop(key)
+                lsns.append(self._commit({"key": key, "record": record, "payload": None}))
+        for lsn in lsns:
+            self._wait(lsn)
+        return len(lsns)
+
+    def history(self, agent_id: str, state_type: str) -> List[Dict[str, Any]]:
+        """Version records ({version, timestamp, kind, size}), oldest first"""
+        with self._lock:
+            return [{field: record[field] for field in ("version", "timestamp", "kind", "size")}
+                    for record in self._records((agent_id, state_type))]
+
+    def restore_version(self, agent_id: str, state_type: str, version: int) -> Dict[str, Any]:
+        """Save the content of an earlier version as the newest version"""
+        with self._lock:
+            envelope = self._reconstruct((agent_id, state_type), version)
+            if envelope is None:
+                raise ValueError(f"No version {version} of {state_type} state for agent {agent_id}")
+            current = self._latest((agent_id, state_type))
+        # Fails with VersionConflict if another save landed in between
+        return self.save(agent_id, state_type, envelope["data"],
+                         expected_version=current["version"] if current else 0)
+
+    def list_agents(self) -> List[str]:
+        return sorted(os.listdir(self._history_dir))
+
+    def stats(self) -> Dict[str, Any]:
+        objects = size = 0
+        for directory, _, files in os.walk(self._objects):
+            for name in files:
+                objects += 1
+                size += os.path.getsize(os.path.join(directory, name))
+        stats = {"cached": len(self.cache), "cache_hits": self.cache.hits,
+                 "cache_misses": self.cache.misses, "objects": objects, "object_bytes": size}
+        if self._wal is not None:
+            stats.update({f"wal_{name}": value for name, value in self._wal.stats.items()})
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._wal is not None:
+                self._checkpoint()
+                self._wal.close()
+            self._lock_file.close()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+
+"""
+Vectorized agent-task matching
+
+Implements the scoring model of docs/architecture/components/agent-task-matching.md
+over whole batches: tasks and agents are encoded as capability-level
+matrices, and the task x agent score matrix is computed with a few matrix
+products instead of a `calculateCapabilityMatch()` call per pair.
+
+    score = 0.5 capability + 0.3 availability + 0.2 performance + 0.1 affinity
+
+Capability is the average over required capabilities of
+min(agent level / required level, 1). With integer levels this equals
+sum_j [agent >= j] * [required >= j] / required, one product per level.
+Availability is exp(-2 * assigned / capacity) and drops as tasks are
+assigned. Affinity is 1 when a task shares a context key (component, parent
+issue, ...) with the agent's recent work. Tenant isolation is a hard mask:
+an agent with a tenant only takes that tenant's tasks.
+
+Assignments respect each agent's remaining capacity, using a greedy pass in
+priority order or an optimal assignment over capacity slots (`scipy`).
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agent_registry import LEVELS, Capabilities
+
+WEIGHTS = {"capability": 0.5, "availability": 0.3, "performance": 0.2, "affinity": 0.1}
+DEFAULT_CAPACITY = 3
+DEFAULT_PERFORMANCE = 0.5
+MAX_LEVEL = len(LEVELS)
+PRIORITY_RANKS = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+
+def capability_levels(capabilities: Optional[Capabilities]) -> Dict[str, int]:
+    """Capability term -> level (1 basic .. 3 expert; 1 when no level is given)"""
+    if not capabilities:
+        return {}
+    if not isinstance(capabilities, dict):
+        capabilities = {"functions": capabilities}
+    levels = {}
+    for domain in capabilities.get("domains", []):
+        if isinstance(domain, str):
+            domain = {"name": domain}
+        level = domain.get("level")
+        levels[domain["name"].lower()] = LEVELS.index(level) + 1 if level in LEVELS else 1
+    for function in capabilities.get("functions", []):
+        levels[str(function).lower()] = 1
+    for tool in capabilities.get("tools", []):
+        levels[f"tool:{str(tool).lower()}"] = 1
+    return levels
+
+
+def priority_rank(priority: Any) -> float:
+    """Sort rank of a task priority given as a name (low .. critical) or a number"""
+    if isinstance(priority, str) and priority.lower() in PRIORITY_RANKS:
+        return PRIORITY_RANKS[priority.lower()]
+    try:
+        return float(priority)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def task_key(task: Dict[str, Any]) -> str:
+    return str(task["number"] if "number" in task else task["id"])
+
+
+class MatchingEngine:
+    """Scores task batches against agents and assigns them under load caps"""
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, decay: float = 2.0,
+                 min_capability: float = 0.5, default_capacity: int = DEFAULT_CAPACITY):
+        self.weights = dict(WEIGHTS, **(weights or {}))
+        self.decay = decay
+        self.min_capability = min_capability
+        self.default_capacity = default_capacity
+
+    # Encoding
+
+    def capacity(self, agent: Dict[str, Any]) -> Tuple[int, float]:
+        """(max tasks, tasks already assigned); registry load (0-100) counts as used capacity"""
+        capacity = int(agent.get("max_capacity", self.default_capacity))
+        if "assigned" in agent:
+            assigned = agent["assigned"]
+            used = float(len(assigned) if isinstance(assigned, (list, tuple)) else assigned)
+        else:
+            used = capacity * float(agent.get("load", 0)) / 100
+        return capacity, used
+
+    def encode(self, tasks: Sequence[Dict[str, Any]], agents: Sequence[Dict[str, Any]]):
+        """Required and offered capability-level matrices over the tasks' vocabulary"""
+        task_levels = [capability_levels(task.get("requirements")) for task in tasks]
+        agent_levels = [capability_levels(agent.get("capabilities")) for agent in agents]
+        terms = {term: i for i, term in enumerate(sorted(
+            {term for levels in task_levels for term in levels}))}
+        required = np.zeros((len(tasks), len(terms)), dtype=np.float32)
+        for row, levels in enumerate(task_levels):
+            for term, level in levels.items():
+                required[row, terms[term]] = level
+        # Agent terms no task asks for cannot affect a score and are left out
+        offered = np.zeros((len(agents), len(terms)), dtype=np.float32)
+        for row, levels in enumerate(agent_levels):
+            for term, level in levels.items():
+                column = terms.get(term)
+                if column is not None:
+                    offered[row, column] = level
+        return required, offered
+
+    def _context_overlap(self, tasks, agents) -> np.ndarray:
+        keys: Dict[str, int] = {}
+        for task in tasks:
+            for key in task.get("affinity", []):
+                keys.setdefault(str(key), len(keys))
+        if not keys:
+            return np.zeros((len(tasks), len(agents)), dtype=np.float32)
+        task_keys = np.zeros((len(tasks), len(keys)), dtype=np.float32)
+        for row, task in enumerate(tasks):
+            task_keys[row, [keys[str(key)] for key in task.get("affinity", [])]] = 1
+        agent_keys = np.zeros((len(agents), len(keys)), dtype=np.float32)
+        for row, agent in enumerate(agents):
+            columns = [keys[str(key)] for key in agent.get("context", []) if str(key) in keys]
+            agent_keys[row, columns] = 1
+        return (task_keys @ agent_keys.T > 0).astype(np.float32)
+
+    def _tenant_mask(self, tasks, agents) -> np.ndarray:
+        tenants: Dict[Any, int] = {None: 0}
+        task_tenants = np.array([tenants.setdefault(task.get("tenant"), len(tenants))
+                                 for task in tasks])
+        agent_tenants = np.array([tenants.setdefault(agent.get("tenant"), len(tenants))
+                                  for agent in agents])
+        return (agent_tenants[None, :] == 0) | (agent_tenants[None, :] == task_tenants[:, None])
+
+    # Scoring
+
+    def capability_scores(self, required: np.ndarray, offered: np.ndarray) -> np.ndarray:
+        """Average of min(offered / required, 1) over each task's requirements"""
+        counts = (required > 0).sum(axis=1)
+        if not required.size:
+            return np.ones((len(required), len(offered)), dtype=np.float32)
+        inverse = np.divide(1.0, required, out=np.zeros_like(required), where=required > 0)
+        total = np.zeros((len(required), len(offered)), dtype=np.float32)
+        for level in range(1, MAX_LEVEL + 1):
+            total += (inverse * (required >= level)) @ (offered >= level).T.astype(np.float32)
+        scores = total / np.maximum(counts, 1)[:, None]
+        scores[counts == 0] = 1.0
+        return scores
+
+    def availability(self, used: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+        return np.exp(-self.decay * used / np.maximum(capacity, 1))
+
+    def score(self, tasks: Sequence[Dict[str, Any]], agents: Sequence[Dict[str, Any]]):
+        """Static part of the score matrix, availability inputs and the feasibility mask"""
+        required, offered = self.encode(tasks, agents)
+        capability = self.capability_scores(required, offered)
+        performance = np.array([agent.get("performance", DEFAULT_PERFORMANCE)
+                                for agent in agents], dtype=np.float32)
+        static = (self.weights["capability"] * capability
+                  + self.weights["performance"] * performance[None, :]
+                  + self.weights["affinity"] * self._context_overlap(tasks, agents))
+        feasible = (capability >= self.min_capability) & self._tenant_mask(tasks, agents)
+        limits = [self.capacity(agent) for agent in agents]
+        capacity = np.array([limit for limit, _ in limits], dtype=np.float32)
+        used = np.array([used for _, used in limits], dtype=np.float32)
+        return static, feasible, capacity, used
+
+    # Assignment
+
+    def assign(self, tasks: Sequence[Dict[str, Any]], agents: Sequence[Dict[str, Any]],
+               solver: str = "greedy") -> Dict[str, Any]:
+        """Assign tasks to agents; returns {"assignments": [...], "unassigned": [...]}"""
+        if not tasks or not agents:
+            return {"assignments": [], "unassigned": [task_key(task) for task in tasks]}
+        static, feasible, capacity, used = self.score(tasks, agents)
+        static = np.where(feasible, static, -np.inf)
+        if solver == "greedy":
+            pairs = self._greedy(tasks, static, capacity, used)
+        elif solver == "optimal":
+            pairs = self._optimal(static, capacity, used)
+        else:
+            raise ValueError(f"Unknown solver: {solver}")
+        assigned = set()
+        assignments = []
+        for task_row, agent_row, value in pairs:
+            assigned.add(task_row)
+            assignments.append({"task": task_key(tasks[task_row]),
+                                "agent": agents[agent_row]["name"],
+                                "score": round(float(value), 4)})
+        return {
+            "assignments": assignments,
+            "unassigned": [task_key(task) for row, task in enumerate(tasks) if row not in assigned],
+        }
+
+    def _greedy(self, tasks, static, capacity, used) -> List[Tuple[int, int, float]]:
+        """Tasks in priority order each take the best agent with a free slot"""
+        used = used.copy()
+        weight = self.weights["availability"]
+        # Availability term per agent, -inf once the agent has no free slot
+        bonus = np.where(np.floor(capacity - used) >= 1,
+                         weight * self.availability(used, capacity), -np.inf)
+        # Highest priority first; among equals, tasks with the strongest match
+        best = static.max(axis=1)
+        order = sorted(range(len(tasks)),
+                       key=lambda row: (-priority_rank(tasks[row].get("priority")), -best[row]))
+        pairs = []
+        for row in order:
+            totals = static[row] + bonus
+            agent = int(totals.argmax())
+            value = float(totals[agent])
+            if not math.isfinite(value):
+                continue
+            pairs.append((row, agent, value))
+            used[agent] += 1
+            if capacity[agent] - used[agent] >= 1:
+                bonus[agent] = weight * math.exp(-self.decay * used[agent] / max(capacity[agent], 1))
+            else:
+                bonus[agent] = -np.inf
+        return pairs
+
+    def _optimal(self, static, capacity, used) -> List[Tuple[int, int, float]]:
+        """Maximum total score, expanding each agent into one column per free slot"""
+        try:
+            from scipy.optimize import linear_sum_assignment
+        except ImportError:
+            raise ImportError(
+                "The optimal solver needs scipy. Install it with: pip install scipy"
+            ) from None
+        slots = np.maximum(np.floor(capacity - used), 0).astype(int)
+        columns = np.repeat(np.arange(len(slots)), slots)
+        if not len(columns):
+            return []
+        # Slot k of an agent carries the availability it has after k more tasks
+        offsets = np.concatenate([np.arange(count) for count in slots])
+        availability = self.availability(used[columns] + offsets, capacity[columns])
+        totals = static[:, columns] + self.weights["availability"] * availability[None, :]
+        # A large finite penalty keeps infeasible pairs out without breaking the solver
+        penalty = -1e6
+        rows, cols = linear_sum_assignment(np.where(np.isfinite(totals), totals, penalty),
+                                           maximize=True)
+        return [(int(row), int(columns[col]), float(totals[row, col]))
+                for row, col in zip(rows, cols) if np.isfinite(totals[row, col])]
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+
+"""
+In-memory priority task queue
+
+Python implementation of the Task Queue's Priority Calculator and dispatch
+order (docs/architecture/components/task-queue.md). The score of a task is
+the same as `calculate_priority_score()`:
+
+    base (priority:high 100, medium 50, low 10, none 30)
+    + age in whole hours, capped at 48
+    + 20 unless the body contains "depends on #"
+
+Instead of re-scoring the whole backlog on every pass, tasks sit in an
+indexed max-heap and their score is updated only when it changes: the static
+part when a task is enqueued or updated, and the age part once per hour of
+age through a min-heap of aging deadlines (tasks stop aging at 48 hours).
+Enqueue, dequeue, update and remove are O(log n).
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PRIORITY_BASE = {"high": 100, "medium": 50, "low": 10}
+DEFAULT_BASE = 30
+MAX_AGE_HOURS = 48
+INDEPENDENT_BONUS = 20
+HOUR = 3600
+
+
+def created_timestamp(task: Dict[str, Any]) -> float:
+    created = task.get("createdAt")
+    if isinstance(created, (int, float)):
+        return float(created)
+    if created:
+        return datetime.fromisoformat(created.replace("Z", "+00:00")).timestamp()
+    return time.time()
+
+
+def static_score(task: Dict[str, Any]) -> int:
+    """Priority label and dependency factors of a task"""
+    base = DEFAULT_BASE
+    for label in task.get("labels", []):
+        name = label if isinstance(label, str) else label.get("name", "")
+        if name.startswith("priority:"):
+            base = PRIORITY_BASE.get(name[len("priority:"):].strip().lower(), DEFAULT_BASE)
+            break
+    dependent = "depends on #" in (task.get("body") or "")
+    return base + (0 if dependent else INDEPENDENT_BONUS)
+
+
+def age_hours(created: float, now: float) -> int:
+    return min(max(int((now - created) // HOUR), 0), MAX_AGE_HOURS)
+
+
+class TaskQueue:
+    """Indexed max-heap of tasks ordered by priority score, oldest first on ties"""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._heap: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        # task ID -> (score, created timestamp, static score, age hours)
+        self._entries: Dict[str, Tuple[int, float, int, int]] = {}
+        # (deadline, sequence, task ID, age hours at scheduling); stale entries are skipped
+        self._aging: List[Tuple[float, int, str, int]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    # Heap primitives
+
+    def _key(self, task_id: str) -> Tuple[int, float]:
+        score, created, _, _ = self._entries[task_id]
+        return score, -created
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i]] = i
+        self._pos[heap[j]] = j
+
+    def _sift_up(self, i: int) -> None:
+        while i > 0:
+            parent = (i - 1) // 2
+            if self._key(self._heap[i]) <= self._key(self._heap[parent]):
+                return
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int) -> None:
+        size = len(self._heap)
+        while True:
+            best = i
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < size and self._key(self._heap[child]) > self._key(self._heap[best]):
+                    best = child
+            if best == i:
+                return
+            self._swap(i, best)
+            i = best
+
+    def _fix(self, task_id: str) -> None:
+        i = self._pos[task_id]
+        self._sift_up(i)
+        self._sift_down(self._pos[task_id])
+
+    def _pop_at(self, i: int) -> str:
+        last = len(self._heap) - 1
+        if i != last:
+            self._swap(i, last)
+        task_id = self._heap.pop()
+        del self._pos[task_id]
+        if i < len(self._heap):
+            self._fix(self._heap[i])
+        return task_id
+
+    # Aging
+
+    def _schedule_aging(self, task_id: str, created: float, hours: int) -> None:
+        if hours < MAX_AGE_HOURS:
+            deadline = created + (hours + 1) * HOUR
+            heapq.heappush(self._aging, (deadline, next(self._sequence), task_id, hours))
+
+    def _advance(self, now: float) -> None:
+        """Apply the age increments whose deadlines have passed"""
+        while self._aging and self._aging[0][0] <= now:
+            _, _, task_id, scheduled_hours = heapq.heappop(self._aging)
+            entry = self._entries.get(task_id)
+            if entry is None or entry[3] != scheduled_hours:
+                continue  # removed or re-enqueued since
+            _, created, static, _ = entry
+            hours = age_hours(created, now)
+            self._entries[task_id] = (static + hours, created, static, hours)
+            self._fix(task_id)
+            self._schedule_aging(task_id, created, hours)
+
+    # Public API
+
+    @staticmethod
+    def task_id(task: Dict[str, Any]) -> str:
+        return str(task["number"] if "number" in task else task["id"])
+
+    def enqueue(self, task: Dict[str, Any]) -> int:
+        """Add or replace a task; returns its current score"""
+        with self._lock:
+            now = self.clock()
+            self._advance(now)
+            task_id = self.task_id(task)
+            created = created_timestamp(task)
+            static = static_score(task)
+            hours = age_hours(created, now)
+            self._tasks[task_id] = task
+            self._entries[task_id] = (static + hours, created, static, hours)
+            if task_id in self._pos:
+                self._fix(task_id)
+            else:
+                self._heap.append(task_id)
+                self._pos[task_id] = len(self._heap) - 1
+                self._sift_up(len(self._heap) - 1)
+            self._schedule_aging(task_id, created, hours)
+            return static + hours
+
+    update = enqueue
+
+    def dequeue(self) -> Optional[Dict[str, Any]]:
+        """Remove and return the highest-priority task"""
+        with self._lock:
+            self._advance(self.clock())
+            if not self._heap:
+                return None
+            task_id = self._pop_at(0)
+            del self._entries[task_id]
+            return self._tasks.pop(task_id)
+
+    def peek(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._advance(self.clock())
+            return self._tasks[self._heap[0]] if self._heap else None
+
+    def get(self, task_id: Any) -> Optional[Dict[str, Any]]:
+        return self._tasks.get(str(task_id))
+
+    def remove(self, task_id: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            task_id = str(task_id)
+            if task_id not in self._pos:
+                return None
+            self._pop_at(self._pos[task_id])
+            del self._entries[task_id]
+            return self._tasks.pop(task_id)
+
+    def score(self, task_id: Any) -> Optional[int]:
+        with self._lock:
+            self._advance(self.clock())
+            entry = self._entries.get(str(task_id))
+            return entry[0] if entry else None
+
+    def ranked(self, limit: Optional[int] = None) -> List[Tuple[int, Dict[str, Any]]]:
+        """(score, task) in dispatch order, without removing anything"""
+        with self._lock:
+            self._advance(self.clock())
+            order = sorted(self._heap, key=self._key, reverse=True)[:limit]
+            return [(self._entries[task_id][0], self._tasks[task_id]) for task_id in order]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, task_id: Any) -> bool:
+        return str(task_id) in self._pos
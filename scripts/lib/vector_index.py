@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+"""
+Memory-mapped vector store with an IVF nearest-neighbor index
+
+Vectors are L2-normalized float32 rows of a memory-mapped matrix
+(`vectors.f32`), so cosine similarity is a dot product and the working set is
+paged in by the OS instead of loaded up front. The matrix grows by doubling.
+
+The IVF (inverted file) index clusters rows around k-means centroids. A query
+is compared with the centroids first and only scans the rows of the
+`nprobe` closest clusters, so a lookup touches a few thousand rows out of
+100k. Below `min_train` rows the store answers by exact search, which is
+faster at that size. New rows join their nearest cluster; the centroids are
+retrained once the store has doubled since the last training.
+"""
+
+import json
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k largest scores per row, best first"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+def kmeans(data: np.ndarray, clusters: int, iterations: int = 10,
+           seed: int = 0) -> np.ndarray:
+    """Spherical k-means centroids of normalized rows"""
+    rng = np.random.default_rng(seed)
+    centroids = data[rng.choice(len(data), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, data)
+        counts = np.bincount(assignment, minlength=clusters)
+        empty = counts == 0
+        # Reseed empty clusters from random rows
+        sums[empty] = data[rng.choice(len(data), int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class VectorIndex:
+    """Append-only vector matrix on disk with IVF search and row tombstones"""
+
+    def __init__(self, path: str, dim: int, nprobe: int = 8, min_train: int = 20_000):
+        self.path = path
+        self.dim = dim
+        self.nprobe = nprobe
+        self.min_train = min_train
+        os.makedirs(path, exist_ok=True)
+        self._meta_file = os.path.join(path, "vectors.json")
+        self._matrix_file = os.path.join(path, "vectors.f32")
+        self._centroids_file = os.path.join(path, "centroids.npy")
+        meta = {"dim": dim, "count": 0, "capacity": 0, "deleted": [], "trained_at": 0}
+        if os.path.exists(self._meta_file):
+            with open(self._meta_file) as f:
+                meta = json.load(f)
+            if meta["dim"] != dim:
+                raise ValueError(f"Index at {path} has dimension {meta['dim']}, not {dim}")
+        self.count = meta["count"]
+        self.capacity = meta["capacity"]
+        self.deleted = set(meta["deleted"])
+        self.trained_at = meta["trained_at"]
+        self._matrix: Optional[np.memmap] = None
+        if self.capacity:
+            self._matrix = np.memmap(self._matrix_file, dtype=np.float32, mode="r+",
+                                     shape=(self.capacity, dim))
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[np.ndarray] = []
+        if self.trained_at and os.path.exists(self._centroids_file):
+            self.centroids = np.load(self._centroids_file)
+            self._assign_lists()
+
+    @property
+    def vectors(self) -> np.ndarray:
+        if self._matrix is None:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return self._matrix[:self.count]
+
+    def _grow(self, needed: int) -> None:
+        if needed <= self.capacity:
+            return
+        capacity = max(1024, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix.flush()
+            del self._matrix
+        with open(self._matrix_file, "ab") as f:
+            f.truncate(capacity * self.dim * 4)
+        self._matrix = np.memmap(self._matrix_file, dtype=np.float32, mode="r+",
+                                 shape=(capacity, self.dim))
+        self.capacity = capacity
+
+    def add(self, vectors: np.ndarray) -> List[int]:
+        """Append vectors and return their row numbers"""
+        vectors = normalize_rows(vectors)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+        start = self.count
+        self._grow(start + len(vectors))
+        self._matrix[start:start + len(vectors)] = vectors
+        self.count += len(vectors)
+        if self.centroids is not None:
+            assignment = np.argmax(vectors @ self.centroids.T, axis=1)
+            for cluster in np.unique(assignment):
+                rows = start + np.flatnonzero(assignment == cluster)
+                self.lists[cluster] = np.concatenate([self.lists[cluster], rows])
+        if self.count >= self.min_train and self.count >= 2 * self.trained_at:
+            self.train()
+        return list(range(start, self.count))
+
+    def delete(self, rows: Sequence[int]) -> None:
+        """Tombstone rows; they are excluded from results"""
+        self.deleted.update(int(row) for row in rows)
+
+    def train(self, clusters: Optional[int] = None) -> None:
+        """(Re)cluster the current rows"""
+        live = self.vectors
+        if len(live) == 0:
+            return
+        clusters = clusters or max(1, min(int(np.sqrt(len(live))), len(live)))
+        # Centroids from a sample are as good and far cheaper to compute
+        sample = live
+        if len(live) > clusters * 64:
+            rng = np.random.default_rng(0)
+            sample = live[np.sort(rng.choice(len(live), clusters * 64, replace=False))]
+        self.centroids = kmeans(np.asarray(sample), clusters)
+        self.trained_at = self.count
+        with open(self._centroids_file, "wb") as f:
+            np.save(f, self.centroids)
+            f.flush()
+            os.fsync(f.fileno())
+        self._assign_lists()
+
+    def _assign_lists(self, chunk: int = 65_536) -> None:
+        clusters = len(self.centroids)
+        assignment = np.empty(self.count, dtype=np.int64)
+        for start in range(0, self.count, chunk):
+            block = self.vectors[start:start + chunk]
+            assignment[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        order = np.argsort(assignment, kind="stable")
+        bounds = np.searchsorted(assignment[order], np.arange(clusters + 1))
+        self.lists = [order[bounds[i]:bounds[i + 1]] for i in range(clusters)]
+
+    def search(self, queries: np.ndarray, k: int = 10,
+               nprobe: Optional[int] = None) -> List[List[Tuple[int, float]]]:
+        """Top-k (row, cosine similarity) for each query row"""
+        queries = normalize_rows(queries)
+        if self.count == 0:
+            return [[] for _ in range(len(queries))]
+        deleted = np.fromiter(self.deleted, dtype=np.int64) if self.deleted else None
+
+        if self.centroids is None:
+            scores = queries @ self.vectors.T
+            if deleted is not None:
+                scores[:, deleted[deleted < self.count]] = -np.inf
+            best = top_k(scores, k)
+            return [[(int(row), float(scores[i, row])) for row in best[i]
+                     if np.isfinite(scores[i, row])] for i in range(len(queries))]
+
+        # Score cluster by cluster: each probed list is read once and scored
+        # against every query that probes it in a single matrix product
+        probes = top_k(queries @ self.centroids.T, min(nprobe or self.nprobe, len(self.lists)))
+        candidates: List[List[Tuple[np.ndarray, np.ndarray]]] = [[] for _ in queries]
+        for cluster in np.unique(probes):
+            rows = self.lists[cluster]
+            if deleted is not None:
+                rows = rows[~np.isin(rows, deleted)]
+            if len(rows) == 0:
+                continue
+            members = np.flatnonzero((probes == cluster).any(axis=1))
+            block = queries[members] @ self.vectors[rows].T
+            for position, query in enumerate(members):
+                candidates[query].append((rows, block[position]))
+
+        results = []
+        for parts in candidates:
+            if not parts:
+                results.append([])
+                continue
+            rows = np.concatenate([rows for rows, _ in parts])
+            scores = np.concatenate([scores for _, scores in parts])
+            best = top_k(scores[None, :], k)[0]
+            results.append([(int(rows[j]), float(scores[j])) for j in best])
+        return results
+
+    def copy_rows(self, path: str, rows: Sequence[int], chunk: int = 65_536) -> "VectorIndex":
+        """Write the given rows to a new index at path, where row i is rows[i] here
+
+        The copy is clustered afresh and has no tombstones; it is how deleted
+        rows are reclaimed.
+        """
+        copy = VectorIndex(path, self.dim, self.nprobe, self.min_train)
+        rows = np.asarray(rows, dtype=np.int64)
+        for start in range(0, len(rows), chunk):
+            copy.add(self.vectors[rows[start:start + chunk]])
+        copy.save()
+        return copy
+
+    def save(self) -> None:
+        if self._matrix is not None:
+            self._matrix.flush()
+        temp = f"{self._meta_file}.tmp"
+        with open(temp, "w") as f:
+            json.dump({"dim": self.dim, "count": self.count, "capacity": self.capacity,
+                       "deleted": sorted(self.deleted), "trained_at": self.trained_at}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self._meta_file)
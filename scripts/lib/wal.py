@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""
+Write-ahead log with group commit
+
+Records are framed as length + CRC32 + JSON payload and appended to a single
+file. Concurrent writers are committed in groups: the first writer to find
+no flush in progress becomes the leader, writes every pending record with one
+`write()` and one `fsync()`, runs the commit callback for the batch, and
+wakes the others. While the leader is in `fsync()`, new records queue up for
+the next group, so N concurrent writers cost about one fsync per batch
+instead of N.
+
+`submit()` assigns a log sequence number (LSN) without blocking, so callers
+can enqueue under their own lock to fix the record order, then `wait()` for
+durability outside it. `replay()` yields the intact records of an existing
+log and drops a torn tail left by a crash.
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+HEADER = struct.Struct("<II")  # payload length, crc32
+
+CommitCallback = Callable[[List[Any]], None]
+
+
+class WALError(Exception):
+    """Raised when a record could not be made durable"""
+
+
+def encode(record: Any) -> bytes:
+    payload = json.dumps(record, separators=(",", ":")).encode()
+    return HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(path: str) -> Tuple[List[Any], int]:
+    """Intact records of a log file and the byte offset where they end"""
+    records = []
+    offset = 0
+    if not os.path.exists(path):
+        return records, offset
+    with open(path, "rb") as f:
+        data = f.read()
+    while offset + HEADER.size <= len(data):
+        length, crc = HEADER.unpack_from(data, offset)
+        start = offset + HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        records.append(json.loads(payload))
+        offset = start + length
+    return records, offset
+
+
+class WriteAheadLog:
+    """Append-only, fsync'd record log with leader-based group commit"""
+
+    def __init__(self, path: str, on_commit: Optional[CommitCallback] = None):
+        self.path = path
+        self.on_commit = on_commit
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[bytes, Any]] = []
+        self._next_lsn = 1
+        self._durable_lsn = 0
+        self._flushing = False
+        self._error: Optional[BaseException] = None
+        self.stats = {"records": 0, "batches": 0, "fsyncs": 0}
+        _, end = read_records(path)
+        self._file = open(path, "ab")
+        if self._file.tell() != end:
+            # Drop a torn tail so new records follow the last intact one
+            self._file.truncate(end)
+            self._file.seek(end)
+
+    def replay(self) -> Iterator[Any]:
+        """Records committed before this process started"""
+        records, _ = read_records(self.path)
+        return iter(records)
+
+    def submit(self, record: Any) -> int:
+        """Queue a record and return its LSN; call wait(lsn) for durability"""
+        data = encode(record)
+        with self._cond:
+            if self._error is not None:
+                raise WALError(f"Log {self.path} failed: {self._error}")
+            lsn = self._next_lsn
+            self._next_lsn += 1
+            self._pending.append((data, record))
+            return lsn
+
+    def wait(self, lsn: int) -> None:
+        """Block until the record with this LSN is durable"""
+        with self._cond:
+            while self._durable_lsn < lsn:
+                if self._error is not None:
+                    raise WALError(f"Log {self.path} failed: {self._error}")
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                self._flushing = True
+                batch, self._pending = self._pending, []
+                last = self._next_lsn - 1
+                self._cond.release()
+                try:
+                    self._flush(batch)
+                except BaseException as e:
+                    # Records may be half-written; refuse further writes
+                    self._cond.acquire()
+                    self._error = e
+                    self._flushing = False
+                    self._cond.notify_all()
+                    raise WALError(f"Log {self.path} failed: {e}") from e
+                self._cond.acquire()
+                self._durable_lsn = last
+                self._flushing = False
+                self._cond.notify_all()
+
+    def append(self, record: Any) -> int:
+        lsn = self.submit(record)
+        self.wait(lsn)
+        return lsn
+
+    def _flush(self, batch: List[Tuple[bytes, Any]]) -> None:
+        if not batch:
+            return
+        self._file.write(b"".join(data for data, _ in batch))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.stats["records"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["fsyncs"] += 1
+        if self.on_commit is not None:
+            self.on_commit([record for _, record in batch])
+
+    def size(self) -> int:
+        return self._file.tell()
+
+    def truncate(self) -> None:
+        """Discard all records; only call once they are applied durably elsewhere"""
+        self._file.truncate(0)
+        self._file.seek(0)
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
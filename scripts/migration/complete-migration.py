@@ -4,8 +4,13 @@ import subprocess
 import json
 import time
 import sys
+import os
 from typing import Dict, List, Optional, Tuple, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+from comment_migration import CommentMigrator
+from github_api import GraphQLError, GraphQLSession
+
 # Configuration
 OWNER = "o2alexanderfedin"
 REPO = "ai-assistant-project"
@@ -29,6 +34,7 @@ class GithubMigrator:
         self.project_items = None
         self.issues_cache = {}  # Cache for issue details
         self.item_id_cache = {}  # Cache for project item IDs
+        self.issues_with_comments = set()  # Issues for the comment stage
     
     def run_command(self, cmd: List[str], retry_count=3) -> Tuple[bool, str]:
         """Run a command and return if it succeeded and the output"""
@@ -317,13 +323,28 @@ class GithubMigrator:
             return False
     
     def migrate_issue_comments(self, issue_number: str, comments: List[Dict[str, Any]]) -> bool:
-        """Migrate comments from GitHub issue to project notes (if applicable)"""
+        """Queue an issue's comments for the comment migration stage"""
         if not comments:
             return True  # No comments to migrate
         
-        print(f"  ℹ️ Issue has {len(comments)} comments (these would need to be manually added as project notes)")
+        print(f"  Queued {len(comments)} comments for migration")
+        self.issues_with_comments.add(int(issue_number))
         return True
     
+    def run_comment_stage(self) -> None:
+        """Stream queued issues' comments into project draft issues"""
+        if not self.issues_with_comments:
+            return
+        
+        print(f"💬 Migrating comments for {len(self.issues_with_comments)} issues...")
+        try:
+            session = GraphQLSession()
+            stats = CommentMigrator(session, OWNER, REPO, PROJECT_ID).run(self.issues_with_comments)
+            session.close()
+            print(f"  ✅ Copied {stats['copied']} comments, skipped {stats['skipped']} already migrated")
+        except GraphQLError as e:
+            print(f"  ❌ Comment migration failed: {e}")
+    
     def process_issue(self, issue: Dict[str, Any]) -> None:
         """Process a single GitHub issue, ensuring it's in the project with all fields"""
         issue_number = str(issue.get("number"))
@@ -401,6 +422,8 @@ class GithubMigrator:
             self.process_issue(issue)
             print("")  # Add a blank line for readability
         
+        self.run_comment_stage()
+        
         print("🏁 Finished comprehensive migration of all issues!")
         print("All issues should now be in the project with correct types and parent relationships.")
 
@@ -5,8 +5,13 @@ import json
 import time
 import sys
 import re
+import os
 from typing import Dict, List, Optional, Tuple, Any
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+from comment_migration import CommentMigrator
+from github_api import GraphQLError, GraphQLSession
+
 # Configuration
 OWNER = "o2alexanderfedin"
 REPO = "ai-assistant-project"
@@ -277,29 +282,32 @@ def set_parent_relationship(parent_num: str, child_num: str) -> bool:
         print(f"  ℹ️ Relationship already exists or error occurred")
         return True  # Consider it a success if relationship already exists
 
+# Issues whose comments are copied by the comment stage after all issues are processed
+ISSUES_WITH_COMMENTS = set()
+
 def migrate_issue_comments(issue_number: str, comments: List[Dict[str, Any]]) -> bool:
-    """Migrate comments from GitHub issue to project notes (if applicable)"""
+    """Queue an issue's comments for the comment migration stage"""
     if not comments:
         return True  # No comments to migrate
     
-    print(f"  Migrating {len(comments)} comments for issue #{issue_number}...")
-    
-    # Project notes are not directly supported by the GitHub CLI
-    # Comments would need to be added as notes to the project item
-    # This is often done through the UI or using custom API calls
-    
-    # For now, we'll just log that we would migrate these comments
-    for i, comment in enumerate(comments):
-        author = comment.get("author", {}).get("login", "unknown")
-        body = comment.get("body", "")
-        created_at = comment.get("createdAt", "")
-        
-        print(f"  Comment {i+1} by {author} on {created_at}:")
-        print(f"  {body[:50]}..." if len(body) > 50 else f"  {body}")
-    
-    print(f"  ℹ️ Comment migration requires manual copying to project notes")
+    print(f"  Queued {len(comments)} comments for migration")
+    ISSUES_WITH_COMMENTS.add(int(issue_number))
     return True
 
+def run_comment_stage() -> None:
+    """Stream queued issues' comments into project draft issues"""
+    if not ISSUES_WITH_COMMENTS:
+        return
+    
+    print(f"💬 Migrating comments for {len(ISSUES_WITH_COMMENTS)} issues...")
+    try:
+        session = GraphQLSession()
+        stats = CommentMigrator(session, OWNER, REPO, PROJECT_ID).run(ISSUES_WITH_COMMENTS)
+        session.close()
+        print(f"  ✅ Copied {stats['copied']} comments, skipped {stats['skipped']} already migrated")
+    except GraphQLError as e:
+        print(f"  ❌ Comment migration failed: {e}")
+
 def process_issue(issue: Dict[str, Any], project_items: List[Dict[str, Any]], fields: Dict[str, Any]) -> None:
     """Process a single GitHub issue, ensuring it's in the project with all fields"""
     issue_number = str(issue.get("number"))
@@ -380,6 +388,8 @@ def main():
     for issue in github_issues:
         process_issue(issue, project_items, fields)
     
+    run_comment_stage()
+    
     print("🏁 Finished comprehensive migration of all issues!")
     print("All issues should now be in the project with correct types and parent relationships.")
 
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+
+"""
+GitHub Issue Comment Migration Script
+
+Copies issue comments into the GitHub Project as one draft issue per source
+issue. Comments are streamed page by page and written in batched mutations;
+already-copied comments are recognized by their content hash and skipped, so
+the script can be re-run safely.
+
+Usage:
+    python3 migrate-comments.py [--issue N ...] [--batch-size N]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from comment_migration import CommentMigrator  # noqa: E402
+from github_api import GraphQLError, GraphQLSession  # noqa: E402
+
+# Configuration
+OWNER = "o2alexanderfedin"
+REPO = "ai-assistant-project"
+PROJECT_ID = "PVT_kwHOBJ7Qkc4A5SDb"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub issue comment migration")
+    parser.add_argument("--issue", type=int, action="append",
+                        help="Only migrate comments of this issue (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=10,
+                        help="Mutations per GraphQL request")
+    args = parser.parse_args()
+
+    print("Starting comment migration...")
+    session = GraphQLSession()
+    migrator = CommentMigrator(session, OWNER, REPO, PROJECT_ID, args.batch_size)
+    try:
+        stats = migrator.run(set(args.issue) if args.issue else None)
+    except GraphQLError as e:
+        print(f"❌ Comment migration failed: {e}")
+        sys.exit(1)
+    finally:
+        session.close()
+
+    print("\n📊 Comment Migration Summary:")
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+"""
+Sharded Multi-Project Migration
+
+Runs the issue-to-project migration for many repository -> project pairs in
+parallel. Each pair (a shard) is processed by a worker from a process pool;
+shards that share a GitHub token draw from one shared rate budget, so adding
+workers never pushes a token past its API limit. Per-shard results are
+aggregated into a single report.
+
+Manifest format (JSON):
+    {
+      "defaults": {"token_env": "GH_TOKEN", "per_hour": 4500},
+      "shards": [
+        {"owner": "o2alexanderfedin", "repo": "ai-assistant-project",
+         "project_id": "PVT_kwHOBJ7Qkc4A5SDb",
+         "parents": {"1": ["59", "60"]}, "comments": true},
+        {"owner": "acme", "repo": "api", "project_id": "PVT_...",
+         "token_env": "ACME_TOKEN"}
+      ]
+    }
+
+Usage:
+    python3 sharded-migration.py MANIFEST [--workers N] [--report FILE]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from comment_migration import CommentMigrator  # noqa: E402
+from github_api import GraphQLSession  # noqa: E402
+from project_index import ProjectIndex  # noqa: E402
+from project_migration import fetch_repo_issues, migrate_project  # noqa: E402
+from rate_budget import RateBudget  # noqa: E402
+
+# Token budgets by environment variable name, set in each worker
+BUDGETS: Dict[str, RateBudget] = {}
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """Read a manifest and return its shards with defaults applied"""
+    with open(path) as f:
+        manifest = json.load(f)
+    defaults = {"token_env": "GH_TOKEN", "per_hour": 4500}
+    defaults.update(manifest.get("defaults", {}))
+
+    shards = []
+    for entry in manifest.get("shards", []):
+        shard = dict(defaults)
+        shard.update(entry)
+        missing = [k for k in ("owner", "repo", "project_id") if not shard.get(k)]
+        if missing:
+            raise ValueError(f"Shard {entry} is missing {', '.join(missing)}")
+        shard["name"] = f"{shard['owner']}/{shard['repo']}"
+        shards.append(shard)
+    return shards
+
+
+def init_worker(budgets: Dict[str, RateBudget]) -> None:
+    BUDGETS.update(budgets)
+
+
+def run_shard(shard: Dict[str, Any]) -> Dict[str, Any]:
+    """Migrate one repository into its project (runs in a worker process)"""
+    started = time.time()
+    result = {"shard": shard["name"], "project_id": shard["project_id"], "error": None}
+    session = None
+    try:
+        token = os.environ.get(shard["token_env"])
+        if not token:
+            raise RuntimeError(f"${shard['token_env']} is not set")
+        session = GraphQLSession(token, budget=BUDGETS.get(shard["token_env"]))
+        index = ProjectIndex(session, shard["owner"], shard["repo"], shard["project_id"])
+        index.load()
+        issues = fetch_repo_issues(session, shard["owner"], shard["repo"])
+        stats = migrate_project(index, issues, shard.get("limit"), shard.get("parents"))
+        if shard.get("comments"):
+            comment_stats = CommentMigrator(
+                session, shard["owner"], shard["repo"], shard["project_id"]
+            ).run()
+            stats["comments_copied"] = comment_stats["copied"]
+        result["stats"] = stats
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if session is not None:
+            session.close()
+    result["seconds"] = round(time.time() - started, 1)
+    return result
+
+
+def aggregate(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    totals: Dict[str, int] = {}
+    for result in results:
+        for key, value in result.get("stats", {}).items():
+            totals[key] = totals.get(key, 0) + value
+    return {
+        "shards": len(results),
+        "failed_shards": sum(1 for r in results if r["error"]),
+        "totals": totals,
+        "results": sorted(results, key=lambda r: r["shard"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sharded multi-project migration")
+    parser.add_argument("manifest", help="JSON manifest of repo -> project shards")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--report", help="Write the aggregated report to this file")
+    args = parser.parse_args()
+
+    shards = load_manifest(args.manifest)
+    print(f"Migrating {len(shards)} shards with {args.workers} workers...")
+
+    # One budget per token, shared by every shard that uses it
+    budgets = {}
+    for shard in shards:
+        budgets.setdefault(shard["token_env"], RateBudget(shard["per_hour"]))
+
+    results = []
+    with multiprocessing.Pool(args.workers, init_worker, (budgets,)) as pool:
+        for result in pool.imap_unordered(run_shard, shards):
+            if result["error"]:
+                print(f"  ❌ {result['shard']}: {result['error']} ({result['seconds']}s)")
+            else:
+                print(f"  ✅ {result['shard']} ({result['seconds']}s)")
+            results.append(result)
+
+    report = aggregate(results)
+    print("\n📊 Migration Report:")
+    print(f"  Shards: {report['shards']} ({report['failed_shards']} failed)")
+    for key, value in sorted(report["totals"].items()):
+        print(f"  {key}: {value}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.report}")
+
+    if report["failed_shards"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -16,9 +16,18 @@ Usage:
     --limit N: Process only the first N issues (useful for testing)
 """
 
-import subprocess
 import json
 import argparse
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from field_rules import default_rules, label_names  # noqa: E402
+from github_api import (  # noqa: E402
+    run_command, cached_command, cached_graphql, graphql_command, invalidate
+)
 
 
 # Configuration
@@ -27,27 +36,33 @@ REPO = "ai-assistant-project"
 PROJECT_NUM = "2"
 PROJECT_ID = "PVT_kwHOBJ7Qkc4A5SDb"  # Project ID for GraphQL queries
 
-# Parent-child relationships mapping
-PARENT_RELATIONSHIPS = {
-    "1": ["66", "65", "64", "63", "62", "61", "60", "59"],
-    "2": ["17", "18", "19", "20", "21", "22", "23", "24"],
-    "3": ["54", "55", "56", "57", "58"],
-    "4": ["25", "26", "27", "28", "29", "30", "31", "32"],
-    "5": ["33", "34", "35", "36", "37", "38", "39", "40"],
-    "6": ["41", "42", "43", "44", "45", "46", "47"],
-    "7": ["48", "49", "50", "51", "52", "53"]
-}
+# Parent epic -> child stories, as declared in fields/field-rules.json
+PARENT_RELATIONSHIPS = default_rules().children(f"{OWNER}/{REPO}")
 
 
-def run_command(cmd):
-    """Run a shell command and return the output"""
-    try:
-        result = subprocess.run(
-            cmd, check=True, capture_output=True, text=True
-        )
-        return True, result.stdout
-    except subprocess.CalledProcessError as e:
-        return False, f"Error: {e.stderr}"
+# Query listing project items; shared by every title lookup
+PROJECT_ITEMS_QUERY = """
+query($projectId:ID!) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: 100) {
+        nodes {
+          id
+          content {
+            ... on Issue {
+              title
+              number
+              repository {
+                name
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
 
 
 def get_issue_ids():
@@ -71,7 +86,8 @@ def get_issue_ids():
 def get_issue_details(issue_id):
     """Get all details for a specific issue"""
     print(f"Getting details for issue #{issue_id}...")
-    success, output = run_command([
+    # Epics are looked up once per child; duplicate reads share one call
+    success, output = cached_command([
         "gh", "issue", "view", str(issue_id),
         "--repo", f"{OWNER}/{REPO}",
         "--json", ("number,title,body,labels,assignees,milestone,"
@@ -89,35 +105,9 @@ def find_issue_in_project(issue_title):
     """Find an issue in the project by its title"""
     print(f"  Searching for issue in project by title: '{issue_title}'")
 
-    # Query to find a project item by title
-    query = """
-    query($projectId:ID!) {
-      node(id: $projectId) {
-        ... on ProjectV2 {
-          items(first: 100) {
-            nodes {
-              id
-              content {
-                ... on Issue {
-                  title
-                  number
-                  repository {
-                    name
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-    }
-    """
-
-    success, output = run_command([
-        "gh", "api", "graphql",
-        "-f", f"query={query}",
-        "-f", f"projectId={PROJECT_ID}"
-    ])
+    success, output = cached_graphql(
+        PROJECT_ITEMS_QUERY, {"projectId": PROJECT_ID}
+    )
 
     if success:
         data = json.loads(output)
@@ -293,6 +283,10 @@ def add_issue_to_project(issue):
 
     if success:
         print("  ✓ Issue added to project")
+        # The cached item list no longer includes the new item
+        invalidate(graphql_command(
+            PROJECT_ITEMS_QUERY, {"projectId": PROJECT_ID}
+        ))
 
         # Find the newly created project item
         project_issue = find_issue_in_project(issue_title)
@@ -314,12 +308,14 @@ def update_issue_in_project(issue, project_issue, field_info):
         print("  ✗ Failed to get field information")
         return False
 
-    # Get issue labels and extract needed information
-    labels = issue.get("labels", [])
+    # Field values from the compiled label rules (see fields/field-rules.json)
+    values = default_rules().values_for(
+        label_names(issue.get("labels", [])), issue_id, f"{OWNER}/{REPO}"
+    )
 
     # 1. Set issue type based on labels
-    is_epic = any(label.get("name") == "epic" for label in labels)
-    type_name = "Epic" if is_epic else "User Story"
+    type_name = values["Type"]
+    is_epic = type_name == "Epic"
 
     # Check if field_info has the required option IDs
     if is_epic and "epic_option_id" not in field_info:
@@ -388,14 +384,7 @@ def update_issue_in_project(issue, project_issue, field_info):
     has_component = ("component_field_id" in field_info and
                      "component_options" in field_info)
     if has_component:
-        # Find the component label if present
-        component_label = None
-        for label in labels:
-            name = label.get("name", "")
-            if name.startswith("component:"):
-                component_name = name.replace("component:", "").strip()
-                component_label = component_name
-                break
+        component_label = values.get("Component")
 
         if (component_label and
                 component_label in field_info["component_options"]):
@@ -418,21 +407,9 @@ def update_issue_in_project(issue, project_issue, field_info):
 
     # 3. Set Priority if available
     if "priority_field_id" in field_info and "priority_options" in field_info:
-        # Find the priority label if present
-        priority_label = None
-        for label in labels:
-            name = label.get("name", "")
-            if name.startswith("priority:"):
-                priority_name = name.replace("priority:", "").strip()
-                # Capitalize first letter
-                priority_label = priority_name.title()
-                break
-
-        # Default to Medium if no priority is found
-        if not priority_label:
-            priority_label = "Medium"
-
-        if priority_label in field_info["priority_options"]:
+        priority_label = values.get("Priority")
+
+        if priority_label and priority_label in field_info["priority_options"]:
             priority_id = field_info["priority_options"][priority_label]
             print(f"  Setting priority to '{priority_label}'...")
 
@@ -453,16 +430,10 @@ def update_issue_in_project(issue, project_issue, field_info):
     # 4. Set Story Points if available - temporarily disabled due to API limitations
     if "story_points_field_id" in field_info:
         # Just detect if there are story points defined
-        for label in labels:
-            if label.get("name", "").startswith("points:"):
-                points_str = label.get("name").replace("points:", "").strip()
-                try:
-                    points = int(points_str)
-                    print(f"  ℹ️ Story points ({points}) detected, but setting via API is disabled")
-                    print(f"     This will need to be set manually in the project")
-                    break
-                except ValueError:
-                    print(f"  ⚠️ Invalid story points value: {points_str}")
+        points = values.get("Story Points")
+        if points is not None:
+            print(f"  ℹ️ Story points ({points}) detected, but setting via API is disabled")
+            print(f"     This will need to be set manually in the project")
 
     # 5. Set parent relationship if applicable
     for parent_id, children in PARENT_RELATIONSHIPS.items():
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+
+"""
+Agent Registry
+
+Command-line front end and RPC service for the in-memory agent registry
+(`scripts/lib/agent_registry.py`), with the commands of `agent_registry.sh`
+in docs/architecture/components/agent-registry.md. `serve` keeps the
+registry resident so lookups are answered from the capability index; the
+other commands open the registry directory directly and must not be used
+while a server owns it.
+
+Usage:
+    python3 agent-registry.py register NAME TYPE CAPABILITIES_JSON [ENDPOINT]
+    python3 agent-registry.py update NAME STATUS LOAD
+    python3 agent-registry.py deregister NAME
+    python3 agent-registry.py find CAPABILITIES_JSON [MAX_LOAD] [--limit N]
+    python3 agent-registry.py list [--status STATUS]
+    python3 agent-registry.py check-stale [--timeout SECONDS]
+    python3 agent-registry.py match TASKS_JSON [--solver greedy|optimal]
+    python3 agent-registry.py serve [--socket PATH] [--timeout SECONDS]
+
+In `serve` mode agents send `heartbeat` RPCs; a heartbeat tracker marks
+agents unavailable once per second as their deadlines pass, and marks them
+available again when they resume. Agents an operator marked unavailable stay
+that way. Heartbeats are not logged one by one: their times are written to the
+registry when it compacts and on shutdown, and on startup every agent gets a
+full timeout to check in.
+
+`match` assigns a batch of tasks ({number, requirements, priority, tenant,
+affinity}) to the available agents with `task_matching.MatchingEngine`
+(needs numpy; the optimal solver also needs scipy).
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from agent_registry import AgentRegistry, parse_timestamp, timestamp  # noqa: E402
+from heartbeat import DEFAULT_TIMEOUT, RECOVERED, STALE, HeartbeatTracker  # noqa: E402
+from rpc import RPCServer  # noqa: E402
+
+# Configuration
+REGISTRY_DIR = os.path.join(os.getcwd(), "registry")
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "agent-registry.sock"
+)
+
+
+def tracked(registry: AgentRegistry, timeout: float, grace: bool = False) -> HeartbeatTracker:
+    """Heartbeat tracker seeded from last_seen, or from now with `grace`
+
+    Agents that expired stay stale until their next heartbeat; agents an
+    operator marked unavailable are not tracked.
+    """
+    tracker = HeartbeatTracker(timeout)
+    now = tracker.clock()
+    for agent in registry.list():
+        last_seen = parse_timestamp(agent["last_seen"])
+        if agent.get("status") != STALE:
+            tracker.track(agent["name"], max(last_seen, now) if grace else last_seen)
+        elif agent.get("expired"):
+            tracker.restore(agent["name"], last_seen)
+    return tracker
+
+
+def match_tasks(registry: AgentRegistry, tasks, solver="greedy"):
+    # Imported here so the registry itself does not require numpy
+    from task_matching import MatchingEngine
+    return MatchingEngine().assign(tasks, registry.list(status="available"), solver)
+
+
+class RegistryService:
+    """RPC methods over a resident AgentRegistry with heartbeat expiry"""
+
+    def __init__(self, registry: AgentRegistry, tracker: HeartbeatTracker):
+        self.registry = registry
+        self.tracker = tracker
+        tracker.subscribe(self.on_status_change)
+        registry.heartbeats = tracker.seen
+
+    def methods(self):
+        return {
+            "register": self.register,
+            "heartbeat": self.heartbeat,
+            "update": self.update,
+            "deregister": self.deregister,
+            "get": self.registry.get,
+            "find": self.registry.find,
+            "list": self.registry.list,
+            "capabilities": self.registry.capabilities,
+            "events": self.tracker.events,
+            "match": self.match,
+        }
+
+    def register(self, name, agent_type, capabilities, endpoint=""):
+        agent = self.registry.register(name, agent_type, capabilities, endpoint)
+        self.tracker.beat(name)
+        return agent
+
+    def update(self, name, status=None, load=None, **fields):
+        """Operator status change; an agent set unavailable is no longer tracked"""
+        if status is not None:
+            fields["expired"] = False
+        agent = self.registry.update(name, status=status, load=load, **fields)
+        if status == STALE:
+            self.tracker.forget(name)
+        elif status is not None and name not in self.tracker.seen():
+            self.tracker.beat(name)
+        return agent
+
+    def heartbeat(self, name, load=None, status=None):
+        """Refresh an agent's deadline; the registry is written only when something changed"""
+        agent = self.registry.get(name)
+        if agent is None:
+            raise ValueError(f"Agent not registered: {name}")
+        if agent.get("status") != STALE or agent.get("expired"):
+            # An expired agent is marked available again by on_status_change;
+            # one an operator marked unavailable is left alone
+            self.tracker.beat(name)
+        if (load is not None and load != agent.get("load")) or (
+                status is not None and status != agent.get("status")):
+            self.registry.update(name, status=status, load=load)
+        return True
+
+    def match(self, tasks, solver="greedy"):
+        """Assign a batch of tasks to available agents under their load caps"""
+        return match_tasks(self.registry, tasks, solver)
+
+    def deregister(self, name):
+        self.tracker.forget(name)
+        return self.registry.deregister(name)
+
+    def on_status_change(self, event):
+        name = event["agent"]
+        if name not in self.registry:
+            return
+        if event["status"] == STALE:
+            last_seen = timestamp(self.tracker.last_seen.get(name))
+            self.registry.update(name, status=STALE, last_seen=last_seen, expired=True)
+            print(f"⚠️ Agent {name} missed heartbeats since {last_seen}, marked unavailable")
+        elif event["status"] == RECOVERED and self.registry.get(name)["status"] == STALE:
+            self.registry.update(name, status=RECOVERED, expired=False)
+            print(f"✓ Agent {name} is back")
+
+
+def serve(registry: AgentRegistry, socket_path: str, timeout: float) -> None:
+    # Heartbeats since the last compaction were not persisted, so give every
+    # agent a full timeout from startup
+    service = RegistryService(registry, tracked(registry, timeout, grace=True))
+    server = RPCServer(socket_path)
+    for name, fn in service.methods().items():
+        server.register(name, fn)
+
+    stop = threading.Event()
+    service.tracker.run(1.0, stop)
+
+    def shutdown(signum, frame):
+        stop.set()
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"✓ Loaded {len(registry)} agents")
+    print(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        registry.compact()
+        registry.close()
+        print("Registry stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent registry")
+    parser.add_argument("--dir", default=REGISTRY_DIR, help="Registry directory")
+    parser.add_argument("--fsync", action="store_true", help="fsync every log write")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("register", help="Register an agent")
+    p.add_argument("name")
+    p.add_argument("type")
+    p.add_argument("capabilities", help="JSON list or capability object")
+    p.add_argument("endpoint", nargs="?", default="")
+
+    p = sub.add_parser("update", help="Update an agent's status and load")
+    p.add_argument("name")
+    p.add_argument("status")
+    p.add_argument("load", type=float)
+
+    p = sub.add_parser("deregister", help="Remove an agent")
+    p.add_argument("name")
+
+    p = sub.add_parser("find", help="Find available agents for a capability requirement")
+    p.add_argument("capabilities", help="JSON list or capability object")
+    p.add_argument("max_load", nargs="?", type=float, default=100)
+    p.add_argument("--limit", type=int)
+
+    p = sub.add_parser("list", help="List agents")
+    p.add_argument("--status")
+
+    p = sub.add_parser("check-stale", help="Mark agents not seen within the timeout unavailable")
+    p.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds")
+
+    p = sub.add_parser("match", help="Assign a JSON list of tasks to available agents")
+    p.add_argument("tasks", help="Path to a JSON file with a list of tasks")
+    p.add_argument("--solver", choices=["greedy", "optimal"], default="greedy")
+
+    p = sub.add_parser("serve", help="Serve the registry over a Unix socket")
+    p.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    p.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                   help="Seconds without a heartbeat before an agent is unavailable")
+
+    args = parser.parse_args()
+    registry = AgentRegistry(args.dir, fsync=args.fsync)
+
+    if args.command == "serve":
+        serve(registry, args.socket, args.timeout)
+        return
+
+    try:
+        if args.command == "register":
+            registry.register(args.name, args.type, json.loads(args.capabilities), args.endpoint)
+            print(f"✓ Agent {args.name} registered")
+        elif args.command == "update":
+            registry.update(args.name, status=args.status, load=args.load, expired=False)
+            print(f"✓ Agent {args.name} status updated to {args.status} with load {args.load:g}")
+        elif args.command == "deregister":
+            if not registry.deregister(args.name):
+                print(f"✗ Agent {args.name} is not registered")
+                sys.exit(1)
+            print(f"✓ Agent {args.name} deregistered")
+        elif args.command == "find":
+            for agent in registry.find(json.loads(args.capabilities), args.max_load, args.limit):
+                print(json.dumps(agent))
+        elif args.command == "list":
+            print(json.dumps(registry.list(args.status), indent=2))
+        elif args.command == "check-stale":
+            service = RegistryService(registry, tracked(registry, args.timeout))
+            stale = service.tracker.expire()
+            print(f"Found {len(stale)} stale agents, marked as unavailable")
+        elif args.command == "match":
+            with open(args.tasks) as f:
+                print(json.dumps(match_tasks(registry, json.load(f), args.solver), indent=2))
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+    finally:
+        registry.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+
+"""
+Agent State Store
+
+Command-line front end for the versioned agent state store
+(`scripts/lib/state_store.py`), with the commands of `agent_state_store.sh`
+in docs/architecture/components/agent-state-store.md. Versions are numbered
+per agent and state type, and history is kept as compressed deltas rather
+than git commits of full files.
+
+Usage:
+    python3 agent-state-store.py [--dir DIR] [--socket PATH] COMMAND ...
+    python3 agent-state-store.py save AGENT_ID STATE_TYPE STATE_JSON|@FILE [--expected-version N]
+    python3 agent-state-store.py load AGENT_ID STATE_TYPE
+    python3 agent-state-store.py delete AGENT_ID STATE_TYPE|all
+    python3 agent-state-store.py list
+    python3 agent-state-store.py history AGENT_ID STATE_TYPE
+    python3 agent-state-store.py restore AGENT_ID STATE_TYPE VERSION
+    python3 agent-state-store.py stats
+    python3 agent-state-store.py serve [--socket PATH]
+    python3 agent-state-store.py watch [AGENT_PREFIX] [--type TYPE] [--after SEQ --epoch EPOCH]
+
+`serve` keeps the store resident behind a Unix socket speaking the line-JSON
+protocol of `scripts/lib/rpc.py`, plus a `subscribe` method that turns the
+connection into a stream of coalesced state change events. `watch` prints
+that stream. Only one process can open the store directory; while `serve`
+has it open, the other commands are sent to the server's socket.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from rpc import RPCClient, RPCError, SocketInUse, claim_socket  # noqa: E402
+from state_feed import StateFeed  # noqa: E402
+from state_store import STATE_TYPES, StateStore, StoreLocked, VersionConflict  # noqa: E402
+
+# Configuration
+STATE_DIR = os.path.join(os.getcwd(), "state")
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "agent-state-store.sock"
+)
+
+
+def read_state(value: str):
+    if value.startswith("@"):
+        with open(value[1:]) as f:
+            return json.load(f)
+    return json.loads(value)
+
+
+def store_methods(store: StateStore):
+    return {
+        "save": store.save,
+        "load": store.load,
+        "load_version": store.load_version,
+        "delete": store.delete,
+        "history": store.history,
+        "restore": store.restore_version,
+        "list": store.list_agents,
+        "stats": lambda: dict(store.stats(), feed=store.feed.stats()),
+    }
+
+
+class RemoteStore:
+    """The StateStore methods used by `run()`, called on a running server"""
+
+    # Server-side exceptions re-raised with their own type
+    ERRORS = {"VersionConflict": VersionConflict, "ValueError": ValueError}
+
+    def __init__(self, client: RPCClient):
+        self.client = client
+
+    def _call(self, method: str, **params):
+        try:
+            return self.client.call(method, **params)
+        except RPCError as e:
+            name, _, message = str(e).partition(": ")
+            if name in self.ERRORS:
+                raise self.ERRORS[name](message) from None
+            raise
+
+    def save(self, agent_id, state_type, data, expected_version=None):
+        return self._call("save", agent_id=agent_id, state_type=state_type, data=data,
+                          expected_version=expected_version)
+
+    def load(self, agent_id, state_type):
+        return self._call("load", agent_id=agent_id, state_type=state_type)
+
+    def delete(self, agent_id, state_type="all"):
+        return self._call("delete", agent_id=agent_id, state_type=state_type)
+
+    def list_agents(self):
+        return self._call("list")
+
+    def history(self, agent_id, state_type):
+        return self._call("history", agent_id=agent_id, state_type=state_type)
+
+    def restore_version(self, agent_id, state_type, version):
+        return self._call("restore", agent_id=agent_id, state_type=state_type, version=version)
+
+    def stats(self):
+        return self._call("stats")
+
+
+async def stream_events(feed: StateFeed, params, reader, writer) -> None:
+    """Send coalesced event batches until the client disconnects"""
+    subscription = feed.subscribe(params.get("agent_prefix", ""), params.get("state_types"),
+                                  params.get("after"), params.get("epoch"))
+    # The client sends nothing more; EOF means it went away
+    disconnected = asyncio.ensure_future(reader.read())
+    try:
+        writer.write(json.dumps({"result": {"epoch": feed.epoch, "seq": feed.seq}}).encode() + b"\n")
+        await writer.drain()
+        while True:
+            batch = asyncio.ensure_future(anext(subscription))
+            await asyncio.wait([batch, disconnected], return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                batch.cancel()
+                return
+            writer.write(json.dumps({"epoch": feed.epoch, "events": batch.result()}).encode() + b"\n")
+            await writer.drain()
+    except (ConnectionError, StopAsyncIteration):
+        pass
+    finally:
+        disconnected.cancel()
+        subscription.close()
+
+
+async def serve(store: StateStore, socket_path: str) -> None:
+    methods = store_methods(store)
+    clients = set()
+
+    async def handle(reader, writer):
+        clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    params = request.get("params", {})
+                    if request.get("method") == "subscribe":
+                        await stream_events(store.feed, params, reader, writer)
+                        break
+                    method = methods.get(request.get("method"))
+                    if method is None:
+                        raise RPCError(f"Unknown method: {request.get('method')}")
+                    # Store calls block on the WAL; threads let concurrent saves share a commit
+                    response = {"result": await asyncio.to_thread(method, **params)}
+                except Exception as e:
+                    response = {"error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response, default=str).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            clients.discard(writer)
+            writer.close()
+
+    claim_socket(socket_path)
+    server = await asyncio.start_unix_server(handle, socket_path)
+    os.chmod(socket_path, 0o600)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"Listening on {socket_path}")
+    try:
+        async with server:
+            await stop.wait()
+            # Closing the transports ends subscriber streams as if the clients left
+            for writer in list(clients):
+                writer.close()
+            await asyncio.sleep(0)
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def watch(args) -> None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(args.socket)
+    params = {"agent_prefix": args.agent_prefix, "state_types": args.type,
+              "after": args.after, "epoch": args.epoch}
+    sock.sendall(json.dumps({"method": "subscribe", "params": params}).encode() + b"\n")
+    lines = sock.makefile("rb")
+    ack = json.loads(lines.readline())
+    if "error" in ack:
+        print(f"✗ {ack['error']}")
+        sys.exit(1)
+    print(f"Watching from seq {ack['result']['seq']} (epoch {ack['result']['epoch']})")
+    last = args.after
+    try:
+        for line in lines:
+            message = json.loads(line)
+            for event in message["events"]:
+                if event["kind"] == "reset":
+                    print("⚠️ Resume point lost; reload tracked state")
+                else:
+                    print(f"{event['seq']:>8}  {event['timestamp']}  {event['agent_id']}/"
+                          f"{event['state_type']}  v{event['version']}  {event['kind']}")
+                last = event["seq"]
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+        if last is not None:
+            print(f"Resume with: --after {last} --epoch {ack['result']['epoch']}")
+
+
+def run(store: StateStore, args) -> None:
+    if args.command == "save":
+        try:
+            envelope = store.save(args.agent_id, args.state_type, read_state(args.state),
+                                  expected_version=args.expected_version)
+        except VersionConflict as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        print(f"✓ State saved for agent {args.agent_id} ({args.state_type}), version {envelope['version']}")
+    elif args.command == "load":
+        envelope = store.load(args.agent_id, args.state_type)
+        if envelope is None:
+            print(f"✗ State not found for agent {args.agent_id} ({args.state_type})")
+            sys.exit(1)
+        print(json.dumps(envelope, indent=2))
+    elif args.command == "delete":
+        count = store.delete(args.agent_id, args.state_type)
+        print(f"✓ Deleted {count} state type(s) for agent {args.agent_id}")
+    elif args.command == "list":
+        for agent_id in store.list_agents():
+            print(agent_id)
+    elif args.command == "history":
+        history = store.history(args.agent_id, args.state_type)
+        if not history:
+            print(f"No history found for agent {args.agent_id} ({args.state_type})")
+            sys.exit(1)
+        for record in history:
+            print(f"{record['version']:>5}  {record['timestamp']}  {record['kind']:<8}  {record['size']} bytes")
+    elif args.command == "restore":
+        try:
+            envelope = store.restore_version(args.agent_id, args.state_type, args.version)
+        except (ValueError, VersionConflict) as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        print(f"✓ State restored for agent {args.agent_id} ({args.state_type}) "
+              f"to version {args.version} as version {envelope['version']}")
+    elif args.command == "stats":
+        print(json.dumps(store.stats(), indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent state store")
+    parser.add_argument("--dir", default=STATE_DIR, help="State store directory")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                        help="Server socket (used when a server has the directory open)")
+    parser.add_argument("--snapshot-every", type=int, default=20,
+                        help="Store a full snapshot every N versions")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("save", help="Save a new state version")
+    p.add_argument("agent_id")
+    p.add_argument("state_type", choices=STATE_TYPES)
+    p.add_argument("state", help="JSON text, or @FILE")
+    p.add_argument("--expected-version", type=int,
+                   help="Only save if this is the current version (0: state must not exist)")
+
+    p = sub.add_parser("load", help="Print the latest state")
+    p.add_argument("agent_id")
+    p.add_argument("state_type", choices=STATE_TYPES)
+
+    p = sub.add_parser("delete", help="Delete state (history is kept)")
+    p.add_argument("agent_id")
+    p.add_argument("state_type", choices=STATE_TYPES + ("all",))
+
+    sub.add_parser("list", help="List agents with stored state")
+
+    p = sub.add_parser("history", help="List state versions")
+    p.add_argument("agent_id")
+    p.add_argument("state_type", choices=STATE_TYPES)
+
+    p = sub.add_parser("restore", help="Make an earlier version the latest")
+    p.add_argument("agent_id")
+    p.add_argument("state_type", choices=STATE_TYPES)
+    p.add_argument("version", type=int)
+
+    sub.add_parser("stats", help="Show cache and storage statistics")
+
+    p = sub.add_parser("serve", help="Serve the store and its change feed over a Unix socket")
+    p.add_argument("--socket", default=argparse.SUPPRESS, help="Unix socket path")
+
+    p = sub.add_parser("watch", help="Print state change events from a running server")
+    p.add_argument("agent_prefix", nargs="?", default="", help="Agent ID prefix")
+    p.add_argument("--type", action="append", choices=STATE_TYPES, help="State type (repeatable)")
+    p.add_argument("--after", type=int, help="Resume after this sequence number")
+    p.add_argument("--epoch", help="Epoch the sequence number belongs to")
+    p.add_argument("--socket", default=argparse.SUPPRESS, help="Unix socket path")
+
+    args = parser.parse_args()
+    if args.command == "watch":
+        watch(args)
+        return
+    if args.command == "serve":
+        try:
+            claim_socket(args.socket)
+        except SocketInUse as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+
+    try:
+        store = StateStore(args.dir, snapshot_every=args.snapshot_every, feed=StateFeed())
+    except StoreLocked as e:
+        if args.command == "serve":
+            print(f"✗ {e}")
+            sys.exit(1)
+        # A server owns the directory; send the command to it
+        try:
+            with RPCClient(args.socket) as client:
+                run(RemoteStore(client), args)
+        except (OSError, RPCError) as error:
+            print(f"✗ {e}; server at {args.socket} unavailable: {error}")
+            sys.exit(1)
+        return
+    try:
+        if args.command == "serve":
+            asyncio.run(serve(store, args.socket))
+        else:
+            run(store, args)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+        if args.command == "serve":
+            print("State store stopped")
+
+
+if __name__ == "__main__":
+    main()
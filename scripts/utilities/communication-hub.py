@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+
+"""
+Communication Hub
+
+Runs the message broker of docs/architecture/components/communication-hub.md
+(`scripts/lib/message_hub.py`) on a Unix socket, and sends or receives
+messages through it. Agents stay connected and receive batches of messages
+in priority order instead of one HTTP request per message. Messages are kept
+in a segmented log (`scripts/lib/message_log.py`) under `./messages`.
+
+Throughput and delivery latency are tracked in process (`scripts/lib/metrics.py`)
+and written to `./logs/hub-metrics.json` every minute. With `--metrics-port`,
+they can also be scraped in the Prometheus format from `/metrics`.
+
+Usage:
+    python3 communication-hub.py serve [--socket PATH] [--capacity N] [--store DIR] [--metrics-port PORT]
+    python3 communication-hub.py send SENDER RECIPIENT TYPE CONTENT_JSON [--priority LANE]
+    python3 communication-hub.py listen AGENT
+    python3 communication-hub.py retrieve MESSAGE_ID
+    python3 communication-hub.py stats
+    python3 communication-hub.py metrics [--json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from message_hub import PRIORITIES, MessageHub  # noqa: E402
+from message_log import MessageLog  # noqa: E402
+from rpc import RPCClient, RPCError, SocketInUse, claim_socket  # noqa: E402
+
+# Configuration
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "communication-hub.sock"
+)
+MESSAGE_STORE = os.path.join(os.getcwd(), "messages")
+MAINTENANCE_INTERVAL = 300  # seconds between retention and compaction passes
+METRICS_FILE = os.path.join(os.getcwd(), "logs", "hub-metrics.json")
+HIGH_VOLUME = 1000  # messages per minute
+HIGH_CONNECTIONS = 50
+
+
+async def maintain(store: MessageLog) -> None:
+    while True:
+        await asyncio.sleep(MAINTENANCE_INTERVAL)
+        result = await asyncio.to_thread(store.maintain)
+        if any(result.values()):
+            print(f"✓ Message store: {result['segments_removed']} segment(s) removed, "
+                  f"{result['segments_compacted']} compacted")
+
+
+async def write_metrics(hub: MessageHub, path: str, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        hub.metrics.write_snapshot(path, by=("route", "type"))
+
+
+async def scrape(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, hub: MessageHub) -> None:
+    """Minimal HTTP handler serving GET /metrics"""
+    try:
+        request = await reader.readline()
+        while (await reader.readline()).strip():
+            pass
+        parts = request.decode(errors="replace").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, content_type = "200 OK", "text/plain; version=0.0.4"
+            body = hub.metrics.prometheus().encode()
+        else:
+            status, content_type, body = "404 Not Found", "text/plain", b"Not found\n"
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(hub: MessageHub, socket_path: str, metrics_file: str = METRICS_FILE,
+                metrics_interval: float = 60, metrics_port: int = 0) -> None:
+    claim_socket(socket_path)
+    server = await asyncio.start_unix_server(hub.handle, socket_path)
+    os.chmod(socket_path, 0o600)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    print(f"Communication Hub listening on {socket_path}")
+    tasks = [asyncio.create_task(write_metrics(hub, metrics_file, metrics_interval))]
+    if hub.store is not None:
+        tasks.append(asyncio.create_task(maintain(hub.store)))
+    scraper = None
+    if metrics_port:
+        scraper = await asyncio.start_server(lambda r, w: scrape(r, w, hub), "127.0.0.1", metrics_port)
+        print(f"Metrics at http://127.0.0.1:{metrics_port}/metrics")
+    try:
+        async with server:
+            await stop.wait()
+            hub.close()
+            await asyncio.sleep(0)
+    finally:
+        for task in tasks:
+            task.cancel()
+        if scraper is not None:
+            scraper.close()
+        hub.metrics.write_snapshot(metrics_file, by=("route", "type"))
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+    print("Communication Hub stopped")
+
+
+def report(snapshot, stats) -> None:
+    """Print the summary of `monitor_hub_performance()` from a metrics snapshot"""
+    delivered = snapshot["counters"].get("messages_delivered", {}).get("all", {})
+    latency = snapshot["histograms"].get("delivery_latency", {}).get("all", {})
+    per_minute = delivered.get("per_second", 0) * 60
+    print(f"Hub Performance ({snapshot['timestamp']}):")
+    print(f"- Messages per minute: {per_minute:.0f} ({delivered.get('total', 0)} delivered)")
+    if latency.get("count"):
+        print(f"- Delivery latency: p50 {latency['p50'] / 1000:.2f} ms, "
+              f"p99 {latency['p99'] / 1000:.2f} ms, max {latency['max'] / 1000:.2f} ms")
+    else:
+        print("- Delivery latency: N/A")
+    print(f"- Active connections: {len(stats['connected'])}")
+    for message_type, summary in snapshot["histograms"].get("delivery_latency", {}).get("type", {}).items():
+        print(f"  {message_type:<24} p50 {summary['p50'] / 1000:>8.2f} ms  p99 {summary['p99'] / 1000:>8.2f} ms"
+              f"  ({summary['count']} delivered)")
+    shed = snapshot["counters"].get("messages_shed", {}).get("all", {}).get("total", 0)
+    if shed:
+        print(f"⚠️ {shed} message(s) shed under load")
+    if per_minute > HIGH_VOLUME:
+        print("⚠️ High message volume detected")
+    if len(stats["connected"]) > HIGH_CONNECTIONS:
+        print("⚠️ High connection count detected")
+
+
+def listen(socket_path: str, agent: str) -> None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(socket_path)
+    sock.sendall(json.dumps({"method": "connect", "params": {"agent": agent}}).encode() + b"\n")
+    lines = sock.makefile("rb")
+    try:
+        for line in lines:
+            response = json.loads(line)
+            if "error" in response:
+                print(f"✗ {response['error']}")
+                sys.exit(1)
+            if "result" in response:
+                print(f"✓ Connected as {agent} ({response['result']['queued']} queued)")
+                continue
+            for message in response["messages"]:
+                print(json.dumps(message))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        lines.close()
+        sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Communication hub")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="Run the hub")
+    p.add_argument("--capacity", type=int, default=1000,
+                   help="Messages queued per agent before shedding reaches critical ones")
+    p.add_argument("--batch-size", type=int, default=64, help="Maximum messages per delivery")
+    p.add_argument("--store", default=MESSAGE_STORE, help="Message store directory")
+    p.add_argument("--retention-days", type=float, default=7, help="Days to keep stored messages")
+    p.add_argument("--segment-mb", type=int, default=64, help="Message store segment size")
+    p.add_argument("--metrics-file", default=METRICS_FILE, help="Periodic metrics snapshot file")
+    p.add_argument("--metrics-interval", type=float, default=60, help="Seconds between snapshots")
+    p.add_argument("--metrics-port", type=int, default=0,
+                   help="Serve Prometheus metrics on this localhost port (0: off)")
+
+    p = sub.add_parser("send", help="Send a message")
+    p.add_argument("sender")
+    p.add_argument("recipient")
+    p.add_argument("type", help="Message type, e.g. task.assignment")
+    p.add_argument("content", help="JSON content")
+    p.add_argument("--priority", choices=PRIORITIES,
+                   help="Lane (default: from content priority or type)")
+    p.add_argument("--correlation-id")
+    p.add_argument("--reply-to")
+
+    p = sub.add_parser("listen", help="Connect as an agent and print delivered messages")
+    p.add_argument("agent")
+
+    p = sub.add_parser("retrieve", help="Print a stored message")
+    p.add_argument("message_id")
+
+    sub.add_parser("stats", help="Show hub counters and queue depths")
+
+    p = sub.add_parser("metrics", help="Show throughput and latency percentiles")
+    p.add_argument("--json", action="store_true", help="Print the full snapshot")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        # Check before opening the message store a running hub is writing to
+        try:
+            claim_socket(args.socket)
+        except SocketInUse as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        store = MessageLog(args.store, segment_bytes=args.segment_mb << 20,
+                           retention=args.retention_days * 86400)
+        try:
+            asyncio.run(serve(MessageHub(args.capacity, args.batch_size, store=store), args.socket,
+                              args.metrics_file, args.metrics_interval, args.metrics_port))
+        finally:
+            store.close()
+    elif args.command == "listen":
+        listen(args.socket, args.agent)
+    else:
+        try:
+            with RPCClient(args.socket) as client:
+                if args.command == "send":
+                    result = client.call("send", sender=args.sender, recipient=args.recipient,
+                                         type=args.type, content=json.loads(args.content),
+                                         priority=args.priority, correlation_id=args.correlation_id,
+                                         reply_to=args.reply_to)
+                elif args.command == "retrieve":
+                    result = client.call("retrieve", message_id=args.message_id)
+                elif args.command == "metrics":
+                    result = client.call("metrics")
+                    if not args.json:
+                        report(result, client.call("stats"))
+                        return
+                else:
+                    result = client.call("stats")
+        except (OSError, RPCError) as e:
+            print(f"✗ {e}")
+            sys.exit(1)
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
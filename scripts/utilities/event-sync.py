@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+
+"""
+GitHub Webhook Event Sync
+
+Consumes recorded or queued GitHub webhook deliveries (`issues`,
+`projects_v2_item`, `sub_issues`) and applies them incrementally to the
+project, so keeping the project consistent costs work proportional to the
+number of events rather than the size of the project.
+
+Events are JSON objects of the form {"event": "<X-GitHub-Event>",
+"payload": {...}}, either one per line in a replay file or one per file in
+a spool directory. Spool files are moved to `<spool>/done/` once every
+action their batch planned has succeeded; a batch with failed actions stays
+in the spool and is retried on the next poll (replanning skips what already
+applied). Files that cannot be parsed are moved to `<spool>/failed/`.
+
+Usage:
+    python3 event-sync.py --replay events.jsonl [--snapshot index.json] [--dry-run]
+    python3 event-sync.py --spool /var/spool/github-events [--interval 5]
+    python3 event-sync.py --replay events.jsonl --daemon
+
+    --snapshot PATH: Start from a saved index instead of listing the project
+                     (with --dry-run, no network access is needed)
+    --daemon:        Forward events to a running project-daemon.py instead
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from event_sync import EventSync  # noqa: E402
+from project_index import ProjectIndex  # noqa: E402
+from rpc import DEFAULT_SOCKET, RPCClient  # noqa: E402
+
+# Configuration
+OWNER = "o2alexanderfedin"
+REPO = "ai-assistant-project"
+PROJECT_ID = "PVT_kwHOBJ7Qkc4A5SDb"
+
+
+def read_replay(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (event, payload) pairs from a JSON-lines replay file"""
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                yield record["event"], record["payload"]
+            except (json.JSONDecodeError, KeyError) as e:
+                print(f"  ⚠️ Skipping malformed line {line_number}: {e}")
+
+
+def drain_spool(spool: str, failed_dir: str) -> List[Tuple[str, Dict[str, Any], str]]:
+    """Read every pending event file in a spool directory, oldest first
+
+    Malformed files are moved to failed_dir so they are not read again.
+    """
+    events = []
+    names = sorted(
+        (n for n in os.listdir(spool) if n.endswith(".json")),
+        key=lambda n: os.path.getmtime(os.path.join(spool, n))
+    )
+    for name in names:
+        path = os.path.join(spool, name)
+        try:
+            with open(path) as f:
+                record = json.load(f)
+            events.append((record["event"], record["payload"], path))
+        except (json.JSONDecodeError, KeyError, OSError) as e:
+            print(f"  ⚠️ Moving malformed event file {name} to {failed_dir}: {e}")
+            try:
+                os.rename(path, os.path.join(failed_dir, name))
+            except OSError as move_error:
+                print(f"  ⚠️ Could not move {name}: {move_error}")
+    return events
+
+
+def batches(events, size):
+    batch = []
+    for event in events:
+        batch.append(event)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def make_processor(args):
+    """Return a function applying a batch of events and reporting results"""
+    if args.daemon:
+        client = RPCClient(args.socket)
+
+        def process(events):
+            return client.call(
+                "apply_events",
+                events=[{"event": e, "payload": p} for e, p in events],
+                dry_run=args.dry_run,
+            )
+        return process
+
+    if args.snapshot and args.dry_run:
+        session = None
+    else:
+        from github_api import GraphQLSession
+        session = GraphQLSession()
+    index = ProjectIndex(session, args.owner, args.repo, args.project_id)
+    if args.snapshot:
+        index.load_snapshot(args.snapshot)
+    else:
+        print("Loading project index...")
+        index.load()
+    sync = EventSync(index)
+
+    def process(events):
+        plan = sync.apply_batch(events)
+        results = sync.execute(plan, dry_run=args.dry_run)
+        results["events"] = len(events)
+        results["planned"] = len(plan)
+        return results
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub webhook event sync")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--replay", help="JSON-lines file of recorded events")
+    source.add_argument("--spool", help="Directory of queued event files")
+    parser.add_argument("--interval", type=float, default=5,
+                        help="Spool polling interval in seconds")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--snapshot", help="Index snapshot to start from")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print planned mutations without running them")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Forward events to project-daemon.py")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("--owner", default=OWNER)
+    parser.add_argument("--repo", default=REPO)
+    parser.add_argument("--project-id", default=PROJECT_ID)
+    args = parser.parse_args()
+
+    process = make_processor(args)
+
+    if args.replay:
+        totals: Dict[str, int] = {}
+        for batch in batches(read_replay(args.replay), args.batch_size):
+            for key, value in process(batch).items():
+                totals[key] = totals.get(key, 0) + value
+        print(f"\n📊 Replay summary: {json.dumps(totals)}")
+        return
+
+    done_dir = os.path.join(args.spool, "done")
+    failed_dir = os.path.join(args.spool, "failed")
+    os.makedirs(done_dir, exist_ok=True)
+    os.makedirs(failed_dir, exist_ok=True)
+    print(f"Watching {args.spool} for events...")
+    while True:
+        pending = drain_spool(args.spool, failed_dir)
+        for batch in batches(pending, args.batch_size):
+            results = process([(event, payload) for event, payload, _ in batch])
+            print(f"Processed batch: {json.dumps(results)}")
+            if results.get("failed"):
+                print(f"  ⚠️ {results['failed']} action(s) failed; "
+                      f"keeping {len(batch)} event file(s) for retry")
+                continue
+            for _, _, path in batch:
+                os.rename(path, os.path.join(done_dir, os.path.basename(path)))
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
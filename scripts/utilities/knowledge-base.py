@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""
+Knowledge Base Command-Line Tool
+
+Adds, retrieves, deletes and semantically searches knowledge items stored by
+the Python knowledge-base engine (`lib/knowledge_base.py`): a memory-mapped
+vector matrix with an IVF index instead of one `.vec` file per item.
+
+Usage:
+    python3 knowledge-base.py add TITLE CONTENT [--category C] [--tags a,b] [--source S]
+    python3 knowledge-base.py get ID
+    python3 knowledge-base.py delete ID
+    python3 knowledge-base.py search QUERY [QUERY ...] [-k N] [--category C]
+    python3 knowledge-base.py stats
+    python3 knowledge-base.py compact
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from knowledge_base import KnowledgeBase  # noqa: E402
+
+# Configuration
+KNOWLEDGE_DIR = os.path.join(os.getcwd(), "knowledge")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Knowledge base tool")
+    parser.add_argument("--dir", default=KNOWLEDGE_DIR, help="Knowledge directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Add a knowledge item")
+    add.add_argument("title")
+    add.add_argument("content")
+    add.add_argument("--category", default="")
+    add.add_argument("--tags", default="", help="Comma-separated tags")
+    add.add_argument("--source", default="")
+
+    commands.add_parser("get", help="Show an item").add_argument("id")
+    commands.add_parser("delete", help="Delete an item").add_argument("id")
+
+    search = commands.add_parser("search", help="Semantic search (queries are batched)")
+    search.add_argument("queries", nargs="+")
+    search.add_argument("-k", type=int, default=5, help="Results per query")
+    search.add_argument("--category", help="Only items of this category")
+
+    commands.add_parser("stats", help="Show item and index counts")
+    commands.add_parser("compact", help="Drop deleted items and vectors from disk")
+    args = parser.parse_args()
+
+    try:
+        kb = KnowledgeBase(args.dir)
+        if args.command == "add":
+            tags = [tag for tag in args.tags.split(",") if tag]
+            print(kb.add_item(args.title, args.content, args.category, tags, args.source))
+        elif args.command == "get":
+            item = kb.get_item(args.id)
+            if item is None:
+                print(f"❌ Item {args.id} not found")
+                sys.exit(1)
+            print(json.dumps(item, indent=2))
+        elif args.command == "delete":
+            if not kb.delete_item(args.id):
+                print(f"❌ Item {args.id} not found")
+                sys.exit(1)
+            print(f"✓ Deleted {args.id}")
+        elif args.command == "search":
+            results = kb.search_batch(args.queries, args.k, args.category)
+            for query, hits in zip(args.queries, results):
+                print(f"\n🔍 {query}")
+                for hit in hits:
+                    print(f"  {hit['relevance']:.3f}  {hit['id']}  {hit['title']}")
+        elif args.command == "compact":
+            reclaimed = len(kb.index.deleted) if kb.index else 0
+            kb.compact()
+            print(f"✓ Compacted {len(kb.items)} items, reclaimed {reclaimed} vectors")
+        else:
+            index = kb.index
+            print(json.dumps({
+                "items": len(kb.items),
+                "vectors": index.count if index else 0,
+                "deleted_vectors": len(index.deleted) if index else 0,
+                "clusters": len(index.lists) if index else 0,
+            }, indent=2))
+    except ImportError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
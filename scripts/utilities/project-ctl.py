@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+"""
+GitHub Project Daemon Client
+
+Thin command-line client for `project-daemon.py`. Each subcommand is one or
+two RPC calls against the daemon's warm project index, replacing a cold run
+of the corresponding standalone script.
+
+Usage:
+    python3 project-ctl.py status
+    python3 project-ctl.py refresh
+    python3 project-ctl.py migrate [--limit N]
+    python3 project-ctl.py story-points MAPPING.json
+    python3 project-ctl.py components MAPPING.json
+    python3 project-ctl.py dedupe [--delete]
+    python3 project-ctl.py audit
+
+MAPPING.json is an object of issue number -> value, e.g. {"17": 8}.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from field_rules import default_rules  # noqa: E402
+from rpc import DEFAULT_SOCKET, RPCClient, RPCError  # noqa: E402
+
+
+def load_mapping(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def repeated_items(items):
+    """Items pointing to the same issue as an earlier item in the list
+
+    Items that only share a title with another issue are not repeats, and
+    draft items (no issue) are never counted.
+    """
+    seen = set()
+    repeated = []
+    for item in items:
+        key = item.get("issue_id") or (
+            (item.get("owner"), item.get("repo"), item["number"]) if item.get("number") else None
+        )
+        if key is None:
+            continue
+        if key in seen:
+            repeated.append(item)
+        else:
+            seen.add(key)
+    return repeated
+
+
+def print_results(results):
+    ok = sum(1 for status in results.values() if status == "ok")
+    for number, status in sorted(results.items(), key=lambda kv: int(kv[0])):
+        if status != "ok":
+            print(f"  ✗ #{number}: {status}")
+    print(f"Completed: {ok} succeeded, {len(results) - ok} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub Project daemon client")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status")
+    sub.add_parser("refresh")
+    migrate = sub.add_parser("migrate")
+    migrate.add_argument("--limit", type=int)
+    sub.add_parser("story-points").add_argument("mapping")
+    sub.add_parser("components").add_argument("mapping")
+    dedupe = sub.add_parser("dedupe")
+    dedupe.add_argument("--delete", action="store_true",
+                        help="Delete repeated items for the same issue")
+    sub.add_parser("audit")
+    args = parser.parse_args()
+
+    try:
+        client = RPCClient(args.socket)
+    except OSError as e:
+        print(f"❌ Cannot connect to daemon at {args.socket}: {e}")
+        print("   Start it with: python3 project-daemon.py")
+        sys.exit(1)
+
+    try:
+        with client:
+            if args.command in ("status", "refresh"):
+                print(json.dumps(client.call("ping" if args.command == "status" else "refresh"), indent=2))
+            elif args.command == "migrate":
+                # Parents of the daemon's repository, as declared in fields/field-rules.json
+                repository = client.call("ping")["repository"]
+                stats = client.call("migrate", limit=args.limit,
+                                    parents=default_rules().children(repository))
+                print(json.dumps(stats, indent=2))
+            elif args.command == "story-points":
+                print_results(client.call("set_fields", field="Story Points",
+                                          values=load_mapping(args.mapping)))
+            elif args.command == "components":
+                print_results(client.call("set_fields", field="Component",
+                                          values=load_mapping(args.mapping)))
+            elif args.command == "dedupe":
+                duplicates = client.call("duplicates")
+                for title, items in duplicates.items():
+                    print(f"'{title}': {[item['id'] for item in items]}")
+                    repeated = repeated_items(items)
+                    if len(items) - len(repeated) > 1:
+                        numbers = sorted({item["number"] for item in items if item.get("number")})
+                        print(f"  ⚠️ Different issues share this title ({numbers}); review them by hand")
+                    if args.delete:
+                        for item in repeated:
+                            client.call("delete_item", item_id=item["id"])
+                            print(f"  ✓ Deleted {item['id']} (repeat of #{item['number']})")
+                print(f"Found {len(duplicates)} duplicated titles")
+            elif args.command == "audit":
+                print(json.dumps(client.call("audit"), indent=2))
+    except RPCError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+
+"""
+GitHub Project Sync Daemon
+
+Keeps the project index (items, field registry) and an authenticated HTTPS
+connection to the GitHub API warm in a single resident process, and serves
+project operations over a Unix-socket RPC. Clients such as `project-ctl.py`
+connect, call one or more methods, and disconnect, so each operation costs
+only the mutations it actually makes.
+
+Usage:
+    python3 project-daemon.py [--socket PATH] [--owner OWNER] [--repo REPO]
+                              [--project-id ID] [--snapshot-dir DIR]
+
+    --snapshot-dir DIR: Where the `save_snapshot` method writes index snapshots
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from event_sync import EventSync  # noqa: E402
+from github_api import GraphQLError, GraphQLSession  # noqa: E402
+from project_index import ProjectIndex  # noqa: E402
+from project_migration import (  # noqa: E402
+    fetch_repo_issues, migrate_project, set_field_if_changed, set_parent
+)
+from rpc import DEFAULT_SOCKET, RPCServer, SocketInUse  # noqa: E402
+
+# Configuration
+OWNER = "o2alexanderfedin"
+REPO = "ai-assistant-project"
+PROJECT_ID = "PVT_kwHOBJ7Qkc4A5SDb"
+SNAPSHOT_DIR = os.path.expanduser("~/.cache/project-daemon/snapshots")
+
+class ProjectDaemon:
+    """RPC methods over a warm ProjectIndex"""
+
+    def __init__(self, session: GraphQLSession, owner: str, repo: str, project_id: str,
+                 snapshot_dir: str = SNAPSHOT_DIR):
+        self.session = session
+        self.owner = owner
+        self.repo = repo
+        self.index = ProjectIndex(session, owner, repo, project_id)
+        self.events = EventSync(self.index)
+        self.issues: Dict[int, Dict[str, Any]] = {}
+        self.snapshot_dir = snapshot_dir
+        # Serializes writes; reads are served concurrently from the index
+        self.write_lock = threading.Lock()
+        # Held for a whole migration or reload, so a reload never lands mid-migration
+        self.bulk_lock = threading.Lock()
+
+    def refresh(self) -> Dict[str, Any]:
+        """Reload the project index and the repository issue list"""
+        with self.bulk_lock, self.write_lock:
+            self.index.load()
+            self.issues = fetch_repo_issues(self.session, self.owner, self.repo)
+        return self.ping()
+
+    def methods(self) -> Dict[str, Any]:
+        return {
+            "ping": self.ping,
+            "refresh": self.refresh,
+            "fields": self.fields,
+            "find": self.find,
+            "items": self.items,
+            "add_issue": self.add_issue,
+            "set_field": self.set_field,
+            "set_fields": self.set_fields,
+            "set_parent": self.set_parent,
+            "migrate": self.migrate,
+            "duplicates": self.duplicates,
+            "delete_item": self.delete_item,
+            "audit": self.audit,
+            "apply_events": self.apply_events,
+            "save_snapshot": self.save_snapshot,
+        }
+
+    # Reads
+
+    def ping(self) -> Dict[str, Any]:
+        summary = self.index.summary()
+        summary["repository"] = f"{self.owner}/{self.repo}"
+        summary["repo_issues"] = len(self.issues)
+        return summary
+
+    def fields(self) -> Dict[str, Any]:
+        return self.index.fields
+
+    def find(self, number: Optional[int] = None, title: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        return self.index.find(number=number, title=title)
+
+    def items(self) -> List[Dict[str, Any]]:
+        return self.index.all_items()
+
+    def duplicates(self) -> Dict[str, List[Dict[str, Any]]]:
+        return self.index.duplicates()
+
+    def audit(self) -> Dict[str, Any]:
+        """Issues missing from the project, unset fields and duplicates"""
+        missing = [
+            number for number in sorted(self.issues)
+            if self.index.find(number=number) is None
+        ]
+        unset = {
+            name: sorted(item["number"] for item in self.index.missing_field(name))
+            for name in ("Type", "Component", "Priority", "Story Points")
+            if name in self.index.fields
+        }
+        return {
+            "missing_from_project": missing,
+            "missing_fields": unset,
+            "duplicate_titles": sorted(self.index.duplicates()),
+        }
+
+    # Writes
+
+    def add_issue(self, number: int) -> Dict[str, Any]:
+        with self.write_lock:
+            return self.index.add_issue(number)
+
+    def set_field(self, number: int, field: str, value: Any) -> Dict[str, Any]:
+        """Set one field on the item for an issue, skipping no-op writes"""
+        with self.write_lock:
+            set_field_if_changed(self.index, number, field, value)
+            return self.index.find(number=number)
+
+    def set_fields(self, field: str, values: Dict[str, Any]) -> Dict[str, str]:
+        """Set a field for many issues ({number: value}); returns per-issue status"""
+        results = {}
+        for number, value in values.items():
+            try:
+                self.set_field(int(number), field, value)
+                results[number] = "ok"
+            except GraphQLError as e:
+                results[number] = f"error: {e}"
+        return results
+
+    def set_parent(self, parent: int, child: int) -> bool:
+        with self.write_lock:
+            return set_parent(self.index, parent, child)
+
+    def migrate(self, limit: Optional[int] = None, parents: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+        """Ensure every repository issue is in the project with label-derived fields"""
+        with self.bulk_lock:
+            return migrate_project(self.index, self.issues, limit, parents,
+                                   write_lock=self.write_lock)
+
+    def save_snapshot(self, name: str) -> str:
+        """Write the index to a file in the snapshot directory and return its path"""
+        if not name or os.path.basename(name) != name or name in (".", ".."):
+            raise ValueError(f"Snapshot name must be a plain file name: {name!r}")
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        path = os.path.join(self.snapshot_dir, name)
+        self.index.save_snapshot(path)
+        return path
+
+    def apply_events(self, events: List[Dict[str, Any]], dry_run: bool = False) -> Dict[str, int]:
+        """Apply webhook events ({"event", "payload"}) incrementally"""
+        with self.write_lock:
+            plan = self.events.apply_batch(
+                (e["event"], e["payload"]) for e in events
+            )
+            results = self.events.execute(plan, dry_run=dry_run)
+        results["events"] = len(events)
+        results["planned"] = len(plan)
+        return results
+
+    def delete_item(self, item_id: str) -> bool:
+        with self.write_lock:
+            self.index.delete_item(item_id)
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GitHub Project sync daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--owner", default=OWNER)
+    parser.add_argument("--repo", default=REPO)
+    parser.add_argument("--project-id", default=PROJECT_ID)
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR,
+                        help="Directory save_snapshot writes to")
+    args = parser.parse_args()
+
+    # Claim the socket first so a second daemon fails before loading anything
+    try:
+        server = RPCServer(args.socket)
+    except SocketInUse as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    session = GraphQLSession()
+    daemon = ProjectDaemon(session, args.owner, args.repo, args.project_id,
+                           args.snapshot_dir)
+
+    print("Loading project index...")
+    summary = daemon.refresh()
+    print(f"✓ Indexed {summary['items']} items, {summary['repo_issues']} repository issues")
+
+    for name, fn in daemon.methods().items():
+        server.register(name, fn)
+
+    def shutdown(signum, frame):
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"Listening on {args.socket}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        session.close()
+        print("Daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+"""
+Task Queue Daemon
+
+Keeps open task issues in an in-memory priority queue (`task_queue.TaskQueue`)
+and serves dispatch over a Unix-socket RPC. Scores use the factors of
+`calculate_priority_score()` in docs/architecture/components/task-queue.md,
+but are computed once per task and aged incrementally, so a dispatch is a
+heap pop instead of a re-scoring of the whole backlog.
+
+RPC methods: enqueue(task), dequeue(), peek(), remove(number), ranked(limit),
+sync(full), stats(). The first sync loads the open issues; later ones fetch
+only issues updated since the previous sync. A task is an issue object with number, labels, body and
+createdAt, as returned by `gh issue list --json number,title,labels,body,createdAt`.
+
+Usage:
+    python3 task-queue-daemon.py [--socket PATH] [--owner OWNER] [--repo REPO]
+                                 [--label LABEL] [--sync-interval SECONDS]
+"""
+
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+)
+from github_api import GraphQLSession  # noqa: E402
+from project_migration import iter_repo_issues  # noqa: E402
+from rpc import RPCServer  # noqa: E402
+from task_queue import TaskQueue, static_score  # noqa: E402
+
+# Configuration
+OWNER = "o2alexanderfedin"
+REPO = "ai-assistant-project"
+TASK_LABEL = "task"
+DEFAULT_SOCKET = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", "/tmp"), "task-queue.sock"
+)
+SYNC_OVERLAP = 60  # seconds re-fetched before the last sync, for clock skew
+
+
+class TaskQueueDaemon:
+    """RPC methods over a TaskQueue fed from repository issues"""
+
+    def __init__(self, session: Optional[GraphQLSession], owner: str, repo: str,
+                 label: str = TASK_LABEL):
+        self.session = session
+        self.owner = owner
+        self.repo = repo
+        self.label = label
+        self.queue = TaskQueue()
+        # Dequeued tasks are not re-added by a sync while their issue is still open
+        self.dispatched: Dict[str, float] = {}
+        self.stats_counters = {"enqueued": 0, "dequeued": 0, "syncs": 0}
+        self.last_sync: Optional[float] = None
+        # Guards queue and dispatched across RPC threads and the sync thread
+        self._lock = threading.Lock()
+
+    def methods(self) -> Dict[str, Any]:
+        return {
+            "enqueue": self.enqueue,
+            "dequeue": self.dequeue,
+            "peek": self.queue.peek,
+            "remove": self.remove,
+            "ranked": self.ranked,
+            "sync": self.sync,
+            "stats": self.stats,
+        }
+
+    def enqueue(self, task: Dict[str, Any]) -> int:
+        with self._lock:
+            self.stats_counters["enqueued"] += 1
+            self.dispatched.pop(TaskQueue.task_id(task), None)
+            return self.queue.enqueue(task)
+
+    def dequeue(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            task = self.queue.dequeue()
+            if task is not None:
+                self.stats_counters["dequeued"] += 1
+                self.dispatched[TaskQueue.task_id(task)] = time.time()
+            return task
+
+    def remove(self, number: Any) -> bool:
+        with self._lock:
+            return self.queue.remove(number) is not None
+
+    def ranked(self, limit: Optional[int] = 20) -> List[Dict[str, Any]]:
+        return [dict(task, score=score) for score, task in self.queue.ranked(limit)]
+
+    def sync(self, full: bool = False) -> Dict[str, int]:
+        """Enqueue new or changed open task issues and drop closed ones
+
+        A full sync reads every open issue and drops tasks that are no longer
+        among them; otherwise only issues updated since the last sync are read.
+        """
+        started = time.time()
+        full = full or self.last_sync is None
+        if full:
+            issues = list(iter_repo_issues(self.session, self.owner, self.repo, states=("OPEN",)))
+        else:
+            since = time.strftime("%Y-%m-%dT%H:%M:%SZ",
+                                  time.gmtime(self.last_sync - SYNC_OVERLAP))
+            issues = list(iter_repo_issues(self.session, self.owner, self.repo, since=since))
+        added = changed = removed = 0
+        with self._lock:
+            open_ids = set()
+            for issue in issues:
+                task_id = TaskQueue.task_id(issue)
+                if issue["state"] != "OPEN" or self.label not in issue["labels"]:
+                    if self.queue.remove(task_id) is not None:
+                        removed += 1
+                    self.dispatched.pop(task_id, None)
+                    continue
+                open_ids.add(task_id)
+                if task_id in self.dispatched:
+                    continue
+                if task_id not in self.queue:
+                    self.queue.enqueue(issue)
+                    added += 1
+                elif static_score(issue) != static_score(self.queue.get(task_id)):
+                    self.queue.update(issue)
+                    changed += 1
+            if full:
+                # Closed issues were not fetched
+                for _, task in self.queue.ranked():
+                    task_id = TaskQueue.task_id(task)
+                    if task_id not in open_ids:
+                        self.queue.remove(task_id)
+                        removed += 1
+                for task_id in set(self.dispatched) - open_ids:
+                    del self.dispatched[task_id]
+            self.stats_counters["syncs"] += 1
+            self.last_sync = started
+        return {"added": added, "changed": changed, "removed": removed, "fetched": len(issues)}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats_counters, queued=len(self.queue),
+                        dispatched=len(self.dispatched))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task queue daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--owner", default=OWNER)
+    parser.add_argument("--repo", default=REPO)
+    parser.add_argument("--label", default=TASK_LABEL, help="Label marking task issues")
+    parser.add_argument("--sync-interval", type=float, default=60,
+                        help="Seconds between issue syncs (0 disables)")
+    args = parser.parse_args()
+
+    session = GraphQLSession()
+    daemon = TaskQueueDaemon(session, args.owner, args.repo, args.label)
+
+    print("Loading open tasks...")
+    summary = daemon.sync()
+    print(f"✓ Queued {summary['added']} tasks")
+
+    server = RPCServer(args.socket)
+    for name, fn in daemon.methods().items():
+        server.register(name, fn)
+
+    stopping = threading.Event()
+
+    def sync_loop():
+        while not stopping.wait(args.sync_interval):
+            try:
+                daemon.sync()
+            except Exception as e:
+                print(f"⚠️ Sync failed: {e}", file=sys.stderr)
+
+    if args.sync_interval > 0:
+        threading.Thread(target=sync_loop, name="task-sync", daemon=True).start()
+
+    def shutdown(signum, frame):
+        stopping.set()
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    print(f"Listening on {args.socket}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        session.close()
+        print("Daemon stopped")
+
+
+if __name__ == "__main__":
+    main()
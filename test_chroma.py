@@ -1,10 +1,14 @@
-import requests
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "lib"))
+from chroma_client import ChromaClient, ChromaError  # noqa: E402
 
 # Test that Chroma API is accessible (v2)
-response = requests.get("http://localhost:8100/api/v2")
-if response.status_code == 200:
-    print("✅ Chroma is running successfully!")
-    print(f"Response: {response.json()}")
-else:
-    print(f"❌ Error: Chroma API returned status code {response.status_code}")
-    print(f"Response: {response.text}")
\ No newline at end of file
+with ChromaClient("http://localhost:8100") as client:
+    try:
+        response = client.heartbeat()
+        print("✅ Chroma is running successfully!")
+        print(f"Response: {response}")
+    except ChromaError as e:
+        print(f"❌ Error: {e}")
@@ -10,83 +10,73 @@ import sys
 from typing import Dict, List, Optional
 
 try:
-    from mcp import ClientSession
-    from mcp.client.streamable_http import streamablehttp_client
+    import mcp  # noqa: F401
 except ImportError:
     print("Error: MCP package not found. Please install it with 'pip install mcp'")
     sys.exit(1)
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "lib"))
+from mcp_pool import MCPSessionPool  # noqa: E402
+
 async def send_document_to_chroma():
     # MCP server URL - this is where the Chroma MCP server is listening
     url = "http://localhost:8080/mcp"
     print(f"Connecting to MCP server at {url}...")
     
     try:
-        # Connect to the MCP server
-        async with streamablehttp_client(url) as (read_stream, write_stream, _):
-            print("Connection established.")
+        # Pooled sessions are initialized once and the tool list is cached
+        async with MCPSessionPool(url, size=2) as pool:
+            print("Session pool initialized.")
             
-            # Create an MCP client session
-            async with ClientSession(read_stream, write_stream) as session:
-                print("Initializing session...")
-                await session.initialize()
-                print("Session initialized.")
-                
-                # Get available tools
-                tools = await session.get_tools()
-                tool_names = [tool.name for tool in tools]
-                print(f"Available tools: {', '.join(tool_names)}")
-                
-                # Try to list collections first
-                if "chroma_list_collections" in tool_names:
-                    print("\nListing collections...")
-                    collections = await session.call_tool("chroma_list_collections")
-                    print(f"Collections: {collections}")
-                
-                # Create a test collection if needed
-                if "chroma_create_collection" in tool_names:
-                    collection_name = "test_mcp_collection"
-                    print(f"\nCreating collection '{collection_name}'...")
-                    result = await session.call_tool(
-                        "chroma_create_collection", 
-                        {"collection_name": collection_name}
-                    )
-                    print(f"Create collection result: {result}")
+            # Get available tools
+            tool_names = await pool.tool_names()
+            print(f"Available tools: {', '.join(tool_names)}")
+            
+            collection_name = "test_mcp_collection"
+            
+            # Listing collections and creating the test collection are
+            # independent, so both calls are pipelined
+            calls = []
+            if "chroma_list_collections" in tool_names:
+                calls.append(("chroma_list_collections", None))
+            if "chroma_create_collection" in tool_names:
+                calls.append(("chroma_create_collection", {"collection_name": collection_name}))
+            print(f"\nListing collections and creating '{collection_name}'...")
+            for (name, _), result in zip(calls, await pool.call_many(calls)):
+                print(f"{name} result: {result}")
+            
+            # Add a document to the collection
+            if "chroma_add_documents" in tool_names:
+                documents = ["This is a test document sent via MCP"]
+                metadatas = [{"source": "mcp_test", "timestamp": "2025-05-20"}]
+                ids = ["mcp_doc_1"]
                 
-                # Add a document to the collection
-                if "chroma_add_documents" in tool_names:
-                    collection_name = "test_mcp_collection"
-                    documents = ["This is a test document sent via MCP"]
-                    metadatas = [{"source": "mcp_test", "timestamp": "2025-05-20"}]
-                    ids = ["mcp_doc_1"]
-                    
-                    print(f"\nAdding document to collection '{collection_name}'...")
-                    result = await session.call_tool(
-                        "chroma_add_documents",
-                        {
-                            "collection_name": collection_name,
-                            "documents": documents,
-                            "metadatas": metadatas,
-                            "ids": ids
-                        }
-                    )
-                    print(f"Add document result: {result}")
+                print(f"\nAdding document to collection '{collection_name}'...")
+                result = await pool.call_tool(
+                    "chroma_add_documents",
+                    {
+                        "collection_name": collection_name,
+                        "documents": documents,
+                        "metadatas": metadatas,
+                        "ids": ids
+                    }
+                )
+                print(f"Add document result: {result}")
+            
+            # Query the document
+            if "chroma_query_documents" in tool_names:
+                query_texts = ["test document"]
                 
-                # Query the document
-                if "chroma_query_documents" in tool_names:
-                    collection_name = "test_mcp_collection"
-                    query_texts = ["test document"]
-                    
-                    print(f"\nQuerying collection '{collection_name}'...")
-                    result = await session.call_tool(
-                        "chroma_query_documents",
-                        {
-                            "collection_name": collection_name,
-                            "query_texts": query_texts,
-                            "n_results": 1
-                        }
-                    )
-                    print(f"Query result: {result}")
+                print(f"\nQuerying collection '{collection_name}'...")
+                result = await pool.call_tool(
+                    "chroma_query_documents",
+                    {
+                        "collection_name": collection_name,
+                        "query_texts": query_texts,
+                        "n_results": 1
+                    }
+                )
+                print(f"Query result: {result}")
                 
     except Exception as e:
         print(f"Error: {str(e)}")
@@ -101,4 +91,4 @@ if __name__ == "__main__":
         print("\nTest completed successfully!")
     else:
         print("\nTest failed.")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Replays the recorded webhook payloads in fixtures/webhooks against an index
+snapshot and checks the planned mutations and index updates of EventSync.
+Runs with `python3 test_event_sync.py` or under pytest; needs no network.
+"""
+
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(ROOT, "fixtures", "webhooks")
+sys.path.insert(0, os.path.join(ROOT, "scripts", "lib"))
+import selfcheck  # noqa: E402
+from event_sync import EventSync  # noqa: E402
+from project_index import ProjectIndex  # noqa: E402
+
+PROJECT_ID = "PVT_kwHOBJ7Qkc4A5SDb"
+
+
+def load_fixtures(index_class=ProjectIndex):
+    index = index_class(None, "o2alexanderfedin", "ai-assistant-project", PROJECT_ID)
+    index.load_snapshot(os.path.join(FIXTURES, "index-snapshot.json"))
+    with open(os.path.join(FIXTURES, "events.jsonl")) as f:
+        events = [(record["event"], record["payload"]) for record in map(json.loads, f)]
+    return index, events
+
+
+def test_apply_batch_plan():
+    index, events = load_fixtures()
+    sync = EventSync(index)
+    plan = sync.apply_batch(events)
+    assert plan == [
+        {"op": "add_issue", "number": 201},
+        {"op": "fetch_item", "item_id": "PVTI_item203"},
+        # The unlabel supersedes the earlier priority:high label
+        {"op": "set_field", "number": 200, "field": "Priority", "value": "Low"},
+        {"op": "set_field", "number": 200, "field": "Story Points", "value": 3},
+        {"op": "set_field", "number": 201, "field": "Type", "value": "User Story"},
+        {"op": "set_field", "number": 201, "field": "Priority", "value": "Medium"},
+    ]
+    # Other repository, untracked action, other project, unsubscribed event
+    assert sync.stats == {"events": 10, "ignored": 4, "actions": 6}
+
+
+def test_apply_batch_updates_index():
+    index, events = load_fixtures()
+    EventSync(index).apply_batch(events)
+    assert index.find(number=200)["labels"] == ["points:3", "priority:low"]
+    assert index.find(number=202) is None
+    assert index.find(number=203)["parent"] == 200
+    assert index.find(number=201) is None  # added only when the plan runs
+
+
+def test_execute_counts_failures():
+    class FailingIndex(ProjectIndex):
+        def add_issue(self, number):
+            raise RuntimeError("rate limited")
+
+        def fetch_item(self, item_id):
+            return None
+
+        def set_field(self, item_id, field_name, value):
+            self.items[item_id]["fields"][field_name] = value
+
+    index, events = load_fixtures(FailingIndex)
+    sync = EventSync(index)
+    results = sync.execute(sync.apply_batch(events))
+    # Issue 201 never made it into the project, so its fields are skipped too
+    assert results == {"applied": 3, "skipped": 2, "failed": 1}
+    assert index.find(number=200)["fields"]["Priority"] == "Low"
+
+
+if __name__ == "__main__":
+    selfcheck.run(globals())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+"""
+Checks for the state change feed in scripts/lib: resuming subscriptions and
+isolation of saves from broken subscribers. Runs with
+`python3 test_state_feed.py` or under pytest.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "lib"))
+import selfcheck  # noqa: E402
+from state_feed import StateFeed  # noqa: E402
+from state_store import StateStore  # noqa: E402
+
+
+def change(agent_id, version):
+    return {"agent_id": agent_id, "state_type": "config", "version": version,
+            "timestamp": "2026-01-01T00:00:00Z", "kind": "save"}
+
+
+def test_resume_within_buffer():
+    feed = StateFeed()
+    feed.publish([change("agent-1", 1), change("agent-2", 1), change("agent-1", 2)])
+
+    async def resume():
+        subscription = feed.subscribe("agent-1", after=1, epoch=feed.epoch)
+        batch = await asyncio.wait_for(anext(subscription), 5)
+        subscription.close()
+        return batch
+
+    assert [(event["agent_id"], event["version"]) for event in asyncio.run(resume())] == [("agent-1", 2)]
+
+
+def test_resume_past_sequence_resets():
+    feed = StateFeed()
+    feed.publish([change("agent-1", 1)])
+
+    async def resume(**position):
+        subscription = feed.subscribe("agent-", **position)
+        batch = await asyncio.wait_for(anext(subscription), 5)
+        subscription.close()
+        return batch
+
+    # A subscriber of the previous process run, resuming without its epoch
+    assert [event["kind"] for event in asyncio.run(resume(after=120))] == ["reset"]
+    assert [event["kind"] for event in asyncio.run(resume(after=0, epoch="stale"))] == ["reset"]
+
+
+def test_feed_failure_does_not_fail_saves():
+    with tempfile.TemporaryDirectory() as root:
+        feed = StateFeed()
+        store = StateStore(root, feed=feed)
+
+        async def subscribe():
+            return feed.subscribe("agent-")
+
+        asyncio.run(subscribe())  # leaves a subscription on a closed loop
+        store.save("agent-1", "config", {"a": 1})
+        store.save("agent-1", "config", {"a": 2})
+        assert store.load("agent-1", "config")["version"] == 2
+        assert feed.stats()["subscribers"] == 0
+        store.close()
+
+
+if __name__ == "__main__":
+    selfcheck.run(globals())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+"""
+Crash and concurrency checks for the write-ahead log and agent state store
+in scripts/lib. Runs with `python3 test_state_store.py` or under pytest;
+needs no services.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "lib"))
+import selfcheck  # noqa: E402
+from state_store import StateStore, VersionConflict  # noqa: E402
+from wal import WriteAheadLog, encode  # noqa: E402
+
+
+# Write-ahead log and state store
+
+def test_concurrent_compare_and_set():
+    with tempfile.TemporaryDirectory() as root:
+        store = StateStore(root)
+        store.save("counter", "runtime", {"n": 0})
+        threads, increments = 8, 25
+
+        def worker():
+            done = 0
+            while done < increments:
+                current = store.load("counter", "runtime")
+                try:
+                    store.save("counter", "runtime", {"n": current["data"]["n"] + 1},
+                               expected_version=current["version"])
+                    done += 1
+                except VersionConflict:
+                    pass
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        latest = store.load("counter", "runtime")
+        assert latest["data"]["n"] == threads * increments
+        assert latest["version"] == threads * increments + 1
+        store.close()
+
+        reopened = StateStore(root)
+        assert reopened.load("counter", "runtime")["data"]["n"] == threads * increments
+        reopened.close()
+
+
+def test_reopen_without_close():
+    with tempfile.TemporaryDirectory() as root:
+        store = StateStore(root)
+        for version in range(5):
+            store.save("agent-1", "memory", {"notes": list(range(version))})
+        # Durable in the WAL but never applied, as if the process died mid-commit
+        store._wal.on_commit = None
+        store.save("agent-1", "memory", {"notes": ["after crash"]})
+        store.save("agent-2", "config", {"role": "tester"})
+        # The process dies and the kernel releases its directory lock
+        store._lock_file.close()
+
+        reopened = StateStore(root)
+        assert reopened.load("agent-1", "memory")["data"] == {"notes": ["after crash"]}
+        assert reopened.load("agent-1", "memory")["version"] == 6
+        assert reopened.load_version("agent-1", "memory", 4)["data"] == {"notes": [0, 1, 2]}
+        assert reopened.load("agent-2", "config")["data"] == {"role": "tester"}
+        reopened.close()
+
+
+def test_torn_history_line():
+    with tempfile.TemporaryDirectory() as root:
+        store = StateStore(root)
+        for version in range(3):
+            store.save("agent-1", "runtime", {"step": version})
+        store.close()
+        with open(os.path.join(root, "history", "agent-1", "runtime.jsonl"), "a") as f:
+            f.write('{"version": 4, "timest')
+
+        reopened = StateStore(root)
+        assert reopened.load("agent-1", "runtime")["version"] == 3
+        assert reopened.save("agent-1", "runtime", {"step": 3})["version"] == 4
+        reopened.close()
+        again = StateStore(root)
+        assert [record["version"] for record in again.history("agent-1", "runtime")] == [1, 2, 3, 4]
+        assert again.load("agent-1", "runtime")["data"] == {"step": 3}
+        again.close()
+
+
+def test_checkpoint_during_flush():
+    with tempfile.TemporaryDirectory() as root:
+        # Every commit checkpoints, truncating the WAL while other writers queue
+        store = StateStore(root, checkpoint_bytes=1)
+        agents, saves = 16, 20
+
+        def worker(agent):
+            for step in range(saves):
+                store.save(f"agent-{agent}", "runtime", {"step": step, "pad": "x" * 64})
+
+        workers = [threading.Thread(target=worker, args=(agent,)) for agent in range(agents)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        store.close()
+
+        reopened = StateStore(root)
+        for agent in range(agents):
+            latest = reopened.load(f"agent-{agent}", "runtime")
+            assert latest["version"] == saves and latest["data"]["step"] == saves - 1
+        reopened.close()
+
+
+def test_wal_torn_tail():
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "test.wal")
+        log = WriteAheadLog(path)
+        for n in range(3):
+            log.append({"n": n})
+        log.close()
+        with open(path, "ab") as f:
+            f.write(encode({"n": 3})[:-2])
+
+        log = WriteAheadLog(path)
+        assert [record["n"] for record in log.replay()] == [0, 1, 2]
+        log.append({"n": 4})
+        log.close()
+        assert [record["n"] for record in WriteAheadLog(path).replay()] == [0, 1, 2, 4]
+
+
+def test_store_locked_by_other_process():
+    with tempfile.TemporaryDirectory() as root:
+        store = StateStore(root)
+        store.save("agent-1", "runtime", {"step": 0})
+        opener = (
+            "import sys; sys.path.insert(0, sys.argv[1])\n"
+            "from state_store import StateStore, StoreLocked\n"
+            "try:\n"
+            "    StateStore(sys.argv[2])\n"
+            "except StoreLocked:\n"
+            "    sys.exit(3)\n"
+        )
+        lib = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "lib")
+        second = subprocess.run([sys.executable, "-c", opener, lib, root])
+        assert second.returncode == 3
+        # The refused opener must not have touched the live WAL
+        assert store.save("agent-1", "runtime", {"step": 1})["version"] == 2
+        store.close()
+
+        second = subprocess.run([sys.executable, "-c", opener, lib, root])
+        assert second.returncode == 0
+
+
+if __name__ == "__main__":
+    selfcheck.run(globals())
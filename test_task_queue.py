@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+"""
+Ordering checks for the task queue's indexed heap in scripts/lib.
+Runs with `python3 test_task_queue.py` or under pytest.
+"""
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts", "lib"))
+import selfcheck  # noqa: E402
+from task_queue import HOUR, TaskQueue, age_hours, static_score  # noqa: E402
+
+
+def test_task_queue_order_with_aging():
+    now = [1_000_000.0]
+    queue = TaskQueue(clock=lambda: now[0])
+    rng = random.Random(7)
+    tasks = {}
+    for number in range(500):
+        task = {"number": number,
+                "labels": [rng.choice(["priority:high", "priority:medium", "priority:low", "bug"])],
+                "body": rng.choice(["", "depends on #3"]),
+                "createdAt": now[0] - rng.uniform(0, 60 * HOUR)}
+        tasks[number] = task
+        queue.enqueue(task)
+
+    def expected(task):
+        return static_score(task) + age_hours(task["createdAt"], now[0])
+
+    for step in range(200):
+        now[0] += rng.uniform(0, HOUR)
+        if step % 7 == 0:
+            removed = queue.remove(rng.choice([number for number in tasks if number in queue]))
+            del tasks[removed["number"]]
+        if step % 11 == 0:
+            number = rng.choice(list(tasks))
+            tasks[number] = dict(tasks[number], labels=["priority:high"])
+            queue.update(tasks[number])
+        top = queue.dequeue()
+        assert expected(top) == max(expected(task) for task in tasks.values())
+        del tasks[top["number"]]
+    ranked = queue.ranked()
+    assert [score for score, _ in ranked] == sorted((expected(task) for task in tasks.values()), reverse=True)
+    assert len(queue) == len(tasks)
+
+
+if __name__ == "__main__":
+    selfcheck.run(globals())